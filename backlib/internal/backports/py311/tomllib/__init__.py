@@ -1,14 +1,48 @@
-import sys
+from backlib.internal.backports.py311.tomllib.internal.tomllib import (
+    FrozenTable,
+    IncrementalParser,
+    Limits,
+    ParseStats,
+    SharedTable,
+    TOMLDecodeError,
+    TOMLLimitError,
+    aload,
+    aloads,
+    attach,
+    dump,
+    dumps,
+    iterparse,
+    load,
+    load_many,
+    load_path,
+    loads,
+    loads_bytes,
+    publish,
+    validate,
+    watch,
+)
 
 
-if sys.version_info >= (3, 11):
-    from tomllib import TOMLDecodeError, load, loads
-else:
-    from backlib.internal.backports.py311.tomllib.internal.tomllib import (
-        TOMLDecodeError,
-        load,
-        loads,
-    )
-
-
-__all__: list[str] = ["TOMLDecodeError", "load", "loads"]
+__all__: list[str] = [
+    "FrozenTable",
+    "IncrementalParser",
+    "Limits",
+    "ParseStats",
+    "SharedTable",
+    "TOMLDecodeError",
+    "TOMLLimitError",
+    "aload",
+    "aloads",
+    "attach",
+    "dump",
+    "dumps",
+    "iterparse",
+    "load",
+    "load_many",
+    "load_path",
+    "loads",
+    "loads_bytes",
+    "publish",
+    "validate",
+    "watch",
+]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from concurrent.futures import Executor
+
+    from backlib.internal.backports.py311.os import PathLike
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+
+
+__all__: list[str] = ["aload", "aloads"]
+
+
+# Documents smaller than this (in characters) are parsed in the event loop, which is faster
+# than handing them over to an executor.
+MIN_EXECUTOR_SIZE = 1 << 16
+
+# The longest time (in seconds) a document is parsed in the event loop without letting other
+# tasks run.
+INLINE_TIME_SLICE = 0.005
+
+
+async def aload(
+    path: str | bytes | PathLike[str] | PathLike[bytes],
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """Parse TOML from the file at `path` without blocking the event loop.
+
+    Parameters
+    ----------
+    executor : Executor, optional
+        The executor to parse large documents with, see `aloads`.
+
+    Notes
+    -----
+    * The file is read and decoded in the default executor of the event loop, then parsed as
+      with `aloads`.
+    """
+    loop = asyncio.get_running_loop()
+    s = await loop.run_in_executor(None, read_text, path)
+    return await aloads(s, parse_float=parse_float, executor=executor)
+
+
+async def aloads(
+    s: str,
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """Parse TOML from a string without blocking the event loop.
+
+    Parameters
+    ----------
+    executor : Executor, optional
+        The executor to parse documents of at least `MIN_EXECUTOR_SIZE` characters with. If
+        `None`, the default executor of the event loop.
+
+    Notes
+    -----
+    * Smaller documents are parsed in the event loop, which lets other tasks run every
+      `INLINE_TIME_SLICE` seconds.
+    * If the task is cancelled, a parse in the event loop or in a thread stops at the next
+      statement. A parse in a process runs to its end, but the task does not wait for it.
+    * A parse in a thread holds the GIL most of the time. A `ProcessPoolExecutor` keeps the
+      event loop fully responsive, but `parse_float` must be picklable then.
+    """
+    if len(s) < MIN_EXECUTOR_SIZE:
+        return await parse_inline(s, parse_float)
+
+    loop = asyncio.get_running_loop()
+    if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        parse = partial(parser.loads, s, parse_float=parse_float)
+        return await loop.run_in_executor(executor, parse)
+    cancelled = Event()
+    try:
+        return await loop.run_in_executor(executor, parse_in_thread, s, parse_float, cancelled)
+    finally:
+        # Stops the thread if the task has been cancelled
+        cancelled.set()
+
+
+async def parse_inline(s: str, parse_float: ParseFloat) -> dict[str, Any]:
+    """Parse TOML from a string in the event loop, letting other tasks run now and then."""
+    steps = parse_steps(s, parse_float)
+    deadline = monotonic() + INLINE_TIME_SLICE
+    try:
+        while True:
+            next(steps)
+            if monotonic() >= deadline:
+                await asyncio.sleep(0)
+                deadline = monotonic() + INLINE_TIME_SLICE
+    except StopIteration as e:
+        return e.value
+
+
+def parse_in_thread(s: str, parse_float: ParseFloat, cancelled: Event) -> dict[str, Any]:
+    """Parse TOML from a string, raising `CancelledError` once `cancelled` is set."""
+    steps = parse_steps(s, parse_float)
+    try:
+        while not cancelled.is_set():
+            next(steps)
+    except StopIteration as e:
+        return e.value
+    # Nobody waits for the document anymore
+    raise asyncio.CancelledError
+
+
+def parse_steps(s: str, parse_float: ParseFloat) -> Generator[None, None, dict[str, Any]]:
+    """Parse TOML from a string like `loads`, yielding after every statement."""
+    src = s.replace("\r\n", "\n")
+    out = parser.Output(parser.NestedDict(), parser.Flags())
+    for _ in parser.parse_statements(src, out, (), parser.make_safe_parse_float(parse_float)):
+        yield
+    return out.data.dict
+
+
+def read_text(path: str | bytes | PathLike[str] | PathLike[bytes]) -> str:
+    """Read and decode the UTF-8 encoded file at `path`."""
+    with open(path, "rb") as fp:  # noqa: PTH123
+        return fp.read().decode()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os as py_os
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from backlib.internal.backports.py311 import os
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import load
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from concurrent.futures import Executor
+
+    from backlib.internal.backports.py311.os import PathLike
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+
+
+__all__: list[str] = ["load_many"]
+
+
+# Batches smaller than this (in bytes) are parsed faster than a pool starts.
+MIN_POOL_BATCH_SIZE = 1 << 18
+
+
+def load_many(
+    paths: Iterable[str | bytes | PathLike[str] | PathLike[bytes]],
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[dict[str, Any] | OSError | ValueError | RecursionError | MemoryError]:
+    """Parse TOML from many files concurrently.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        The number of processes of the pool. Defaults to the number of CPUs.
+    executor : Executor, optional
+        The executor to parse the files with instead of a new process pool.
+
+    Returns
+    -------
+    list[dict[str, Any] | OSError | ValueError | RecursionError | MemoryError]
+        The parsed documents in the order of `paths`. If a file cannot be read or parsed, the
+        exception (e.g. `FileNotFoundError`, `TOMLDecodeError`, or `RecursionError` for values
+        nested too deep) takes its place, so that one file cannot fail the whole batch.
+
+    Notes
+    -----
+    * If `executor` is not set, a process pool is only started when there is more than one
+      worker and the files add up to at least `MIN_POOL_BATCH_SIZE` bytes. Otherwise, the
+      files are parsed in the current process.
+    * With a process pool, `parse_float` must be picklable.
+    """
+    files = list(paths)
+    load_one = partial(load_file, parse_float=parse_float)
+
+    if executor is not None:
+        return list(executor.map(load_one, files, chunksize=chunk_size(len(files), max_workers)))
+
+    max_workers = min(max_workers or py_os.cpu_count() or 1, len(files))
+    if max_workers < 2 or batch_size(files) < MIN_POOL_BATCH_SIZE:
+        return [load_one(path) for path in files]
+
+    with ProcessPoolExecutor(max_workers) as pool:
+        return list(pool.map(load_one, files, chunksize=chunk_size(len(files), max_workers)))
+
+
+def load_file(
+    path: str | bytes | PathLike[str] | PathLike[bytes],
+    /,
+    *,
+    parse_float: ParseFloat = float,
+) -> dict[str, Any] | OSError | ValueError | RecursionError | MemoryError:
+    """Parse TOML from the file at `path`, returning the exception if it fails."""
+    try:
+        with open(path, "rb") as fp:  # noqa: PTH123
+            return load(fp, parse_float=parse_float)
+    except (OSError, ValueError, RecursionError, MemoryError) as e:
+        return e
+
+
+def batch_size(paths: list[str | bytes | PathLike[str] | PathLike[bytes]]) -> int:
+    """Return the total size of the files, skipping those that cannot be accessed."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.stat(path).st_size
+        except (OSError, ValueError):
+            continue
+        if total >= MIN_POOL_BATCH_SIZE:
+            break
+    return total
+
+
+def chunk_size(n: int, max_workers: int | None) -> int:
+    """Return the number of files to send to a worker at once."""
+    # A few chunks per worker balance the load while keeping the IPC overhead low
+    return max(1, n // ((max_workers or py_os.cpu_count() or 1) * 4))
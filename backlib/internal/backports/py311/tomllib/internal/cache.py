@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from backlib.internal.backports.py311 import os
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import load
+
+
+if TYPE_CHECKING:
+    from backlib.internal.backports.py311.os import PathLike, stat_result
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+
+
+__all__: list[str] = ["CacheInfo", "PathCache", "copy_toml", "load_path"]
+
+
+class CacheInfo(NamedTuple):
+    """The statistics of `PathCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class PathCache:
+    """A bounded LRU cache of parsed TOML files.
+
+    Notes
+    -----
+    * Entries are keyed by `(st_dev, st_ino, st_size, st_mtime_ns)` of the file, so any change
+      of the file (including atomic replacement) invalidates its entry.
+    * Callers get a copy of the cached document, so they can mutate it freely.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(
+        self,
+        path: str | bytes | PathLike[str] | PathLike[bytes],
+        /,
+        *,
+        parse_float: ParseFloat = float,
+    ) -> dict[str, Any]:
+        """Parse TOML from the file at `path`, unless it is cached already."""
+        key = stat_key(os.stat(path), parse_float)
+        with self._lock:
+            doc = self._entries.get(key)
+            if doc is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+        if doc is not None:
+            return copy_toml(doc)
+
+        with open(path, "rb") as fp:  # noqa: PTH123
+            # The file may have changed since, so use the status of what is being read
+            key = stat_key(os.fstat(fp.fileno()), parse_float)
+            doc = load(fp, parse_float=parse_float)
+
+        with self._lock:
+            self._misses += 1
+            if self._maxsize > 0:
+                self._entries[key] = doc
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return copy_toml(doc)
+
+    def cache_info(self) -> CacheInfo:
+        """Report the cache statistics."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._maxsize,
+                len(self._entries),
+            )
+
+    def cache_clear(self) -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+def stat_key(st: stat_result, parse_float: ParseFloat) -> tuple:
+    """Return the cache key of a file with the status `st`."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, parse_float)
+
+
+def copy_toml(obj: Any) -> Any:
+    """Copy a parsed TOML document.
+
+    Notes
+    -----
+    * Only tables and arrays are copied. Other values are immutable and are shared.
+    """
+    if isinstance(obj, dict):
+        return {k: copy_toml(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [copy_toml(v) for v in obj]
+    return obj
+
+
+load_path = PathCache()
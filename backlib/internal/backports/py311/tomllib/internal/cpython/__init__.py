@@ -2,14 +2,33 @@
 # SPDX-FileCopyrightText: 2021 Taneli Hukkinen
 # Licensed to PSF under a Contributor Agreement.
 
-__all__: list[str] = ["TOMLDecodeError", "load", "loads"]
+import sys
+
+
+__all__: list[str] = [
+    "Limits",
+    "TOMLDecodeError",
+    "TOMLLimitError",
+    "iterparse",
+    "load",
+    "loads",
+    "loads_bytes",
+    "validate",
+]
 
 from backlib.internal.backports.py311.tomllib.internal.cpython.parser import (
+    Limits,
     TOMLDecodeError,
+    TOMLLimitError,
+    iterparse,
     load,
     loads,
+    loads_bytes,
+    validate,
 )
 
 
-# Pretend this exception was created here.
-TOMLDecodeError.__module__ = __name__
+# Pretend this exception was created here, unless it is the one of the standard library.
+if sys.version_info < (3, 11):
+    TOMLDecodeError.__module__ = __name__
+TOMLLimitError.__module__ = __name__
@@ -4,8 +4,13 @@
 
 from __future__ import annotations
 
+import calendar
+import codecs
+import re
 import string
+import sys
 
+from array import array
 from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, NamedTuple
 
@@ -16,11 +21,15 @@ from backlib.internal.backports.py311.tomllib.internal.cpython.re import (
     match_to_datetime,
     match_to_localtime,
     match_to_number,
+    may_be_date_or_time,
 )
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+    from typing import Literal
+
+    from typing_extensions import Buffer
 
     from backlib.internal.backports.py311.tomllib.internal.cpython.types import Key, ParseFloat, Pos
     from backlib.internal.typing import SupportsRead
@@ -43,6 +52,81 @@ TOML_WS_AND_NEWLINE = TOML_WS | frozenset("\n")
 BARE_KEY_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
 KEY_INITIAL_CHARS = BARE_KEY_CHARS | frozenset("\"'")
 HEXDIGIT_CHARS = frozenset(string.hexdigits)
+SCALAR_INITIAL_CHARS = frozenset(string.digits + "+-")
+
+# Scanners consuming whole runs of characters from the sets above at once
+SKIP_CHARS_RE: Mapping[frozenset[str], re.Pattern[str]] = MappingProxyType(
+    {
+        TOML_WS: re.compile(r"[ \t]*"),
+        TOML_WS_AND_NEWLINE: re.compile(r"[ \t\n]*"),
+        BARE_KEY_CHARS: re.compile(r"[A-Za-z0-9_-]*"),
+    },
+)
+FIND_CHARS_RE: Mapping[frozenset[str], re.Pattern[str]] = MappingProxyType(
+    {
+        ILLEGAL_BASIC_STR_CHARS: re.compile(r"[\x00-\x08\x0a-\x1f\x7f]"),
+        ILLEGAL_MULTILINE_BASIC_STR_CHARS: re.compile(r"[\x00-\x08\x0b-\x1f\x7f]"),
+    },
+)
+
+# The same sets as bytes to delete with `bytes.translate`, which `find_chars` uses to check
+# chunks of `BULK_SCAN_SIZE` characters several times faster than a regex search
+FIND_CHARS_BYTES: Mapping[frozenset[str], bytes] = MappingProxyType(
+    {chars: "".join(sorted(chars)).encode() for chars in FIND_CHARS_RE},
+)
+BULK_SCAN_SIZE = 1 << 14
+
+# The number of parts `parse_multiline_basic_str` joins at a time, so that strings with many
+# escapes do not keep a small string object per escape alive
+JOIN_BATCH_SIZE = 1024
+
+# The next character `parse_basic_str` has to look at: a quote, a backslash or an illegal one
+RE_BASIC_STR_SPECIAL = re.compile(r'["\\\x00-\x08\x0a-\x1f\x7f]')
+RE_MULTILINE_BASIC_STR_SPECIAL = re.compile(r'["\\\x00-\x08\x0b-\x1f\x7f]')
+
+# Size of the binary chunks `load` reads from a file object.
+CHUNK_SIZE = 1 << 16
+
+RE_ERR_COORDS = re.compile(r"\(at line (\d+), column (\d+)\)\Z")
+
+# The lowest limit `sys.set_int_max_str_digits` accepts.
+MIN_INT_MAX_STR_DIGITS = 640
+
+# Strings without escapes and illegal characters, which `skim_value` can skip at once.
+RE_PLAIN_BASIC_STR = re.compile(r'"[^"\\\x00-\x08\x0a-\x1f\x7f]*"')
+RE_PLAIN_LITERAL_STR = re.compile(r"'[^'\x00-\x08\x0a-\x1f\x7f]*'")
+
+# Arrays of only decimal integers or only floats, without comments, which
+# `parse_numeric_array` converts at once.
+_WS = r"[ \t\n]*"
+_DEC_INT = r"[+-]?(?:0|[1-9](?:_?[0-9])*)"
+_EXP = r"[eE][+-]?[0-9](?:_?[0-9])*"
+_FLOAT = rf"(?:{_DEC_INT}(?:\.[0-9](?:_?[0-9])*(?:{_EXP})?|{_EXP})|[+-]?(?:inf|nan))"
+RE_INT_ARRAY = re.compile(rf"\[{_WS}{_DEC_INT}(?:{_WS},{_WS}{_DEC_INT})*{_WS}(?:,{_WS})?\]")
+RE_FLOAT_ARRAY = re.compile(rf"\[{_WS}{_FLOAT}(?:{_WS},{_WS}{_FLOAT})*{_WS}(?:,{_WS})?\]")
+
+# Strings without escapes, booleans, dates up to the 28th, times and decimal numbers that cannot
+# exceed any limit of `sys.set_int_max_str_digits`, followed by what may follow a value, and
+# arrays of only these without comments, which `skim_value` skips at once if floats are parsed
+# with `float`. Where backtracking could end a match earlier than `parse_value` does, it is
+# followed by a character that may not follow a value.
+_SHORT_DEC_INT = rf"[+-]?(?:0|[1-9](?:_?[0-9]){{0,{MIN_INT_MAX_STR_DIGITS - 2}}})"
+_TIME = r"(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](?:\.[0-9]+)?"
+_DATETIME = (
+    r"(?!0000)[0-9]{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1[0-9]|2[0-8])"
+    rf"(?:[Tt ]{_TIME}(?:[Zz]|[+-](?:[01][0-9]|2[0-3]):[0-5][0-9])?|(?![Tt ]{_TIME}))"
+)
+_PLAIN_SCALAR = (
+    r'(?:"(?!"")[^"\\\x00-\x08\x0a-\x1f\x7f]*"'
+    r"|'(?!'')[^'\x00-\x08\x0a-\x1f\x7f]*'"
+    rf"|true|false|{_DATETIME}|{_TIME}|{_SHORT_DEC_INT}(?:\.[0-9](?:_?[0-9])*)?(?:{_EXP})?)"
+    r"(?=[ \t\n,\]}#]|\Z)"
+)
+RE_PLAIN_VALUE = re.compile(
+    rf"{_PLAIN_SCALAR}|\[{_WS}(?:{_PLAIN_SCALAR}{_WS},{_WS})*(?:{_PLAIN_SCALAR}{_WS})?\]",
+)
+# A bare key with such a value, the most common key/value pair.
+RE_PLAIN_KEY_VALUE = re.compile(rf"([A-Za-z0-9_-]+)[ \t]*=[ \t]*({RE_PLAIN_VALUE.pattern})")
 
 BASIC_STR_ESCAPE_REPLACEMENTS = MappingProxyType(
     {
@@ -57,97 +141,353 @@ BASIC_STR_ESCAPE_REPLACEMENTS = MappingProxyType(
 )
 
 
-class TOMLDecodeError(ValueError):
-    """An error raised if a document is not valid TOML.
+if sys.version_info >= (3, 11):
+    # The class of the standard library, so that `except tomllib.TOMLDecodeError` catches the
+    # errors of both parsers
+    from tomllib import TOMLDecodeError
+else:
 
-    See Also
-    --------
-    * `tomllib.TOMLDecodeError`.
+    class TOMLDecodeError(ValueError):
+        """An error raised if a document is not valid TOML.
+
+        See Also
+        --------
+        * `tomllib.TOMLDecodeError`.
+        """
+
+
+class TOMLLimitError(TOMLDecodeError):
+    """An error raised if a document exceeds the `limits` it is parsed with."""
+
+
+# The default `max_depth` of `Limits`, which parses well within the default recursion limit.
+DEFAULT_MAX_DEPTH = 100
+
+
+class Limits(NamedTuple):
+    """Limits on the documents `loads` accepts, each of them `None` for no limit.
+
+    Attributes
+    ----------
+    max_size : int, optional
+        The longest document, in characters.
+    max_depth : int, optional, default: DEFAULT_MAX_DEPTH
+        The deepest nesting of values: the number of keys to a value or a table, plus one for
+        each array it is in. E.g. `a.b = [1]` reaches a depth of 3, and so does `[a]` followed
+        by `b = [1]`. The `[[key]]` headers nest as deep as `[key]` headers. Without it, values
+        nested deeper than the recursion limit allows raise `RecursionError`.
+    max_values : int, optional
+        The most values in the document, counting all tables, arrays and array items.
+    max_key_length : int, optional
+        The longest key of a table or a key/value pair, in characters of its parts together.
     """
 
+    max_size: int | None = None
+    max_depth: int | None = DEFAULT_MAX_DEPTH
+    max_values: int | None = None
+    max_key_length: int | None = None
+
 
 def load(fp: SupportsRead[bytes], /, *, parse_float: ParseFloat = float) -> dict[str, Any]:
     """Parse TOML from a binary file object.
 
+    Notes
+    -----
+    * The file is read in chunks of `CHUNK_SIZE` bytes and parsed one statement at a time, so
+      only the parsed data and the statements in flight are kept in memory.
+
     See Also
     --------
     * `tomllib.load`.
     """
-    b = fp.read()
-    try:
-        s = b.decode()
-    except AttributeError:
-        detail = "File must be opened in binary mode, e.g. use `open('foo.toml', 'rb')`"
-        raise TypeError(detail) from None
-    return loads(s, parse_float=parse_float)
+    out = Output(NestedDict(), Flags())
+    for _ in parse_stream(LineReader(fp), out, make_safe_parse_float(parse_float)):
+        pass
+    return out.data.dict
+
+
+def iterparse(
+    fp: SupportsRead[bytes],
+    /,
+    *,
+    parse_float: ParseFloat = float,
+) -> Iterator[tuple[Key, str, Any]]:
+    """Parse TOML from a binary file object into a stream of events.
+
+    Each event is a tuple `(key, event, value)`, where `key` is the absolute key and `event`
+    is one of:
+
+    * `"table"` - a `[table]` header, `value` is `None`;
+    * `"array-item"` - an `[[array]]` header, `value` is `None`;
+    * `"value"` - a key/value pair, `value` is the parsed value.
+
+    Notes
+    -----
+    * The document is validated exactly as by `load`. Events are yielded as the document is
+      read, so the events of the statements preceding an error are yielded before
+      `TOMLDecodeError` is raised.
+    * Only the keys of the document are kept in memory, and only of the last item of every
+      array of tables.
+    """
+    events: list[tuple[Key, str, Any]] = []
+    out = Output(NestedDict(), Flags(), events=events)
+    for _ in parse_stream(LineReader(fp), out, make_safe_parse_float(parse_float)):
+        yield from events
+        events.clear()
 
 
-def loads(s: str, /, *, parse_float: ParseFloat = float) -> dict[str, Any]:  # noqa: C901
+def loads(
+    s: str,
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    select: Iterable[str | Key] | None = None,
+    numeric_arrays: Literal["list", "array"] = "list",
+    compact: bool = False,
+    limits: Limits | None = None,
+) -> dict[str, Any]:
     """Parse TOML from a string.
 
+    The options are documented with `backlib.py311.tomllib.loads`, which parses most documents
+    with this function.
+
     See Also
     --------
     * `tomllib.loads`.
     """
+    if numeric_arrays not in {"list", "array"}:
+        detail = f"numeric_arrays must be 'list' or 'array', not {numeric_arrays!r}"
+        raise ValueError(detail)
+    if limits is not None and limits.max_size is not None and len(s) > limits.max_size:
+        detail = f"Document longer than {limits.max_size} characters"
+        raise TOMLLimitError(detail)
+
     # The spec allows converting "\r\n" to "\n", even in string
     # literals. Let's do so to simplify parsing.
     src = s.replace("\r\n", "\n")
-    pos = 0
-    out = Output(NestedDict(), Flags())
-    header: Key = ()
-    parse_float = make_safe_parse_float(parse_float)
+    out = Output(
+        NestedDict(),
+        Flags(),
+        None if select is None else Selection(select),
+        numeric_arrays=numeric_arrays == "array",
+        budget=None if limits is None else Budget(limits),
+    )
+    for _ in parse_statements(src, out, (), make_safe_parse_float(parse_float)):
+        pass
 
-    # Parse one statement at a time
-    # (typically means one line in TOML source)
-    while True:
-        # 1. Skip line leading whitespace
-        pos = skip_chars(src, pos, TOML_WS)
+    doc = out.data.dict if out.select is None else out.select.prune(out.data.dict)
+    return compact_toml(doc) if compact else doc
 
-        # 2. Parse rules. Expect one of the following:
-        #    - end of file
-        #    - end of line
-        #    - comment
-        #    - key/value pair
-        #    - append dict to list (and move to its namespace)
-        #    - create dict (and move to its namespace)
-        # Skip trailing whitespace when applicable.
-        try:
-            char = src[pos]
-        except IndexError:
-            break
-        if char == "\n":
-            pos += 1
-            continue
-        if char in KEY_INITIAL_CHARS:
-            pos = key_value_rule(src, pos, out, header, parse_float)
-            pos = skip_chars(src, pos, TOML_WS)
-        elif char == "[":
-            try:
-                second_char: str | None = src[pos + 1]
-            except IndexError:
-                second_char = None
-            out.flags.finalize_pending()
-            if second_char == "[":
-                pos, header = create_list_rule(src, pos, out)
-            else:
-                pos, header = create_dict_rule(src, pos, out)
-            pos = skip_chars(src, pos, TOML_WS)
-        elif char != "#":
-            raise suffixed_err(src, pos, "Invalid statement")
 
-        # 3. Skip comment
-        pos = skip_comment(src, pos)
+def loads_bytes(b: Buffer, /, *, parse_float: ParseFloat = float) -> dict[str, Any]:
+    """Parse TOML from a UTF-8 encoded bytes-like object.
+
+    Notes
+    -----
+    * The buffer is decoded in chunks of `CHUNK_SIZE` bytes, so neither it nor the decoded
+      document is copied as a whole. This allows parsing `mmap.mmap` objects directly.
+    * The result is the same as of `loads(bytes(b).decode())`.
+    """
+    with memoryview(b) as view, view.cast("B") as octets:
+        return load(BufferReader(octets), parse_float=parse_float)
+
+
+def validate(s: str, /) -> TOMLDecodeError | None:
+    """Check if a string is a valid TOML document.
+
+    Returns
+    -------
+    TOMLDecodeError | None
+        The error that `loads` raises for the document, or `None` if it is valid.
+
+    Notes
+    -----
+    * The document goes through the same checks as with `loads`, including the redefinition of
+      tables and keys, but its strings, numbers, dates, times, arrays and inline tables are not
+      built.
+    * Only building the values is saved: every key is parsed and tracked as with `loads`, to
+      find the redefinitions. Documents of mostly keys and tables, or of a few long strings,
+      are checked about as fast as they are parsed, and documents of many numbers, dates and
+      arrays about twice as fast.
+    """
+    try:
+        loads(s, select=())
+    except TOMLDecodeError as e:
+        return e
+    return None
+
+
+def parse_statement(
+    src: str,
+    pos: Pos,
+    out: Output,
+    header: Key,
+    parse_float: ParseFloat,
+) -> tuple[Pos, Key]:
+    """Parse a statement with its trailing newline and return the new position and header."""
+    # 1. Skip line leading whitespace
+    pos = skip_chars(src, pos, TOML_WS)
 
-        # 4. Expect end of line or end of file
+    # 2. Parse rules. Expect one of the following:
+    #    - end of file
+    #    - end of line
+    #    - comment
+    #    - key/value pair
+    #    - append dict to list (and move to its namespace)
+    #    - create dict (and move to its namespace)
+    # Skip trailing whitespace when applicable.
+    try:
+        char = src[pos]
+    except IndexError:
+        return pos, header
+    if char == "\n":
+        return pos + 1, header
+    if char in KEY_INITIAL_CHARS:
+        pos = key_value_rule(src, pos, out, header, parse_float)
+        pos = skip_chars(src, pos, TOML_WS)
+    elif char == "[":
         try:
-            char = src[pos]
+            second_char: str | None = src[pos + 1]
         except IndexError:
-            break
-        if char != "\n":
-            raise suffixed_err(src, pos, "Expected newline or end of document after a statement")
-        pos += 1
+            second_char = None
+        out.flags.finalize_pending()
+        if second_char == "[":
+            pos, header = create_list_rule(src, pos, out)
+        else:
+            pos, header = create_dict_rule(src, pos, out)
+        pos = skip_chars(src, pos, TOML_WS)
+    elif char != "#":
+        raise suffixed_err(src, pos, "Invalid statement")
 
-    return out.data.dict
+    # 3. Skip comment
+    pos = skip_comment(src, pos)
+
+    # 4. Expect end of line or end of file
+    try:
+        char = src[pos]
+    except IndexError:
+        return pos, header
+    if char != "\n":
+        raise suffixed_err(src, pos, "Expected newline or end of document after a statement")
+    return pos + 1, header
+
+
+def parse_statements(
+    src: str,
+    out: Output,
+    header: Key,
+    parse_float: ParseFloat,
+) -> Iterator[tuple[Pos, Key]]:
+    """Parse `src` into `out`, yielding the position and the header after every statement."""
+    # Parse one statement at a time
+    # (typically means one line in TOML source)
+    pos = 0
+    while pos < len(src):
+        pos, header = parse_statement(src, pos, out, header, parse_float)
+        yield pos, header
+
+
+def parse_stream(reader: LineReader, out: Output, parse_float: ParseFloat) -> Iterator[None]:
+    """Parse TOML from `reader` into `out`, yielding after every statement with events."""
+    header: Key = ()
+
+    # `src` always ends with a newline (unless the whole document has been
+    # read), so every statement that parses successfully is a complete one.
+    src = ""
+    lineno = 0
+    while not reader.eof:
+        src += reader.read(len(src))
+        start = 0
+        statements = parse_statements(src, out, header, parse_float)
+        try:
+            # Where the last statement that parses ends, and its header, are kept for a retry
+            for start, header in statements:  # noqa: B007
+                if out.events:
+                    yield
+        except TOMLDecodeError as e:
+            # Statements that do not fit into `src` fail at its very end,
+            # before mutating `out`. Retry them once more data is read.
+            if reader.eof or not str(e).endswith("(at end of document)"):
+                raise relocated_err(e, lineno) from None
+            lineno += src.count("\n", 0, start)
+            src = src[start:]
+        else:
+            lineno += src.count("\n")
+            src = ""
+
+
+class LineReader:
+    """Complete lines decoded from a binary file object in chunks."""
+
+    def __init__(self, fp: SupportsRead[bytes]) -> None:
+        self.eof = False
+        self._fp = fp
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        # The number of bytes decoded, to locate decoding errors in the whole document
+        self._offset = 0
+        # The incomplete last line, split into chunks
+        self._tail: list[str] = []
+        # Whether the last chunk ended with a carriage return
+        self._cr = False
+
+    def read(self, size: int) -> str:
+        r"""Read complete lines of at least `size` characters in total.
+
+        The returned string ends with a newline, unless it is the rest of the document (and
+        `eof` is set). The spec allows converting "\r\n" to "\n", so it is done on the fly.
+        """
+        length = sum(map(len, self._tail))
+        while True:
+            b = self._fp.read(max(size - length, CHUNK_SIZE))
+            try:
+                chunk = self._decoder.decode(b, final=not b)
+            except TypeError:
+                detail = "File must be opened in binary mode, e.g. use `open('foo.toml', 'rb')`"
+                raise TypeError(detail) from None
+            except UnicodeDecodeError as e:
+                raise self.relocated_decode_err(e, b) from None
+            self._offset += len(b)
+            if not b:
+                self.eof = True
+                tail, self._tail = self._tail, []
+                return "".join(tail) + ("\r" if self._cr else "")
+            if self._cr:
+                chunk = "\r" + chunk
+            self._cr = chunk.endswith("\r")
+            if self._cr:
+                chunk = chunk[:-1]
+            chunk = chunk.replace("\r\n", "\n")
+            cut = chunk.rfind("\n") + 1
+            if cut and length + cut >= size:
+                lines = "".join([*self._tail, chunk[:cut]])
+                self._tail = [chunk[cut:]]
+                return lines
+            self._tail.append(chunk)
+            length += len(chunk)
+
+    def relocated_decode_err(self, e: UnicodeDecodeError, b: bytes) -> UnicodeDecodeError:
+        """Locate an error decoding the chunk `b` in the whole document, as `bytes.decode` does.
+
+        The object of the error starts with the incomplete character of the previous chunk.
+        It is padded, as the message only shows the byte at an offset inside the object.
+        """
+        shift = self._offset + len(b) - len(e.object)
+        obj = bytes(shift) + e.object
+        return UnicodeDecodeError(e.encoding, obj, e.start + shift, e.end + shift, e.reason)
+
+
+class BufferReader:
+    """A binary file object reading from a memoryview without copying it as a whole."""
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._pos = 0
+
+    def read(self, size: int = -1, /) -> bytes:
+        """Read and return up to `size` bytes."""
+        start = self._pos
+        self._pos = len(self._view) if size < 0 else min(start + size, len(self._view))
+        return self._view[start : self._pos].tobytes()
 
 
 class Flags:
@@ -159,8 +499,14 @@ class Flags:
     # be opened using the "[table]" syntax.
     EXPLICIT_NEST = 1
 
+    # The flags of a key are bits of an integer mask. The recursive
+    # ones are shifted by this amount.
+    RECURSIVE_SHIFT = 2
+
     def __init__(self) -> None:
-        self._flags: dict[str, dict] = {}
+        # A trie of keys with nodes `[mask, children]`. The children
+        # dict is only created once a nested key is flagged.
+        self._flags: dict[str, list] = {}
         self._pending_flags: set[tuple[Key, int]] = set()
 
     def add_pending(self, key: Key, flag: int) -> None:  # noqa: D102
@@ -172,46 +518,58 @@ class Flags:
         self._pending_flags.clear()
 
     def unset_all(self, key: Key) -> None:  # noqa: D102
-        cont = self._flags
+        cont: dict[str, list] | None = self._flags
         for k in key[:-1]:
-            if k not in cont:
+            if cont is None or k not in cont:
                 return
-            cont = cont[k]["nested"]
-        cont.pop(key[-1], None)
+            cont = cont[k][1]
+        if cont is not None:
+            cont.pop(key[-1], None)
 
     def set(self, key: Key, flag: int, *, recursive: bool) -> None:  # noqa: D102
         cont = self._flags
         key_parent, key_stem = key[:-1], key[-1]
         for k in key_parent:
-            if k not in cont:
-                cont[k] = {"flags": set(), "recursive_flags": set(), "nested": {}}
-            cont = cont[k]["nested"]
-        if key_stem not in cont:
-            cont[key_stem] = {"flags": set(), "recursive_flags": set(), "nested": {}}
-        cont[key_stem]["recursive_flags" if recursive else "flags"].add(flag)
+            node = cont.get(k)
+            if node is None:
+                node = cont[k] = [0, {}]
+            elif node[1] is None:
+                node[1] = {}
+            cont = node[1]
+        bit = 1 << (flag + self.RECURSIVE_SHIFT) if recursive else 1 << flag
+        node = cont.get(key_stem)
+        if node is None:
+            cont[key_stem] = [bit, None]
+        else:
+            node[0] |= bit
 
     def is_(self, key: Key, flag: int) -> bool:  # noqa: D102
         if not key:
             return False  # document root has no flags
-        cont = self._flags
+        recursive_bit = 1 << (flag + self.RECURSIVE_SHIFT)
+        cont: dict[str, list] | None = self._flags
         for k in key[:-1]:
-            if k not in cont:
+            if cont is None or k not in cont:
                 return False
             inner_cont = cont[k]
-            if flag in inner_cont["recursive_flags"]:
+            if inner_cont[0] & recursive_bit:
                 return True
-            cont = inner_cont["nested"]
-        key_stem = key[-1]
-        if key_stem in cont:
-            cont = cont[key_stem]
-            return flag in cont["flags"] or flag in cont["recursive_flags"]
-        return False
+            cont = inner_cont[1]
+        if cont is None:
+            return False
+        node = cont.get(key[-1])
+        return node is not None and bool(node[0] & (recursive_bit | 1 << flag))
 
 
 class NestedDict:  # noqa: D101
     def __init__(self) -> None:
         # The parsed content of the TOML document
         self.dict: dict[str, Any] = {}
+        # The last resolved key and the nests along it, starting with the
+        # document root. Consecutive headers mostly share a prefix, which
+        # is then not walked again.
+        self._path_key: Key = ()
+        self._path_nests: list[dict] = [self.dict]
 
     def get_or_create_nest(  # noqa: D102
         self,
@@ -219,19 +577,29 @@ class NestedDict:  # noqa: D101
         *,
         access_lists: bool = True,
     ) -> dict:
-        cont: Any = self.dict
-        for k in key:
-            if k not in cont:
-                cont[k] = {}
-            cont = cont[k]
-            if access_lists and isinstance(cont, list):
-                cont = cont[-1]
-            if not isinstance(cont, dict):
-                detail = "There is no nest behind this key"
-                raise KeyError(detail)
-        return cont
+        if not access_lists:
+            return get_or_create_nest(self.dict, key, access_lists=False)
+        path_key, nests = self._path_key, self._path_nests
+        if key == path_key:
+            return nests[-1]
+
+        depth = 0
+        for k, path_k in zip(key, path_key):
+            if k != path_k:
+                break
+            depth += 1
+        del nests[depth + 1 :]
+        try:
+            for k in key[depth:]:
+                nests.append(get_or_create_nest(nests[-1], (k,)))
+        except KeyError:
+            del nests[depth + 1 :]
+            self._path_key = key[:depth]
+            raise
+        self._path_key = key
+        return nests[-1]
 
-    def append_nest_to_list(self, key: Key) -> None:  # noqa: D102
+    def append_nest_to_list(self, key: Key, *, keep_items: bool = True) -> None:  # noqa: D102
         cont = self.get_or_create_nest(key[:-1])
         last_key = key[-1]
         if last_key in cont:
@@ -239,23 +607,129 @@ class NestedDict:  # noqa: D101
             if not isinstance(list_, list):
                 detail = "An object other than list found behind this key"
                 raise KeyError(detail)
+            if not keep_items:
+                # Statements can only reach the last item
+                list_.clear()
             list_.append({})
         else:
             cont[last_key] = [{}]
+        # The key now resolves to the new list item, and so do the keys under it
+        self._path_nests.append(cont[last_key][-1])
+        self._path_key = key
+
+
+def get_or_create_nest(cont: Any, key: Key, *, access_lists: bool = True) -> dict:
+    """Get or create the table behind `key` in `cont`, see `NestedDict.get_or_create_nest`."""
+    for k in key:
+        if k not in cont:
+            cont[k] = {}
+        cont = cont[k]
+        if access_lists and isinstance(cont, list):
+            cont = cont[-1]
+        if not isinstance(cont, dict):
+            detail = "There is no nest behind this key"
+            raise KeyError(detail)
+    return cont
+
+
+class Selection:
+    """The tables selected by the `select` argument of `loads`."""
+
+    def __init__(self, keys: Iterable[str | Key]) -> None:
+        if isinstance(keys, str):
+            # Iterating it would select the tables of its characters
+            detail = f"select must be an iterable of keys, e.g. [{keys!r}], not a str"
+            raise TypeError(detail)
+        self.keys = tuple(parse_selected_key(k) if isinstance(k, str) else tuple(k) for k in keys)
+        self._includes: dict[Key, bool] = {}
+
+    def includes(self, key: Key) -> bool:
+        """Check if `key` is within one of the selected tables."""
+        try:
+            return self._includes[key]
+        except KeyError:
+            includes = any(key[: len(k)] == k for k in self.keys)
+            self._includes[key] = includes
+            return includes
+
+    def touches(self, key: Key) -> bool:
+        """Check if `key` is within, or is a parent of one of the selected tables."""
+        return any(key[: len(k)] == k[: len(key)] for k in self.keys)
+
+    def prune(self, doc: dict[str, Any]) -> dict[str, Any]:
+        """Remove everything but the selected tables from a parsed document."""
+        return prune_dict(doc, self.keys)
+
+
+class Budget:
+    """The values parsed so far, and the depth of the value being parsed, under `Limits`."""
+
+    def __init__(self, limits: Limits) -> None:
+        self.limits = limits
+        self.values = 0
+        # The length of the path to the value being parsed
+        self.depth = 0
+
+    def count_values(self, src: str, pos: Pos, count: int = 1) -> None:
+        """Count `count` values at the current depth, which begin at `pos`."""
+        self.values += count
+        max_values = self.limits.max_values
+        if max_values is not None and self.values > max_values:
+            raise suffixed_err(src, pos, f"More than {max_values} values", cls=TOMLLimitError)
+        max_depth = self.limits.max_depth
+        if max_depth is not None and self.depth > max_depth:
+            msg = f"Nested deeper than {max_depth} levels"
+            raise suffixed_err(src, pos, msg, cls=TOMLLimitError)
+
+    def count_table(self, src: str, pos: Pos, key: Key) -> None:
+        """Count the `[key]` table or `[[key]]` array item, whose key begins at `pos`.
+
+        The key/value pairs that follow are then parsed at the depth of the table.
+        """
+        self.depth = len(key)
+        self.count_values(src, pos)
+
+    def count_array(self, src: str, pos: Pos, size: int) -> None:
+        """Count an array of `size` items that was parsed without `parse_value`."""
+        self.count_values(src, pos)
+        if size:
+            self.depth += 1
+            self.count_values(src, pos, size)
+            self.depth -= 1
 
 
 class Output(NamedTuple):  # noqa: D101
     data: NestedDict
     flags: Flags
+    select: Selection | None = None
+    # Receives the events of `iterparse`, values are not stored then
+    events: list[tuple[Key, str, Any]] | None = None
+    # Whether to parse numeric arrays into `array.array`, see `loads`
+    numeric_arrays: bool = False
+    # Counts the values against the `limits` of `loads`
+    budget: Budget | None = None
 
 
-def skip_chars(src: str, pos: Pos, chars: Iterable[str]) -> Pos:  # noqa: D103
+def skip_chars(src: str, pos: Pos, chars: frozenset[str]) -> Pos:  # noqa: D103
+    # Most runs are zero or one character long, which is cheaper to check by hand
     try:
-        while src[pos] in chars:
-            pos += 1
+        if src[pos] not in chars:
+            return pos
+        pos += 1
+        if src[pos] not in chars:
+            return pos
     except IndexError:
-        pass
-    return pos
+        return pos
+    try:
+        skip_re = SKIP_CHARS_RE[chars]
+    except KeyError:
+        try:
+            while src[pos] in chars:
+                pos += 1
+        except IndexError:
+            pass
+        return pos
+    return skip_re.match(src, pos).end()  # type: ignore[union-attr]
 
 
 def skip_until(  # noqa: D103
@@ -273,11 +747,36 @@ def skip_until(  # noqa: D103
         if error_on_eof:
             raise suffixed_err(src, new_pos, f"Expected {expect!r}") from None
 
-    if not error_on.isdisjoint(src[pos:new_pos]):
+    try:
+        found = find_chars(src, pos, new_pos, error_on)
+    except KeyError:
+        if error_on.isdisjoint(src[pos:new_pos]):
+            return new_pos
         while src[pos] not in error_on:
             pos += 1
-        raise suffixed_err(src, pos, f"Found invalid character {src[pos]!r}")
-    return new_pos
+    else:
+        if found is None:
+            return new_pos
+        pos = found
+    raise suffixed_err(src, pos, f"Found invalid character {src[pos]!r}")
+
+
+def find_chars(src: str, pos: Pos, end: Pos, chars: frozenset[str]) -> Pos | None:
+    """Return the position of the first of `chars` in `src[pos:end]`, or `None`.
+
+    Raises KeyError if `chars` is not one of the sets of `FIND_CHARS_RE`.
+    """
+    find_re = FIND_CHARS_RE[chars]
+    delete = FIND_CHARS_BYTES[chars]
+    # Skip the chunks without any of them, then search the rest
+    while end - pos > BULK_SCAN_SIZE:
+        chunk = src[pos : pos + BULK_SCAN_SIZE].encode("utf-8", "surrogatepass")
+        if len(chunk.translate(None, delete)) != len(chunk):
+            end = pos + BULK_SCAN_SIZE
+            break
+        pos += BULK_SCAN_SIZE
+    match = find_re.search(src, pos, end)
+    return None if match is None else match.start()
 
 
 def skip_comment(src: str, pos: Pos) -> Pos:  # noqa: D103
@@ -302,8 +801,19 @@ def skip_comments_and_array_ws(src: str, pos: Pos) -> Pos:  # noqa: D103
 def create_dict_rule(src: str, pos: Pos, out: Output) -> tuple[Pos, Key]:  # noqa: D103
     pos += 1  # Skip "["
     pos = skip_chars(src, pos, TOML_WS)
-    pos, key = parse_key(src, pos)
+    key_pos = pos
+    pos, key = parse_key(src, pos, None if out.budget is None else out.budget.limits.max_key_length)
+    if out.budget is not None:
+        out.budget.count_table(src, key_pos, key)
+    declare_table(src, pos, out, key)
+
+    if not src.startswith("]", pos):
+        raise suffixed_err(src, pos, "Expected ']' at the end of a table declaration")
+    return pos + 1, key
 
+
+def declare_table(src: str, pos: Pos, out: Output, key: Key) -> None:
+    """Declare the `[key]` table, `src` and `pos` only locate the errors."""
     if out.flags.is_(key, Flags.EXPLICIT_NEST) or out.flags.is_(key, Flags.FROZEN):
         raise suffixed_err(src, pos, f"Cannot declare {key} twice")
     out.flags.set(key, Flags.EXPLICIT_NEST, recursive=False)
@@ -311,17 +821,26 @@ def create_dict_rule(src: str, pos: Pos, out: Output) -> tuple[Pos, Key]:  # noq
         out.data.get_or_create_nest(key)
     except KeyError:
         raise suffixed_err(src, pos, "Cannot overwrite a value") from None
-
-    if not src.startswith("]", pos):
-        raise suffixed_err(src, pos, "Expected ']' at the end of a table declaration")
-    return pos + 1, key
+    if out.events is not None:
+        out.events.append((key, "table", None))
 
 
 def create_list_rule(src: str, pos: Pos, out: Output) -> tuple[Pos, Key]:  # noqa: D103
     pos += 2  # Skip "[["
     pos = skip_chars(src, pos, TOML_WS)
-    pos, key = parse_key(src, pos)
+    key_pos = pos
+    pos, key = parse_key(src, pos, None if out.budget is None else out.budget.limits.max_key_length)
+    if out.budget is not None:
+        out.budget.count_table(src, key_pos, key)
+    declare_array_item(src, pos, out, key)
 
+    if not src.startswith("]]", pos):
+        raise suffixed_err(src, pos, "Expected ']]' at the end of an array declaration")
+    return pos + 2, key
+
+
+def declare_array_item(src: str, pos: Pos, out: Output, key: Key) -> None:
+    """Declare an item of the `[[key]]` array, `src` and `pos` only locate the errors."""
     if out.flags.is_(key, Flags.FROZEN):
         raise suffixed_err(src, pos, f"Cannot mutate immutable namespace {key}")
     # Free the namespace now that it points to another empty list item...
@@ -329,13 +848,11 @@ def create_list_rule(src: str, pos: Pos, out: Output) -> tuple[Pos, Key]:  # noq
     # ...but this key precisely is still prohibited from table declaration
     out.flags.set(key, Flags.EXPLICIT_NEST, recursive=False)
     try:
-        out.data.append_nest_to_list(key)
+        out.data.append_nest_to_list(key, keep_items=out.events is None)
     except KeyError:
         raise suffixed_err(src, pos, "Cannot overwrite a value") from None
-
-    if not src.startswith("]]", pos):
-        raise suffixed_err(src, pos, "Expected ']]' at the end of an array declaration")
-    return pos + 2, key
+    if out.events is not None:
+        out.events.append((key, "array-item", None))
 
 
 def key_value_rule(  # noqa: D103
@@ -345,7 +862,25 @@ def key_value_rule(  # noqa: D103
     header: Key,
     parse_float: ParseFloat,
 ) -> Pos:
-    pos, key, value = parse_key_value_pair(src, pos, parse_float)
+    # Values outside the selected tables are counted against the limits as well
+    if out.select is None or out.budget is not None or out.select.includes(header):
+        pos, key, value = parse_key_value_pair(
+            src,
+            pos,
+            parse_float,
+            numeric_arrays=out.numeric_arrays,
+            budget=out.budget,
+        )
+    else:
+        # With nothing selected, as for `validate`, no key needs checking against the selection
+        select = out.select if out.select.keys else None
+        pos, key, value = skim_key_value_pair(src, pos, parse_float, header, select)
+    store_value(src, pos, out, header, key, value)
+    return pos
+
+
+def store_value(src: str, pos: Pos, out: Output, header: Key, key: Key, value: Any) -> None:
+    """Store the value of `key` in the `header` table, `src` and `pos` only locate the errors."""
     key_parent, key_stem = key[:-1], key[-1]
     abs_key_parent = header + key_parent
 
@@ -358,7 +893,8 @@ def key_value_rule(  # noqa: D103
         # dotted key/value syntax in following table sections.
         out.flags.add_pending(cont_key, Flags.EXPLICIT_NEST)
 
-    if out.flags.is_(abs_key_parent, Flags.FROZEN):
+    # The header itself cannot be frozen, it was checked when declared
+    if key_parent and out.flags.is_(abs_key_parent, Flags.FROZEN):
         raise suffixed_err(src, pos, f"Cannot mutate immutable namespace {abs_key_parent}")
 
     try:
@@ -368,17 +904,61 @@ def key_value_rule(  # noqa: D103
     if key_stem in nest:
         raise suffixed_err(src, pos, "Cannot overwrite a value")
     # Mark inline table and array namespaces recursively immutable
-    if isinstance(value, (dict, list)):
+    if isinstance(value, (dict, list, array)):
         out.flags.set(header + key, Flags.FROZEN, recursive=True)
+    if out.events is not None:
+        out.events.append((header + key, "value", value))
+        # Later statements only need to know that the key is taken
+        value = None
     nest[key_stem] = value
-    return pos
 
 
 def parse_key_value_pair(  # noqa: D103
     src: str,
     pos: Pos,
     parse_float: ParseFloat,
+    *,
+    numeric_arrays: bool = False,
+    budget: Budget | None = None,
+) -> tuple[Pos, Key, Any]:
+    pos, key = parse_key(src, pos, None if budget is None else budget.limits.max_key_length)
+    try:
+        char: str | None = src[pos]
+    except IndexError:
+        char = None
+    if char != "=":
+        raise suffixed_err(src, pos, "Expected '=' after a key in a key/value pair")
+    pos += 1
+    pos = skip_chars(src, pos, TOML_WS)
+    if budget is not None:
+        budget.depth += len(key)
+    if numeric_arrays and src.startswith("[", pos):
+        numeric_array = parse_numeric_array(src, pos, parse_float)
+        if numeric_array is not None:
+            if budget is not None:
+                budget.count_array(src, pos, len(numeric_array[1]))
+                budget.depth -= len(key)
+            return numeric_array[0], key, numeric_array[1]
+    pos, value = parse_value(src, pos, parse_float, budget)
+    if budget is not None:
+        budget.depth -= len(key)
+    return pos, key, value
+
+
+def skim_key_value_pair(
+    src: str,
+    pos: Pos,
+    parse_float: ParseFloat,
+    header: Key = (),
+    select: Selection | None = None,
 ) -> tuple[Pos, Key, Any]:
+    """Parse a key/value pair like `parse_key_value_pair`, but skim unselected values."""
+    if parse_float is float:
+        match = RE_PLAIN_KEY_VALUE.match(src, pos)
+        if match:
+            key: Key = (match.group(1),)
+            if select is None or not select.touches(header + key):
+                return match.end(), key, [] if src.startswith("[", match.start(2)) else None
     pos, key = parse_key(src, pos)
     try:
         char: str | None = src[pos]
@@ -388,25 +968,35 @@ def parse_key_value_pair(  # noqa: D103
         raise suffixed_err(src, pos, "Expected '=' after a key in a key/value pair")
     pos += 1
     pos = skip_chars(src, pos, TOML_WS)
-    pos, value = parse_value(src, pos, parse_float)
+    if select is not None and select.touches(header + key):
+        pos, value = parse_value(src, pos, parse_float)
+    else:
+        pos, value = skim_value(src, pos, parse_float)
     return pos, key, value
 
 
-def parse_key(src: str, pos: Pos) -> tuple[Pos, Key]:  # noqa: D103
+def parse_key(src: str, pos: Pos, max_length: int | None = None) -> tuple[Pos, Key]:
+    """Parse a dotted key, raise `TOMLLimitError` as soon as it is longer than `max_length`."""
+    key_pos = pos
     pos, key_part = parse_key_part(src, pos)
-    key: Key = (key_part,)
+    key = [key_part]
+    length = len(key_part)
     pos = skip_chars(src, pos, TOML_WS)
     while True:
+        if max_length is not None and length > max_length:
+            msg = f"Key longer than {max_length} characters"
+            raise suffixed_err(src, key_pos, msg, cls=TOMLLimitError)
         try:
             char: str | None = src[pos]
         except IndexError:
             char = None
         if char != ".":
-            return pos, key
+            return pos, tuple(key)
         pos += 1
         pos = skip_chars(src, pos, TOML_WS)
         pos, key_part = parse_key_part(src, pos)
-        key += (key_part,)
+        key.append(key_part)
+        length += len(key_part)
         pos = skip_chars(src, pos, TOML_WS)
 
 
@@ -431,7 +1021,12 @@ def parse_one_line_basic_str(src: str, pos: Pos) -> tuple[Pos, str]:  # noqa: D1
     return parse_basic_str(src, pos, multiline=False)
 
 
-def parse_array(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, list]:  # noqa: D103
+def parse_array(  # noqa: D103
+    src: str,
+    pos: Pos,
+    parse_float: ParseFloat,
+    budget: Budget | None = None,
+) -> tuple[Pos, list]:
     pos += 1
     array: list = []
 
@@ -439,7 +1034,7 @@ def parse_array(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, list]
     if src.startswith("]", pos):
         return pos + 1, array
     while True:
-        pos, val = parse_value(src, pos, parse_float)
+        pos, val = parse_value(src, pos, parse_float, budget)
         array.append(val)
         pos = skip_comments_and_array_ws(src, pos)
 
@@ -455,25 +1050,69 @@ def parse_array(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, list]
             return pos + 1, array
 
 
+def parse_limited_array(
+    src: str,
+    pos: Pos,
+    parse_float: ParseFloat,
+    budget: Budget,
+) -> tuple[Pos, list]:
+    """Parse an array under `Limits`, its items are one level deeper than the array itself."""
+    budget.depth += 1
+    pos, array = parse_array(src, pos, parse_float, budget)
+    budget.depth -= 1
+    return pos, array
+
+
+def parse_numeric_array(
+    src: str,
+    pos: Pos,
+    parse_float: ParseFloat,
+) -> tuple[Pos, array] | None:
+    """Parse an array of only decimal integers or only floats into `array.array`.
+
+    Returns `None` for any other array, which is then left to `parse_array`.
+    """
+    convert: Callable[[str], float | int]
+    match = RE_INT_ARRAY.match(src, pos)
+    if match:
+        typecode, convert = "q", int
+    else:
+        match = RE_FLOAT_ARRAY.match(src, pos) if parse_float is float else None
+        if not match:
+            return None
+        typecode, convert = "d", float
+
+    # The elements keep the surrounding whitespace, which `int` and `float` strip
+    elements = src[pos + 1 : match.end() - 1].split(",")
+    if elements[-1].isspace() or not elements[-1]:
+        elements.pop()  # Trailing comma
+    try:
+        return match.end(), array(typecode, map(convert, elements))
+    except (OverflowError, ValueError):
+        return None
+
+
 def parse_inline_table(  # noqa: D103
     src: str,
     pos: Pos,
     parse_float: ParseFloat,
+    budget: Budget | None = None,
 ) -> tuple[Pos, dict]:
     pos += 1
-    nested_dict = NestedDict()
-    flags = Flags()
+    table: dict[str, Any] = {}
+    # Most inline tables hold no arrays or tables, so create flags lazily
+    flags: Flags | None = None
 
     pos = skip_chars(src, pos, TOML_WS)
     if src.startswith("}", pos):
-        return pos + 1, nested_dict.dict
+        return pos + 1, table
     while True:
-        pos, key, value = parse_key_value_pair(src, pos, parse_float)
+        pos, key, value = parse_key_value_pair(src, pos, parse_float, budget=budget)
         key_parent, key_stem = key[:-1], key[-1]
-        if flags.is_(key, Flags.FROZEN):
+        if flags is not None and flags.is_(key, Flags.FROZEN):
             raise suffixed_err(src, pos, f"Cannot mutate immutable namespace {key}")
         try:
-            nest = nested_dict.get_or_create_nest(key_parent, access_lists=False)
+            nest = get_or_create_nest(table, key_parent, access_lists=False)
         except KeyError:
             raise suffixed_err(src, pos, "Cannot overwrite a value") from None
         if key_stem in nest:
@@ -482,10 +1121,12 @@ def parse_inline_table(  # noqa: D103
         pos = skip_chars(src, pos, TOML_WS)
         c = src[pos : pos + 1]
         if c == "}":
-            return pos + 1, nested_dict.dict
+            return pos + 1, table
         if c != ",":
             raise suffixed_err(src, pos, "Unclosed inline table")
         if isinstance(value, (dict, list)):
+            if flags is None:
+                flags = Flags()
             flags.set(key, Flags.FROZEN, recursive=True)
         pos += 1
         pos = skip_chars(src, pos, TOML_WS)
@@ -551,7 +1192,6 @@ def parse_multiline_str(src: str, pos: Pos, *, literal: bool) -> tuple[Pos, str]
         pos += 1
 
     if literal:
-        delim = "'"
         end_pos = skip_until(
             src,
             pos,
@@ -559,37 +1199,84 @@ def parse_multiline_str(src: str, pos: Pos, *, literal: bool) -> tuple[Pos, str]
             error_on=ILLEGAL_MULTILINE_LITERAL_STR_CHARS,
             error_on_eof=True,
         )
-        result = src[pos:end_pos]
-        pos = end_pos + 3
-    else:
-        delim = '"'
-        pos, result = parse_basic_str(src, pos, multiline=True)
-
-    # Add at maximum two extra apostrophes/quotes if the end sequence
-    # is 4 or 5 chars long instead of just 3.
-    if not src.startswith(delim, pos):
-        return pos, result
-    pos += 1
+        # Slice the extra apostrophes along, rather than copying the result to add them
+        extra = count_extra_delims(src, end_pos + 3, "'")
+        return end_pos + 3 + extra, src[pos : end_pos + extra]
+    parsed = parse_multiline_basic_str(src, pos)
+    if parsed is not None:
+        return parsed
+    # Scan character by character to report the error at the right position
+    pos, result = parse_basic_str(src, pos, multiline=True)
+    extra = count_extra_delims(src, pos, '"')
+    return pos + extra, result + '"' * extra
+
+
+def count_extra_delims(src: str, pos: Pos, delim: str) -> int:
+    """Count the at most two quotes after the closing delimiter that belong to the string."""
     if not src.startswith(delim, pos):
-        return pos, result + delim
-    pos += 1
-    return pos, result + (delim * 2)
+        return 0
+    return 2 if src.startswith(delim, pos + 1) else 1
+
+
+def parse_multiline_basic_str(src: str, pos: Pos) -> tuple[Pos, str] | None:
+    """Parse the body of a multiline basic string, jumping from escape to escape.
+
+    Unlike `parse_basic_str`, quotes do not stop the scan: the closing delimiter is found
+    with `str.find`, the whole body is checked for illegal characters at once with
+    `find_chars`, and the runs between escapes are joined in batches of `JOIN_BATCH_SIZE`.
+    Returns `None` if the string has an illegal character or is unterminated, so that
+    `parse_basic_str` reports the error.
+    """
+    end = src.find('"""', pos)
+    if end == -1 or find_chars(src, pos, end, ILLEGAL_MULTILINE_BASIC_STR_CHARS) is not None:
+        return None
+    batches: list[str] = []
+    parts: list[str] = []
+    while True:
+        escape = src.find("\\", pos, end)
+        if escape == -1:
+            break
+        parts.append(src[pos:escape])
+        parsed_escape = BASIC_STR_ESCAPE_REPLACEMENTS.get(src[escape : escape + 2])
+        if parsed_escape is None:
+            pos, parsed_escape = parse_basic_str_escape_multiline(src, escape)
+        else:
+            pos = escape + 2
+        parts.append(parsed_escape)
+        if len(parts) >= JOIN_BATCH_SIZE:
+            batches.append("".join(parts))
+            parts.clear()
+        if pos > end:
+            # An escaped quote was taken for the start of the closing delimiter
+            checked = end
+            end = src.find('"""', pos)
+            if end == -1 or (
+                find_chars(src, checked, end, ILLEGAL_MULTILINE_BASIC_STR_CHARS) is not None
+            ):
+                return None
+    extra = count_extra_delims(src, end + 3, '"')
+    if not parts and not batches:
+        return end + 3 + extra, src[pos : end + extra]
+    parts.append(src[pos : end + extra])
+    batches.append("".join(parts))
+    return end + 3 + extra, "".join(batches)
 
 
 def parse_basic_str(src: str, pos: Pos, *, multiline: bool) -> tuple[Pos, str]:  # noqa: D103
     if multiline:
-        error_on = ILLEGAL_MULTILINE_BASIC_STR_CHARS
+        special_re = RE_MULTILINE_BASIC_STR_SPECIAL
         parse_escapes = parse_basic_str_escape_multiline
     else:
-        error_on = ILLEGAL_BASIC_STR_CHARS
+        special_re = RE_BASIC_STR_SPECIAL
         parse_escapes = parse_basic_str_escape
     result = ""
     start_pos = pos
     while True:
-        try:
-            char = src[pos]
-        except IndexError:
-            raise suffixed_err(src, pos, "Unterminated string") from None
+        match = special_re.search(src, pos)
+        if match is None:
+            raise suffixed_err(src, len(src), "Unterminated string")
+        pos = match.start()
+        char = src[pos]
         if char == '"':
             if not multiline:
                 return pos + 1, result + src[start_pos:pos]
@@ -603,16 +1290,17 @@ def parse_basic_str(src: str, pos: Pos, *, multiline: bool) -> tuple[Pos, str]:
             result += parsed_escape
             start_pos = pos
             continue
-        if char in error_on:
-            raise suffixed_err(src, pos, f"Illegal character {char!r}")
-        pos += 1
+        raise suffixed_err(src, pos, f"Illegal character {char!r}")
 
 
 def parse_value(  # noqa: C901, D103, PLR0911, PLR0912
     src: str,
     pos: Pos,
     parse_float: ParseFloat,
+    budget: Budget | None = None,
 ) -> tuple[Pos, Any]:
+    if budget is not None:
+        budget.count_values(src, pos)
     try:
         char: str | None = src[pos]
     except IndexError:
@@ -640,11 +1328,20 @@ def parse_value(  # noqa: C901, D103, PLR0911, PLR0912
 
     # Arrays
     if char == "[":
+        if budget is not None:
+            return parse_limited_array(src, pos, parse_float, budget)
         return parse_array(src, pos, parse_float)
 
     # Inline tables
     if char == "{":
-        return parse_inline_table(src, pos, parse_float)
+        return parse_inline_table(src, pos, parse_float, budget)
+
+    # Numbers need only one regex, the date and time regexes are skipped for them. Parsing
+    # dates, times or decimal integers by hand is no faster than the regexes.
+    if char in SCALAR_INITIAL_CHARS and not may_be_date_or_time(src, pos):
+        number_match = RE_NUMBER.match(src, pos)
+        if number_match:
+            return number_match.end(), match_to_number(number_match, parse_float)
 
     # Dates and times
     datetime_match = RE_DATETIME.match(src, pos)
@@ -676,7 +1373,184 @@ def parse_value(  # noqa: C901, D103, PLR0911, PLR0912
     raise suffixed_err(src, pos, "Invalid value")
 
 
-def suffixed_err(src: str, pos: Pos, msg: str) -> TOMLDecodeError:
+def skim_value(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, Any]:
+    """Validate a value like `parse_value`, but avoid building it where possible.
+
+    Strings, numbers, dates and times are replaced with `None`, arrays with `[]` and inline
+    tables with `{}`. These placeholders are indistinguishable from the actual values for the
+    namespace checks.
+    """
+    char = src[pos : pos + 1]
+    # Strings are scanned once, rather than by `RE_PLAIN_VALUE` and then by their parser
+    if char in {'"', "'"}:
+        return skim_string(src, pos), None
+    if parse_float is float:
+        match = RE_PLAIN_VALUE.match(src, pos)
+        if match:
+            return match.end(), [] if char == "[" else None
+    if char == "[":
+        return skim_array(src, pos, parse_float)
+    if char == "{":
+        return skim_inline_table(src, pos, parse_float)
+    if char in SCALAR_INITIAL_CHARS:
+        end = skim_scalar(src, pos, parse_float)
+        if end is not None:
+            return end, None
+    # Errors and other scalars are left to the parser itself
+    return parse_value(src, pos, parse_float)
+
+
+def skim_string(src: str, pos: Pos) -> Pos:
+    """Validate a string, and return the position after it.
+
+    Only one-line strings with escapes or errors are built. Multiline strings are parsed, which
+    costs no more than checking them, as their body is sliced at once.
+    """
+    if src.startswith(('"""', "'''"), pos):
+        return parse_multiline_str(src, pos, literal=src[pos] == "'")[0]
+    if src[pos] == '"':
+        match = RE_PLAIN_BASIC_STR.match(src, pos)
+        return match.end() if match else parse_one_line_basic_str(src, pos)[0]
+    match = RE_PLAIN_LITERAL_STR.match(src, pos)
+    return match.end() if match else parse_literal_str(src, pos)[0]
+
+
+def skim_scalar(src: str, pos: Pos, parse_float: ParseFloat) -> Pos | None:
+    """Validate a date, a time or a number without building it, and return the position after it.
+
+    Returns `None` if the value is left to `parse_value`.
+    """
+    match = RE_DATETIME.match(src, pos)
+    if match:
+        # The regex leaves only the day of the month to check
+        return match.end() if is_valid_date(match) else None
+    match = RE_LOCALTIME.match(src, pos)
+    if match:
+        return match.end()
+    match = RE_NUMBER.match(src, pos)
+    if match and is_skimmable_number(match, parse_float):
+        return match.end()
+    return None
+
+
+def is_valid_date(match: re.Match) -> bool:
+    """Check the date of a `RE_DATETIME` match, which `match_to_datetime` would reject."""
+    year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3))
+    if day <= 28:
+        return year > 0
+    return year > 0 and day <= calendar.monthrange(year, month)[1]
+
+
+def is_skimmable_number(match: re.Match, parse_float: ParseFloat) -> bool:
+    """Check if converting a `RE_NUMBER` match can neither fail nor call `parse_float`."""
+    if match.group("floatpart"):
+        return parse_float is float
+    # Long decimal integers may exceed `sys.get_int_max_str_digits()`
+    return match.end() - match.start() <= MIN_INT_MAX_STR_DIGITS
+
+
+def skim_array(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, list]:
+    """Validate an array like `parse_array`, but return `[]` instead."""
+    pos += 1
+
+    pos = skip_comments_and_array_ws(src, pos)
+    if src.startswith("]", pos):
+        return pos + 1, []
+    while True:
+        pos, _ = skim_value(src, pos, parse_float)
+        pos = skip_comments_and_array_ws(src, pos)
+
+        c = src[pos : pos + 1]
+        if c == "]":
+            return pos + 1, []
+        if c != ",":
+            raise suffixed_err(src, pos, "Unclosed array")
+        pos += 1
+
+        pos = skip_comments_and_array_ws(src, pos)
+        if src.startswith("]", pos):
+            return pos + 1, []
+
+
+def skim_inline_table(src: str, pos: Pos, parse_float: ParseFloat) -> tuple[Pos, dict]:
+    """Validate an inline table like `parse_inline_table`, but return `{}` instead."""
+    pos += 1
+    table: dict[str, Any] = {}
+    # Most inline tables hold no arrays or tables, so create flags lazily
+    flags: Flags | None = None
+
+    pos = skip_chars(src, pos, TOML_WS)
+    if src.startswith("}", pos):
+        return pos + 1, {}
+    while True:
+        pos, key, value = skim_key_value_pair(src, pos, parse_float)
+        key_parent, key_stem = key[:-1], key[-1]
+        if flags is not None and flags.is_(key, Flags.FROZEN):
+            raise suffixed_err(src, pos, f"Cannot mutate immutable namespace {key}")
+        try:
+            nest = get_or_create_nest(table, key_parent, access_lists=False)
+        except KeyError:
+            raise suffixed_err(src, pos, "Cannot overwrite a value") from None
+        if key_stem in nest:
+            raise suffixed_err(src, pos, f"Duplicate inline table key {key_stem!r}")
+        nest[key_stem] = value
+        pos = skip_chars(src, pos, TOML_WS)
+        c = src[pos : pos + 1]
+        if c == "}":
+            return pos + 1, {}
+        if c != ",":
+            raise suffixed_err(src, pos, "Unclosed inline table")
+        if isinstance(value, (dict, list)):
+            if flags is None:
+                flags = Flags()
+            flags.set(key, Flags.FROZEN, recursive=True)
+        pos += 1
+        pos = skip_chars(src, pos, TOML_WS)
+
+
+def parse_selected_key(s: str) -> Key:
+    """Parse a key of the `select` argument of `loads`, e.g. `'tool."our.app"'`."""
+    try:
+        pos, key = parse_key(s, 0)
+    except TOMLDecodeError:
+        pos = -1
+    if pos != len(s):
+        detail = f"Invalid key {s!r}"
+        raise ValueError(detail)
+    return key
+
+
+def prune_dict(table: dict[str, Any], keys: Iterable[Key]) -> dict[str, Any]:
+    """Keep only the values under `keys` in a parsed table."""
+    pruned: dict[str, Any] = {}
+    for k, v in table.items():
+        subkeys = [key[1:] for key in keys if key[0] == k]
+        if () in subkeys:
+            pruned[k] = v
+        elif subkeys and isinstance(v, dict):
+            pruned[k] = prune_dict(v, subkeys)
+        elif subkeys and isinstance(v, list):
+            # Descend into arrays of tables and arrays of inline tables
+            pruned[k] = [prune_dict(item, subkeys) for item in v if isinstance(item, dict)]
+    return pruned
+
+
+def compact_toml(obj: Any) -> Any:
+    """Intern the keys of a parsed TOML value and turn its arrays into tuples."""
+    if isinstance(obj, dict):
+        return {sys.intern(k): compact_toml(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return tuple([compact_toml(v) for v in obj])
+    return obj
+
+
+def suffixed_err(
+    src: str,
+    pos: Pos,
+    msg: str,
+    *,
+    cls: type[TOMLDecodeError] = TOMLDecodeError,
+) -> TOMLDecodeError:
     """Return a `TOMLDecodeError` where error message is suffixed with coordinates in source."""
 
     def coord_repr(src: str, pos: Pos) -> str:
@@ -686,7 +1560,21 @@ def suffixed_err(src: str, pos: Pos, msg: str) -> TOMLDecodeError:
         column = pos + 1 if line == 1 else pos - src.rindex("\n", 0, pos)
         return f"line {line}, column {column}"
 
-    return TOMLDecodeError(f"{msg} (at {coord_repr(src, pos)})")
+    return cls(f"{msg} (at {coord_repr(src, pos)})")
+
+
+def relocated_err(err: TOMLDecodeError, lineno: int) -> TOMLDecodeError:
+    """Return `err` with its coordinates moved `lineno` lines down.
+
+    Errors raised while parsing a part of a document that starts at the beginning of a line have
+    correct columns, so only the line numbers need to be adjusted.
+    """
+    msg = str(err)
+    match = RE_ERR_COORDS.search(msg)
+    if not lineno or match is None:
+        return err
+    line = int(match.group(1)) + lineno
+    return TOMLDecodeError(f"{msg[: match.start()]}(at line {line}, column {match.group(2)})")
 
 
 def is_unicode_scalar_value(codepoint: int) -> bool:  # noqa: D103
@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING, Any
 
 
 if TYPE_CHECKING:
-    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat, Pos
 
 # E.g.
 # - 00:32:00.999999
@@ -111,3 +111,12 @@ def match_to_localtime(match: re.Match) -> time:
 def match_to_number(match: re.Match, parse_float: ParseFloat) -> Any:
     """Parse `re.Match` into `float`-like."""
     return parse_float(match.group()) if match.group("floatpart") else int(match.group(), 0)
+
+
+def may_be_date_or_time(src: str, pos: Pos) -> bool:
+    """Check if `RE_DATETIME` or `RE_LOCALTIME` may match at `pos`.
+
+    A date has `-` after the year and a time has `:` after the hour, so any other value, e.g. an
+    integer or a float, can only be matched by `RE_NUMBER`.
+    """
+    return src[pos + 4 : pos + 5] == "-" or src[pos + 2 : pos + 3] == ":"
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import struct
+import tempfile
+
+from collections import deque
+from contextlib import suppress
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
+
+import backlib
+
+from backlib.internal.backports.py311 import os
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+
+
+if TYPE_CHECKING:
+    from backlib.internal.backports.py311.os import PathLike
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+    from backlib.internal.typing import SupportsRead
+
+
+__all__: list[str] = ["decode", "encode", "load"]
+
+
+# Snapshots start with this signature followed by `HEADER`: the version of their format, the
+# length of the payload and its SHA-256.
+MAGIC = b"backlib.tomllib.snapshot\0"
+HEADER = struct.Struct("<BQ32s")
+
+# Snapshots of another version of the format are ignored and overwritten.
+FORMAT_VERSION = 1
+
+SNAPSHOT_SUFFIX = ".tomlc"
+
+# The most snapshots kept in a cache directory. Beyond it, the least recently used ones are
+# removed whenever a snapshot is written.
+MAX_SNAPSHOTS = 256
+
+# Values that JSON cannot represent are stored as patches `[path, kind, text]`.
+PATCH_DECODERS: dict[str, Callable[[str], Any]] = {
+    "date": date.fromisoformat,
+    "datetime": datetime.fromisoformat,
+    "float": float,
+    "time": time.fromisoformat,
+}
+
+
+def load(
+    fp: SupportsRead[bytes],
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    cache_dir: str | PathLike[str] | None = None,
+) -> dict[str, Any]:
+    """Parse TOML from a binary file object.
+
+    If `cache_dir` is set, the parsed document is stored there as a snapshot keyed by the
+    content of the file and the version of `backlib`. The next time the same content is loaded,
+    the snapshot is decoded instead of parsing the document again.
+
+    Notes
+    -----
+    * Snapshots are written atomically, so concurrent processes can share `cache_dir`.
+    * Stale or corrupted snapshots are ignored and overwritten. The signature, the version of
+      the format and the length of a snapshot are checked before its payload is read.
+    * At most `MAX_SNAPSHOTS` snapshots are kept in `cache_dir`, the least recently used ones
+      are removed.
+    * The cache is bypassed when `parse_float` is not `float`.
+    * With `cache_dir`, the file is read in chunks to hash it, and the chunks are kept until
+      they are parsed, as without `cache_dir`.
+
+    See Also
+    --------
+    * `tomllib.load`.
+    """
+    if cache_dir is None:
+        return parser.load(fp, parse_float=parse_float)
+
+    hasher = hashlib.sha256(backlib.__version__.encode() + b"\0")
+    chunks: deque[bytes] = deque()
+    while True:
+        chunk = fp.read(parser.CHUNK_SIZE)
+        if not chunk:
+            break
+        try:
+            hasher.update(chunk)
+        except TypeError:
+            detail = "File must be opened in binary mode, e.g. use `open('foo.toml', 'rb')`"
+            raise TypeError(detail) from None
+        chunks.append(chunk)
+    if parse_float is not float:
+        return parser.load(ChunkReader(chunks), parse_float=parse_float)
+
+    path = Path(cache_dir, hasher.hexdigest() + SNAPSHOT_SUFFIX)
+    with suppress(OSError, ValueError), path.open("rb") as snapshot:
+        doc = read_snapshot(snapshot)
+        # Mark the snapshot as recently used for `prune`
+        with suppress(OSError):
+            os.utime(path)
+        return doc
+
+    doc = parser.load(ChunkReader(chunks))
+    with suppress(OSError):
+        write_atomic(cache_dir, path, encode(doc))
+        prune(cache_dir, MAX_SNAPSHOTS)
+    return doc
+
+
+class ChunkReader:
+    """A binary file object reading back the chunks of a file, releasing each once read."""
+
+    def __init__(self, chunks: deque[bytes]) -> None:
+        self._chunks = chunks
+
+    def read(self, size: int = -1, /) -> bytes:  # noqa: ARG002
+        """Read and return the next chunk, whatever its size."""
+        return self._chunks.popleft() if self._chunks else b""
+
+
+def encode(doc: dict[str, Any]) -> bytes:
+    """Serialize a parsed TOML document into a snapshot."""
+    patches: list[list] = []
+    tree = to_json(doc, [], patches)
+    payload = json.dumps([tree, patches], ensure_ascii=False, separators=(",", ":")).encode()
+    header = HEADER.pack(FORMAT_VERSION, len(payload), hashlib.sha256(payload).digest())
+    return MAGIC + header + payload
+
+
+def decode(b: bytes) -> dict[str, Any]:
+    """Deserialize a snapshot, raising `ValueError` if it is corrupted."""
+    start = len(MAGIC) + HEADER.size
+    size, digest = read_header(b[:start])
+    if len(b) - start != size:
+        detail = "The snapshot is truncated"
+        raise ValueError(detail)
+    return decode_payload(b[start:], digest)
+
+
+def read_snapshot(fp: BinaryIO) -> dict[str, Any]:
+    """Read and deserialize a snapshot, checking its header before reading its payload.
+
+    Raises `ValueError` if it is corrupted.
+    """
+    header = fp.read(len(MAGIC) + HEADER.size)
+    size, digest = read_header(header)
+    if os.fstat(fp.fileno()).st_size - len(header) != size:
+        detail = "The snapshot is truncated"
+        raise ValueError(detail)
+    return decode_payload(fp.read(size), digest)
+
+
+def read_header(b: bytes) -> tuple[int, bytes]:
+    """Check the signature and the version of a snapshot, returning the length and the hash."""
+    if len(b) != len(MAGIC) + HEADER.size or not b.startswith(MAGIC):
+        detail = "The snapshot is corrupted"
+        raise ValueError(detail)
+    version, size, digest = HEADER.unpack_from(b, len(MAGIC))
+    if version != FORMAT_VERSION:
+        detail = f"The snapshot has version {version} of the format, not {FORMAT_VERSION}"
+        raise ValueError(detail)
+    return size, digest
+
+
+def decode_payload(payload: bytes, digest: bytes) -> dict[str, Any]:
+    """Deserialize the payload of a snapshot, checking it against its SHA-256 `digest`."""
+    if hashlib.sha256(payload).digest() != digest:
+        detail = "The snapshot is corrupted"
+        raise ValueError(detail)
+    tree, patches = json.loads(payload)
+    for path, kind, text in patches:
+        cont = tree
+        for k in path[:-1]:
+            cont = cont[k]
+        cont[path[-1]] = PATCH_DECODERS[kind](text)
+    return tree
+
+
+def to_json(obj: Any, path: list, patches: list[list]) -> Any:
+    """Copy a parsed TOML value, replacing what JSON cannot represent with `None`.
+
+    The replaced values are appended to `patches`. TOML has no null, so `None` never clashes
+    with an actual value.
+    """
+    if isinstance(obj, dict):
+        return {k: to_json(v, [*path, k], patches) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [to_json(v, [*path, i], patches) for i, v in enumerate(obj)]
+    patch = to_patch(obj)
+    if patch is None:
+        return obj
+    patches.append([path, *patch])
+    return None
+
+
+def to_patch(obj: Any) -> tuple[str, str] | None:
+    """Return the kind and the text of a scalar that JSON cannot represent, or `None`."""
+    if isinstance(obj, datetime):
+        return "datetime", obj.isoformat()
+    if isinstance(obj, date):
+        return "date", obj.isoformat()
+    if isinstance(obj, time):
+        return "time", obj.isoformat()
+    if isinstance(obj, float) and math.isnan(obj):
+        # JSON would lose the sign of NaN
+        return "float", "-nan" if math.copysign(1, obj) < 0 else "nan"
+    return None
+
+
+def write_atomic(directory: str | PathLike[str], path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temporary file in `directory`."""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=SNAPSHOT_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def prune(directory: str | PathLike[str], keep: int) -> None:
+    """Remove the least recently used snapshots in `directory` beyond the `keep` others."""
+    snapshots = []
+    for path in Path(directory).glob("*" + SNAPSHOT_SUFFIX):
+        # The temporary files of `write_atomic` start with a dot
+        if not path.name.startswith("."):
+            with suppress(OSError):
+                snapshots.append((path.stat().st_mtime, path))
+    if len(snapshots) <= keep:
+        return
+    snapshots.sort(reverse=True)
+    for _, path in snapshots[keep:]:
+        with suppress(OSError):
+            path.unlink()
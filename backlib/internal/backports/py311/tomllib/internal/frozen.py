@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import Key
+
+
+__all__: list[str] = ["FrozenTable", "freeze"]
+
+
+class FrozenTable(Mapping[str, Any]):
+    """An immutable and hashable TOML table.
+
+    Notes
+    -----
+    * Nested tables are `FrozenTable` and arrays are `tuple`, so the whole document can be
+      shared between threads without copying.
+    * The values are frozen on construction.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, mapping: Mapping[str, Any] = {}, /) -> None:
+        self._data: dict[str, Any] = {k: freeze(v) for k, v in mapping.items()}
+        self._hash: int | None = None
+
+    @classmethod
+    def _wrap(cls, data: dict[str, Any]) -> FrozenTable:
+        """Make a table of `data` with frozen values, taking the ownership of it."""
+        self = cls.__new__(cls)
+        self._data = data
+        self._hash = None
+        return self
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of `key`."""
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Check if `key` is in the table."""
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the items of the table with those of another mapping."""
+        if isinstance(other, FrozenTable):
+            return self._data == other._data
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash the items of the table, once."""
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        """Return a representation of the table and its values."""
+        return f"{type(self).__name__}({self._data!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the table without freezing its values again."""
+        return (FrozenTable._wrap, (self._data,))
+
+    def with_changes(self, changes: Mapping[str | Key, Any], /) -> FrozenTable:
+        """Return a copy of the table with the values of `changes`.
+
+        Parameters
+        ----------
+        changes : Mapping[str | Key, Any]
+            The new values by keys, e.g. `{("tool", "ruff", "line-length"): 120}`. Missing
+            tables along the keys are created.
+
+        Notes
+        -----
+        * The copy shares all the unchanged values with the table.
+        """
+        data = dict(self._data)
+        nested: dict[str, dict[str | Key, Any]] = {}
+        for key, value in changes.items():
+            path = (key,) if isinstance(key, str) else tuple(key)
+            if not path:
+                detail = "The key must not be empty"
+                raise ValueError(detail)
+            if len(path) == 1:
+                data[path[0]] = freeze(value)
+            else:
+                nested.setdefault(path[0], {})[path[1:]] = value
+
+        for k, subchanges in nested.items():
+            table = data.get(k, EMPTY_TABLE)
+            if not isinstance(table, FrozenTable):
+                detail = f"The value of {k!r} is not a table"
+                raise TypeError(detail)
+            data[k] = table.with_changes(subchanges)
+        return FrozenTable._wrap(data)
+
+
+EMPTY_TABLE = FrozenTable()
+
+
+def freeze(obj: Any) -> Any:
+    """Make a parsed TOML value immutable, turning its tables into `FrozenTable`.
+
+    Notes
+    -----
+    * Arrays, including `array.array`, are turned into tuples.
+    """
+    if isinstance(obj, FrozenTable):
+        return obj
+    if isinstance(obj, Mapping):
+        return FrozenTable._wrap({k: freeze(v) for k, v in obj.items()})  # noqa: SLF001
+    if isinstance(obj, (list, tuple, array)):
+        return tuple([freeze(v) for v in obj])
+    return obj
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Any, Union
+
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+from backlib.internal.backports.py311.tomllib.internal.parallel import parse_segment, replay
+
+
+if TYPE_CHECKING:
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import Key, ParseFloat
+    from backlib.internal.backports.py311.tomllib.internal.parallel import Section
+
+    # The keys and the list indices from the root of the document to a table
+    Path = tuple[Union[str, int], ...]
+
+
+__all__: list[str] = ["IncrementalParser"]
+
+
+class IncrementalParser:
+    """A TOML document that is parsed again only where it is edited.
+
+    The document is split into segments at its headers. An edit parses again the segments it
+    touches. If the edit only changes values, the new document is the previous one with the
+    tables along the way to these values copied. Otherwise, it is put together from the parsed
+    statements of all the segments with the same checks as of a full parse.
+
+    Parameters
+    ----------
+    s : str
+        The initial text of the document.
+
+    Notes
+    -----
+    * The result and the errors are always the same as of `tomllib.loads` on the whole text.
+    * An edit that makes the document invalid takes as long as a full parse, so that the error
+      is the same. The parser is left as it was before the edit.
+    * The documents share the values that an edit does not change, with each other and with
+      the parser, so they must not be mutated. Copy a document (e.g. with `copy.deepcopy`) to
+      mutate it.
+
+    See Also
+    --------
+    * `tomllib.loads`.
+    """
+
+    def __init__(self, s: str = "", /, *, parse_float: ParseFloat = float) -> None:
+        self._parse_float = parse_float
+        self._text = ""
+        self._bounds: list[int] = [0, 0]
+        self._sections: list[list[Section]] = [[]]
+        self._paths: list[Path | None] = [()]
+        self._doc: dict[str, Any] = {}
+        self._reset(s)
+
+    @property
+    def text(self) -> str:
+        """The current text of the document."""
+        return self._text
+
+    @property
+    def doc(self) -> dict[str, Any]:
+        """The current parsed document."""
+        return self._doc
+
+    def edit(self, offset: int, removed: int, inserted: str, /) -> dict[str, Any]:
+        """Replace `removed` characters at `offset` with `inserted`, returning the new document.
+
+        Raises
+        ------
+        TOMLDecodeError
+            If the edited text is not a valid TOML document.
+        ValueError
+            If the edited range is outside of the text.
+        """
+        text = self._text
+        if offset < 0 or removed < 0 or offset + removed > len(text):
+            detail = f"The range [{offset}, {offset + removed}) is outside of the text"
+            raise ValueError(detail)
+        new_text = text[:offset] + inserted + text[offset + removed :]
+        delta = len(inserted) - removed
+
+        # The segments touching the edit, including those that merely end or start at it
+        bounds = self._bounds
+        n = len(bounds) - 1
+        first = bisect_left(bounds, offset, 1, n + 1) - 1
+        last = bisect_right(bounds, offset + removed, 0, n) - 1
+        start, end = bounds[first], bounds[last + 1] + delta
+
+        parsed = parse_range(new_text, start, end, self._parse_float)
+        if parsed is None:
+            return self._reset(new_text)
+        new_bounds = [*bounds[:first], *parsed[0], *(b + delta for b in bounds[last + 1 :])]
+        sections = [*self._sections[:first], *parsed[1], *self._sections[last + 1 :]]
+
+        paths = [path for path in self._paths[first : last + 1] if path is not None]
+        old_skeletons = [skeleton(segment) for segment in self._sections[first : last + 1]]
+        new_skeletons = [skeleton(segment) for segment in parsed[1]]
+        if len(paths) == len(old_skeletons) and old_skeletons == new_skeletons:
+            # The same keys of the same kinds pass the same checks, so only the values change
+            changes = [c for path, new in zip(paths, parsed[1]) for c in values(path, new)]
+            doc = patch(self._doc, changes) if changes else self._doc
+        else:
+            built = build(sections)
+            if built is None:
+                return self._reset(new_text)
+            doc, self._paths = built
+
+        self._text, self._bounds, self._sections, self._doc = new_text, new_bounds, sections, doc
+        return doc
+
+    def _reset(self, s: str) -> dict[str, Any]:
+        """Parse the whole text, raising `TOMLDecodeError` if it is invalid."""
+        parsed = parse_range(s, 0, len(s), self._parse_float)
+        built = None if parsed is None else build(parsed[1])
+        if parsed is None or built is None:
+            # Raise the same error as a full parse does
+            parser.loads(s, parse_float=self._parse_float)
+            detail = "A valid document is not split into valid segments"
+            raise AssertionError(detail)
+        self._text, self._bounds, self._sections = s, [*parsed[0], len(s)], parsed[1]
+        self._doc, self._paths = built
+        return self._doc
+
+
+def parse_range(
+    s: str,
+    start: int,
+    end: int,
+    parse_float: ParseFloat,
+) -> tuple[list[int], list[list[Section]]] | None:
+    """Parse `s[start:end]` into segments, returning their starts and their sections.
+
+    A segment that is invalid on its own (e.g. because it is split inside a multiline string)
+    is merged with the following ones. Returns `None` if the range cannot be split into valid
+    segments.
+    """
+    starts = [start]
+    pos = s.find("\n[", start, end)
+    while pos >= 0:
+        starts.append(pos + 1)
+        pos = s.find("\n[", pos + 1, end)
+    starts.append(end)
+
+    bounds: list[int] = []
+    segments: list[list[Section]] = []
+    i = 0
+    while i < len(starts) - 1:
+        # Merging twice as many segments each time, a multiline string with many lines
+        # starting with `[` is parsed only a few times
+        step = 1
+        while True:
+            j = min(i + step, len(starts) - 1)
+            src = s[starts[i] : starts[j]].replace("\r\n", "\n")
+            sections = parse_segment(src, parse_float, numeric_arrays=False)
+            if sections is not None:
+                break
+            if j == len(starts) - 1:
+                return None
+            step *= 2
+        bounds.append(starts[i])
+        segments.append(sections)
+        i = j
+    return bounds, segments
+
+
+def build(sections: list[list[Section]]) -> tuple[dict[str, Any], list[Path | None]] | None:
+    """Put together the document from the sections of its segments.
+
+    Also returns the path to the table of each segment, or `None` if its values are in several
+    tables. Returns `None` if the segments do not make up a valid document.
+    """
+    out = parser.Output(parser.NestedDict(), parser.Flags())
+    header: Key = ()
+    paths: list[Path | None] = []
+    try:
+        for segment in sections:
+            header = replay(out, segment, header)
+            events = [i for i, (event, _, _, _) in enumerate(segment) if event is not None]
+            # The values of the segment are all in one table, unless it has several headers
+            paths.append(locate(out.data.dict, header) if events in ([], [0]) else None)
+    except parser.TOMLDecodeError:
+        return None
+    return out.data.dict, paths
+
+
+def locate(doc: dict[str, Any], key: Key) -> Path:
+    """Return the path to the table that the header `key` has just declared."""
+    path: list[str | int] = []
+    cont: Any = doc
+    for k in key:
+        cont = cont[k]
+        path.append(k)
+        if isinstance(cont, list):
+            # A header refers to the last table of an array of tables
+            path.append(len(cont) - 1)
+            cont = cont[-1]
+    return tuple(path)
+
+
+def skeleton(sections: list[Section]) -> list[tuple[str | None, Key, Any]]:
+    """Return what the checks of `replay` depend on: the keys and the kinds of the values."""
+    result = []
+    for event, key, items, _ in sections:
+        if isinstance(items, dict):
+            shape: Any = [(k, kind(v)) for k, v in items.items()]
+        elif items is not None:
+            shape = [(items[i], kind(items[i + 1])) for i in range(0, len(items), 2)]
+        else:
+            shape = None
+        result.append((event, key, shape))
+    return result
+
+
+def kind(value: Any) -> type | None:
+    """Return the type of a table or an array, or `None` for other values."""
+    return type(value) if isinstance(value, (dict, list)) else None
+
+
+def values(path: Path, sections: list[Section]) -> list[tuple[Path, Any]]:
+    """Return the values of the sections of a segment with the paths to them."""
+    result = []
+    for event, _, items, _ in sections:
+        if event is not None:
+            continue
+        pairs = items.items() if isinstance(items, dict) else zip(items[::2], items[1::2])
+        for rel_key, value in pairs:
+            rel_path = (rel_key,) if isinstance(rel_key, str) else rel_key
+            result.append(((*path, *rel_path), value))
+    return result
+
+
+def patch(cont: Any, changes: list[tuple[Path, Any]]) -> Any:
+    """Return a copy of `cont` with the values at the paths, copying only what changes."""
+    new: Any = list(cont) if isinstance(cont, list) else dict(cont)
+    nested: dict[str | int, list[tuple[Path, Any]]] = {}
+    for path, value in changes:
+        if len(path) == 1:
+            new[path[0]] = value
+        else:
+            nested.setdefault(path[0], []).append((path[1:], value))
+    for k, subchanges in nested.items():
+        new[k] = patch(cont[k], subchanges)
+    return new
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import pickle
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Optional
+
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Literal
+
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import Key, ParseFloat
+
+    # A header `(event, key, None, [])`, or the key/value pairs that follow it:
+    # `(None, header, table, frozen_keys)` or `(None, header, [key, value, ...], [])`
+    Section = tuple[Optional[str], Key, Any, list[str]]
+
+
+__all__: list[str] = ["parse_document"]
+
+
+# Documents smaller than this (in characters) are parsed faster than a pool starts.
+MIN_PARALLEL_SIZE = 1 << 20
+
+# Each worker gets a few segments, so that a slow one does not hold up the rest.
+SEGMENTS_PER_WORKER = 4
+
+
+def parse_document(
+    s: str,
+    *,
+    parse_float: ParseFloat,
+    select: Iterable[str | Key] | None,
+    numeric_arrays: Literal["list", "array"],
+    compact: bool,
+    max_workers: int,
+) -> dict[str, Any]:
+    """Parse TOML from a string in a pool of `max_workers` processes.
+
+    The document is split into segments at the lines starting with `[`. The segments are
+    parsed in the pool, and the parsed statements are then put together in the current process
+    with the same checks as of a sequential parse. A split inside a multiline string or array
+    makes a segment invalid. If any segment is invalid, the document is parsed sequentially, so
+    the result and the errors are always the same as of `parser.loads`.
+
+    Documents smaller than `MIN_PARALLEL_SIZE` are parsed faster by `parser.loads` itself.
+    """
+    if numeric_arrays not in {"list", "array"}:
+        detail = f"numeric_arrays must be 'list' or 'array', not {numeric_arrays!r}"
+        raise ValueError(detail)
+    selection = None if select is None else parser.Selection(select)
+    segments = split(s.replace("\r\n", "\n"), max_workers * SEGMENTS_PER_WORKER)
+    doc = parse_segments(
+        segments,
+        parse_float=parse_float,
+        numeric_arrays=numeric_arrays == "array",
+        max_workers=max_workers,
+    )
+    if doc is None:
+        return parser.loads(
+            s,
+            parse_float=parse_float,
+            select=select,
+            numeric_arrays=numeric_arrays,
+            compact=compact,
+        )
+    if selection is not None:
+        doc = selection.prune(doc)
+    return parser.compact_toml(doc) if compact else doc
+
+
+def parse_segments(
+    segments: list[str],
+    *,
+    parse_float: ParseFloat,
+    numeric_arrays: bool,
+    max_workers: int,
+) -> dict[str, Any] | None:
+    """Parse the segments of a document in a process pool.
+
+    Returns `None` if the segments do not make up a valid document, or cannot be parsed in the
+    pool, e.g. because `parse_float` cannot be pickled or a worker died.
+    """
+    # A `parse_float` that fails to pickle in `map` leaves the pool unable to shut down
+    if len(segments) < 2 or not is_picklable(parse_float):
+        return None
+
+    out = parser.Output(parser.NestedDict(), parser.Flags())
+    header: Key = ()
+    pool = ProcessPoolExecutor(min(max_workers, len(segments)))
+    try:
+        results = pool.map(parse_segment, segments, repeat(parse_float), repeat(numeric_arrays))
+        for sections in results:
+            if sections is None:
+                return None
+            header = replay(out, sections, header)
+    except (
+        parser.TOMLDecodeError,
+        pickle.PicklingError,
+        AttributeError,
+        TypeError,
+        BrokenProcessPool,
+    ):
+        return None
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return out.data.dict
+
+
+def is_picklable(obj: object) -> bool:
+    """Check if `obj` can be sent to the processes of a pool."""
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def split(src: str, n: int) -> list[str]:
+    """Split `src` into up to `n` segments, each but the first starting with `[`."""
+    bounds = [0]
+    for i in range(1, n):
+        bound = src.find("\n[", max(len(src) * i // n, bounds[-1]))
+        if bound < 0:
+            break
+        if bound + 1 > bounds[-1]:
+            bounds.append(bound + 1)
+    bounds.append(len(src))
+    return [src[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def parse_segment(
+    src: str,
+    parse_float: ParseFloat,
+    numeric_arrays: bool,
+) -> list[Section] | None:
+    """Parse the statements of a segment into sections.
+
+    Returns `None` if the segment is invalid on its own.
+    """
+    events: list[tuple[Key, str, Any]] = []
+    out = parser.Output(
+        parser.NestedDict(),
+        parser.Flags(),
+        events=events,
+        numeric_arrays=numeric_arrays,
+    )
+    parse_float = parser.make_safe_parse_float(parse_float)
+    try:
+        for _ in parser.parse_statements(src, out, (), parse_float):
+            pass
+    except Exception:  # noqa: BLE001
+        # A bad split can fail anywhere, the sequential parse reports the actual error
+        return None
+
+    # Equal keys are made the same object, so that they are pickled once
+    keys: dict[Any, Any] = {}
+    sections: list[Section] = []
+    header: Key = ()
+    table: dict[str, Any] = {}
+    items: list[Any] = []
+    for key, event, value in events:
+        if event == "value":
+            rel_key = key[len(header) :]
+            if len(rel_key) == 1:
+                name = keys.setdefault(rel_key[0], rel_key[0])
+                table[name] = value
+                items.extend((name, value))
+            else:
+                items.extend((rel_key, value))
+            continue
+        if items:
+            sections.append(make_section(header, table, items))
+        header = keys.setdefault(key, key)
+        sections.append((event, header, None, []))
+        table, items = {}, []
+    if items:
+        sections.append(make_section(header, table, items))
+    return sections
+
+
+def make_section(header: Key, table: dict[str, Any], items: list[Any]) -> Section:
+    """Make the section of the key/value pairs that follow a header."""
+    if len(table) * 2 < len(items):
+        # Dotted keys need the checks of `store_value` in order
+        return (None, header, items, [])
+    frozen = [k for k, v in table.items() if isinstance(v, (dict, list, array))]
+    return (None, header, table, frozen)
+
+
+def replay(out: parser.Output, sections: list[Section], header: Key) -> Key:
+    """Put the sections of a segment into `out`, returning the header the segment ends in."""
+    flags, data = out.flags, out.data
+    for event, key, items, frozen in sections:
+        if event is not None:
+            flags.finalize_pending()
+            if event == "table":
+                parser.declare_table("", 0, out, key)
+            else:
+                parser.declare_array_item("", 0, out, key)
+            header = key
+        elif isinstance(items, dict):
+            # The same as `store_value` does for the keys that are not dotted
+            nest = data.get_or_create_nest(header)
+            if nest and not nest.keys().isdisjoint(items):
+                detail = "Cannot overwrite a value"
+                raise parser.TOMLDecodeError(detail)
+            nest.update(items)
+            for k in frozen:
+                flags.set((*header, k), parser.Flags.FROZEN, recursive=True)
+        else:
+            for i in range(0, len(items), 2):
+                rel_key = (items[i],) if isinstance(items[i], str) else items[i]
+                parser.store_value("", 0, out, header, rel_key, items[i + 1])
+    return header
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import functools
+
+from time import perf_counter_ns
+from types import FunctionType
+from typing import TYPE_CHECKING, Any, Callable
+
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+
+
+if TYPE_CHECKING:
+    import re
+
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import Pos
+
+
+__all__: list[str] = ["ParseStats", "RuleStats"]
+
+
+# The functions of the parser that are timed, each of them taking `src` and `pos` first.
+RULES = (
+    "key_value_rule",
+    "create_dict_rule",
+    "create_list_rule",
+    "parse_basic_str",
+    "parse_multiline_str",
+    "parse_array",
+    "parse_inline_table",
+)
+
+# The regexes of the parser that are timed.
+PATTERNS = ("RE_DATETIME", "RE_LOCALTIME", "RE_NUMBER")
+
+
+class RuleStats:
+    """The calls of a grammar rule, the time spent in them and the characters they consumed."""
+
+    __slots__ = ("calls", "chars", "time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        # In seconds and in characters, where a recursive call counts only once
+        self.time = 0.0
+        self.chars = 0
+
+    def __repr__(self) -> str:
+        """Return the statistics, with the time rounded to microseconds."""
+        return f"RuleStats(calls={self.calls}, time={self.time:.6f}, chars={self.chars})"
+
+
+class ParseStats:
+    """Statistics of the grammar rules of the documents parsed with `loads(..., profile=...)`.
+
+    Attributes
+    ----------
+    rules : dict[str, RuleStats]
+        The statistics of each rule, by the name of its function or regex in the parser, e.g.
+        `"key_value_rule"` or `"RE_DATETIME"`. They add up over all the documents parsed.
+
+    Notes
+    -----
+    * The documents are parsed by a copy of the parser, in which the rules are timed. The
+      parser itself is left as it is, so parsing without `profile` costs nothing extra.
+    * The time of a rule includes the time of the rules it calls, and the overhead of timing
+      them.
+    * A `ParseStats` object must not be used by several threads at once.
+    """
+
+    def __init__(self) -> None:
+        self.rules: dict[str, RuleStats] = {name: RuleStats() for name in (*RULES, *PATTERNS)}
+        self._loads: Callable[..., dict[str, Any]] | None = None
+
+    def loads(self, s: str, /, **kwargs: Any) -> dict[str, Any]:
+        """Parse TOML from a string like `loads` of the parser, recording the statistics."""
+        if self._loads is None:
+            self._loads = instrument(self)
+        return self._loads(s, **kwargs)
+
+    def __str__(self) -> str:
+        """Format the statistics as a table, the slowest rules first."""
+        lines = [f"{'rule':<20} {'calls':>10} {'time (s)':>10} {'chars':>12}"]
+        for name, rule in sorted(self.rules.items(), key=lambda item: -item[1].time):
+            lines.append(f"{name:<20} {rule.calls:>10} {rule.time:>10.6f} {rule.chars:>12}")
+        return "\n".join(lines)
+
+
+class TimedPattern:
+    """A regex whose matches are timed."""
+
+    def __init__(self, pattern: re.Pattern[str], stats: RuleStats) -> None:
+        self.pattern = pattern
+        self.stats = stats
+
+    def match(self, string: str, pos: int = 0) -> re.Match[str] | None:
+        """Match the regex at `pos` of `string`, recording the time and the characters."""
+        start = perf_counter_ns()
+        match = self.pattern.match(string, pos)
+        self.stats.time += (perf_counter_ns() - start) / 1e9
+        self.stats.calls += 1
+        if match is not None:
+            self.stats.chars += match.end() - pos
+        return match
+
+
+def instrument(stats: ParseStats) -> Callable[..., dict[str, Any]]:
+    """Return `loads` of a copy of the parser that records its statistics in `stats`."""
+    # The copies of the functions look up each other in the namespace, rather than in the
+    # module, so the timed rules replace the actual ones only there
+    namespace = dict(vars(parser))
+    for name, obj in vars(parser).items():
+        if isinstance(obj, FunctionType) and obj.__module__ == parser.__name__:
+            namespace[name] = copy_function(obj, namespace)
+    for name in RULES:
+        namespace[name] = timed(namespace[name], stats.rules[name])
+    for name in PATTERNS:
+        namespace[name] = TimedPattern(namespace[name], stats.rules[name])
+    return namespace["loads"]
+
+
+def copy_function(func: FunctionType, namespace: dict[str, Any]) -> FunctionType:
+    """Copy `func` with `namespace` for its globals."""
+    copy = FunctionType(
+        func.__code__,
+        namespace,
+        func.__name__,
+        func.__defaults__,
+        func.__closure__,
+    )
+    copy.__kwdefaults__ = func.__kwdefaults__
+    functools.update_wrapper(copy, func)
+    return copy
+
+
+def timed(func: Callable[..., Any], stats: RuleStats) -> Callable[..., Any]:
+    """Time the calls of `func`, which returns the position after what it parsed."""
+    depth = 0
+
+    @functools.wraps(func)
+    def timed_func(src: str, pos: Pos, *args: Any, **kwargs: Any) -> Any:
+        nonlocal depth
+        stats.calls += 1
+        if depth:
+            return func(src, pos, *args, **kwargs)
+        depth += 1
+        start = perf_counter_ns()
+        try:
+            result = func(src, pos, *args, **kwargs)
+        finally:
+            stats.time += (perf_counter_ns() - start) / 1e9
+            depth -= 1
+        if result is not None:
+            # Either the position or a tuple starting with it
+            stats.chars += (result if isinstance(result, int) else result[0]) - pos
+        return result
+
+    return timed_func
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os as py_os
+
+from typing import TYPE_CHECKING, Any, overload
+
+from backlib.internal.backports.py311.tomllib.internal import parallel
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+from backlib.internal.backports.py311.tomllib.internal.frozen import FrozenTable, freeze
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Literal
+
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import Key, ParseFloat
+    from backlib.internal.backports.py311.tomllib.internal.profiling import ParseStats
+
+
+__all__: list[str] = ["loads"]
+
+
+@overload
+def loads(
+    s: str,
+    /,
+    *,
+    parse_float: ParseFloat = ...,
+    select: Iterable[str | Key] | None = ...,
+    numeric_arrays: Literal["list", "array"] = ...,
+    compact: bool = ...,
+    frozen: Literal[False] = ...,
+    max_workers: int | None = ...,
+    limits: parser.Limits | None = ...,
+    profile: ParseStats | None = ...,
+) -> dict[str, Any]: ...
+
+
+@overload
+def loads(
+    s: str,
+    /,
+    *,
+    parse_float: ParseFloat = ...,
+    select: Iterable[str | Key] | None = ...,
+    numeric_arrays: Literal["list", "array"] = ...,
+    compact: bool = ...,
+    frozen: Literal[True],
+    max_workers: int | None = ...,
+    limits: parser.Limits | None = ...,
+    profile: ParseStats | None = ...,
+) -> FrozenTable: ...
+
+
+# Each option of the parsers that `loads` dispatches to is a keyword argument of its own, as in
+# the overloads, which pick the return type by `frozen`
+def loads(  # noqa: PLR0913
+    s: str,
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    select: Iterable[str | Key] | None = None,
+    numeric_arrays: Literal["list", "array"] = "list",
+    compact: bool = False,
+    frozen: bool = False,
+    max_workers: int | None = 1,
+    limits: parser.Limits | None = None,
+    profile: ParseStats | None = None,
+) -> dict[str, Any] | FrozenTable:
+    """Parse TOML from a string.
+
+    Parameters
+    ----------
+    select : Iterable[str | Key], optional
+        Keys of the tables to return, e.g. `["tool.ourapp"]`. Values outside these tables are
+        validated, but are not built. The selected tables are the same as of a full parse.
+        A single `str` raises `TypeError`, rather than selecting the tables of its characters.
+    numeric_arrays : {"list", "array"}, default: "list"
+        If `"array"`, the values that are arrays of only decimal integers or only floats are
+        returned as `array.array` of type `"q"` or `"d"` respectively.
+    compact : bool, default: False
+        If `True`, the document takes less memory: its keys are interned, so equal keys share
+        one string object across all documents, and its arrays are exact-size tuples.
+    frozen : bool, default: False
+        If `True`, the document is a `FrozenTable`: its tables are `FrozenTable` and its arrays
+        are tuples, so it is immutable and hashable.
+    max_workers : int, optional
+        The number of processes to parse the document with. If `None`, the number of CPUs.
+    limits : Limits, optional
+        Limits on the size, depth, values and keys of the document, for untrusted input. If the
+        document exceeds one of them, `TOMLLimitError` is raised as soon as the limit is hit.
+        Without `limits`, values nested deeper than the recursion limit allows raise
+        `RecursionError`, as they do with `tomllib`.
+    profile : ParseStats, optional
+        Records the calls, time and characters consumed of each grammar rule into this object.
+
+    Notes
+    -----
+    * With more than one worker, large documents are parsed in segments by a process pool,
+      with the same result and errors as with one worker, see `parallel.parse_document`.
+    * Arrays nested in other arrays or in inline tables, arrays with comments, and arrays of
+      integers that do not fit into 64 bits are always lists. Arrays of floats are always lists
+      if `parse_float` is not `float`.
+    * With a process pool, `parse_float` is pickled. If it cannot be, or if a worker dies, the
+      document is parsed sequentially.
+    * With `limits`, the document is always parsed sequentially, and the values outside the
+      `select`ed tables are built as well, so that they are counted.
+    * With `profile`, the document is always parsed sequentially, by a copy of the parser
+      whose rules are timed, see `ParseStats`.
+
+    See Also
+    --------
+    * `tomllib.loads`.
+    """
+    workers = max_workers or py_os.cpu_count() or 1
+    if profile is not None:
+        doc = profile.loads(
+            s,
+            parse_float=parse_float,
+            select=select,
+            numeric_arrays=numeric_arrays,
+            compact=compact,
+            limits=limits,
+        )
+    elif limits is None and workers > 1 and len(s) >= parallel.MIN_PARALLEL_SIZE:
+        doc = parallel.parse_document(
+            s,
+            parse_float=parse_float,
+            select=select,
+            numeric_arrays=numeric_arrays,
+            compact=compact,
+            max_workers=workers,
+        )
+    else:
+        # Called directly rather than through `parse_document`, the parser keeps the stack
+        # shallow enough to parse arrays and inline tables nested as deep as `tomllib` does
+        doc = parser.loads(
+            s,
+            parse_float=parse_float,
+            select=select,
+            numeric_arrays=numeric_arrays,
+            compact=compact,
+            limits=limits,
+        )
+    return freeze(doc) if frozen else doc
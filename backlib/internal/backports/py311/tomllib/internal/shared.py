@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import multiprocessing
+import os as py_os
+import struct
+import sys
+
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any, Callable
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from multiprocessing.shared_memory import SharedMemory
+
+
+__all__: list[str] = ["SharedTable", "attach", "publish"]
+
+
+# Snapshots start with this signature followed by `HEADER`.
+MAGIC = b"backlib.tomllib.shared\0"
+
+# Nodes start with a tag byte. Offsets and sizes are little-endian `u32`.
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+
+MAX_OFFSET = 0xFFFFFFFF
+
+# The offset of the root table, and the process ID of the publisher.
+HEADER = struct.Struct("<II")
+
+TAG_TABLE = 0x54  # "T": size, size * (key, value), size * index of the entries sorted by key
+TAG_ARRAY = 0x41  # "A": size, size * value
+TAG_STR = 0x53  # "S": size, UTF-8
+TAG_INT = 0x49  # "I": i64
+TAG_BIGINT = 0x4E  # "N": size, decimal ASCII
+TAG_FLOAT = 0x46  # "F": f64
+TAG_TRUE = 0x31  # "1"
+TAG_FALSE = 0x30  # "0"
+TAG_DATETIME = 0x44  # "D": size, ISO 8601
+TAG_DATE = 0x64  # "d": size, ISO 8601
+TAG_TIME = 0x74  # "t": size, ISO 8601
+
+TEXT_DECODERS: dict[int, Callable[[str], Any]] = {
+    TAG_STR: str,
+    TAG_BIGINT: int,
+    TAG_DATETIME: datetime.fromisoformat,
+    TAG_DATE: date.fromisoformat,
+    TAG_TIME: time.fromisoformat,
+}
+
+
+class SharedTable(Mapping[str, Any]):
+    """A read-only view of a TOML table in shared memory.
+
+    Notes
+    -----
+    * Values are decoded on every access, nothing is copied into the process beforehand.
+    * Nested tables are `SharedTable` and arrays are read-only sequences.
+    * The view is pickled by the name of the shared memory block, so it can be sent to spawned
+      processes.
+    """
+
+    __slots__ = ("_block", "_buf", "_name", "_offset")
+
+    def __init__(self, block: Block, offset: int, name: str | None = None) -> None:
+        self._block = block
+        self._buf = block.buf
+        self._offset = offset
+        self._name = name
+
+    def __getitem__(self, key: str) -> Any:
+        """Look up `key` by a binary search over the sorted keys."""
+        if not isinstance(key, str):
+            raise KeyError(key)
+        buf, offset = self._buf, self._offset
+        size = read_u32(buf, offset + 1)
+        entries, order = offset + 5, offset + 5 + size * 8
+        target = key.encode()
+        # Binary search over the entries sorted by the UTF-8 of their keys
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = entries + read_u32(buf, order + mid * 4) * 8
+            probe = read_text(buf, read_u32(buf, entry))
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return decode(self._block, read_u32(buf, entry + 4))
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys in the order of the document."""
+        buf, offset = self._buf, self._offset
+        for i in range(read_u32(buf, offset + 1)):
+            yield str(read_text(buf, read_u32(buf, offset + 5 + i * 8)), "utf-8")
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return read_u32(self._buf, self._offset + 1)
+
+    def __repr__(self) -> str:
+        """Return a representation of the table, decoding all its values."""
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the root table by the name of its block, to attach to it again."""
+        if self._name is None:
+            detail = "Only the root table can be pickled"
+            raise TypeError(detail)
+        return (attach, (self._name,))
+
+
+class SharedArray(Sequence[Any]):
+    """A read-only view of a TOML array in shared memory."""
+
+    __slots__ = ("_block", "_buf", "_offset")
+
+    def __init__(self, block: Block, offset: int) -> None:
+        self._block = block
+        self._buf = block.buf
+        self._offset = offset
+
+    def __getitem__(self, index: int | slice) -> Any:
+        """Return the value at `index`, or a list of the values of a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            detail = "array index out of range"
+            raise IndexError(detail)
+        return decode(self._block, read_u32(self._buf, self._offset + 5 + index * 4))
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return read_u32(self._buf, self._offset + 1)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the values with those of another array, a list or a tuple."""
+        if isinstance(other, (SharedArray, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return a representation of the array, decoding all its values."""
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+def publish(doc: Mapping[str, Any], /, *, name: str | None = None) -> SharedMemory:
+    """Encode a parsed TOML document into a new block of shared memory.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the block. If `None`, a unique name is chosen.
+
+    Returns
+    -------
+    SharedMemory
+        The block. Its `name` is passed to `attach` by other processes. The caller owns the
+        block and must `close()` and `unlink()` it once the workers are done with it.
+
+    Notes
+    -----
+    * The encoding is position-independent: it only holds offsets relative to the start of
+      the block, so each process can map it at any address.
+    * Equal strings, including keys, are stored once.
+    * Values of types other than those of TOML (e.g. from `parse_float`) raise `TypeError`.
+    * Where the platform has no shared memory, `NotImplementedError` is raised.
+    """
+    payload = Encoder().encode(doc)
+    shm = import_shared_memory()(name, create=True, size=len(payload))
+    shm.buf[: len(payload)] = payload
+    return shm
+
+
+def attach(name: str, /) -> SharedTable:
+    """Attach to a document published by `publish`, returning a view of its root table.
+
+    Notes
+    -----
+    * The block is viewed read-only and stays mapped while any view of it is alive.
+    * The block is not unlinked when the process exits, even if it is not a child of the
+      process that published it. Before Python 3.13, processes forked other than by
+      `multiprocessing` from a child of the publisher share its resource tracker without being
+      recognized, and unlinking the block then makes the tracker report a `KeyError`.
+    * Where the platform has no shared memory, `NotImplementedError` is raised.
+    """
+    block = Block(attach_shared_memory(name))
+    if bytes(block.buf[: len(MAGIC)]) != MAGIC:
+        block.close()
+        detail = f"The shared memory block {name!r} is not a TOML snapshot"
+        raise ValueError(detail)
+    root, publisher = HEADER.unpack_from(block.buf, len(MAGIC))
+    if sys.version_info < (3, 13) and not shares_resource_tracker(publisher):
+        untrack(block.shm)
+    return SharedTable(block, root, name)
+
+
+class Block:
+    """A block of shared memory attached by `attach`, shared by all the views of its document.
+
+    It is closed once no view refers to it, rather than with the `SharedMemory`, which cannot
+    be unmapped while the views export its buffer.
+    """
+
+    __slots__ = ("buf", "shm")
+
+    def __init__(self, shm: SharedMemory) -> None:
+        self.shm = shm
+        self.buf = shm.buf.toreadonly()
+
+    def close(self) -> None:
+        """Release the views of the block, and close it."""
+        self.buf.release()
+        self.shm.close()
+
+    def __del__(self) -> None:
+        """Close the block once the last view of it is gone."""
+        self.close()
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """Attach to an existing block of shared memory, see `untrack` before Python 3.13."""
+    shared_memory = import_shared_memory()
+    if sys.version_info >= (3, 13):
+        return shared_memory(name, track=False)
+    return shared_memory(name)
+
+
+def import_shared_memory() -> type[SharedMemory]:
+    """Import `SharedMemory`, raising `NotImplementedError` where the platform has none."""
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError as e:
+        detail = f"Shared memory is not available on {sys.platform}"
+        raise NotImplementedError(detail) from e
+    return SharedMemory
+
+
+def shares_resource_tracker(pid: int) -> bool:
+    """Check if this process is `pid` or a `multiprocessing` child of it.
+
+    They share the resource tracker of `pid`, which has registered the block already.
+    """
+    parent = multiprocessing.parent_process()
+    return pid == py_os.getpid() or (parent is not None and parent.pid == pid)
+
+
+def untrack(shm: SharedMemory) -> None:
+    """Stop the resource tracker of this process from unlinking a block it attached to.
+
+    Before Python 3.13, attaching registers the block with the resource tracker, which unlinks
+    it once this process exits. The tracker of the publisher must keep the block registered,
+    as unlinking it unregisters it. Blocks are only registered on POSIX, under their name with
+    a leading slash.
+    """
+    if py_os.name != "posix":
+        return
+    from multiprocessing import resource_tracker
+
+    resource_tracker.unregister("/" + shm.name, "shared_memory")
+
+
+class Encoder:
+    """Encode a document, writing the children of each node before the node itself."""
+
+    def __init__(self) -> None:
+        self.out = bytearray(MAGIC)
+        self.out += HEADER.pack(0, py_os.getpid())
+        self.texts: dict[tuple[int, str], int] = {}
+
+    def encode(self, doc: Mapping[str, Any]) -> bytes:
+        root = self.value(doc)
+        U32.pack_into(self.out, len(MAGIC), root)
+        return bytes(self.out)
+
+    def value(self, obj: Any) -> int:  # noqa: C901, PLR0911
+        if isinstance(obj, str):
+            return self.text(TAG_STR, obj)
+        if isinstance(obj, Mapping):
+            return self.table(obj)
+        if isinstance(obj, (list, tuple, array, SharedArray)):
+            offsets = [self.value(v) for v in obj]
+            return self.node(TAG_ARRAY, U32.pack(len(offsets)), *map(U32.pack, offsets))
+        if isinstance(obj, bool):
+            return self.node(TAG_TRUE if obj else TAG_FALSE)
+        if isinstance(obj, int):
+            if -(1 << 63) <= obj < (1 << 63):
+                return self.node(TAG_INT, I64.pack(obj))
+            return self.text(TAG_BIGINT, str(obj))
+        if isinstance(obj, float):
+            return self.node(TAG_FLOAT, F64.pack(obj))
+        if isinstance(obj, datetime):
+            return self.text(TAG_DATETIME, obj.isoformat())
+        if isinstance(obj, date):
+            return self.text(TAG_DATE, obj.isoformat())
+        if isinstance(obj, time):
+            return self.text(TAG_TIME, obj.isoformat())
+        detail = f"Cannot share a value of type {type(obj).__name__!r}"
+        raise TypeError(detail)
+
+    def table(self, obj: Mapping[str, Any]) -> int:
+        keys = [(self.text(TAG_STR, k), k.encode()) for k in obj]
+        values = [self.value(v) for v in obj.values()]
+        order = sorted(range(len(keys)), key=lambda i: keys[i][1])
+        entries = [U32.pack(k) + U32.pack(v) for (k, _), v in zip(keys, values)]
+        return self.node(TAG_TABLE, U32.pack(len(keys)), *entries, *map(U32.pack, order))
+
+    def text(self, tag: int, s: str) -> int:
+        offset = self.texts.get((tag, s))
+        if offset is None:
+            b = s.encode()
+            offset = self.texts[tag, s] = self.node(tag, U32.pack(len(b)), b)
+        return offset
+
+    def node(self, tag: int, *parts: bytes) -> int:
+        offset = len(self.out)
+        if offset > MAX_OFFSET:
+            detail = "The document is too large to be shared"
+            raise ValueError(detail)
+        self.out.append(tag)
+        for part in parts:
+            self.out += part
+        return offset
+
+
+def decode(block: Block, offset: int) -> Any:
+    """Decode the node at `offset`, returning a view if it is a table or an array."""
+    buf = block.buf
+    tag = buf[offset]
+    if tag == TAG_TABLE:
+        return SharedTable(block, offset)
+    if tag == TAG_ARRAY:
+        return SharedArray(block, offset)
+    if tag == TAG_INT:
+        return I64.unpack_from(buf, offset + 1)[0]
+    if tag == TAG_FLOAT:
+        return F64.unpack_from(buf, offset + 1)[0]
+    if tag in {TAG_TRUE, TAG_FALSE}:
+        return tag == TAG_TRUE
+    return TEXT_DECODERS[tag](str(read_text(buf, offset), "utf-8"))
+
+
+def read_u32(buf: memoryview, offset: int) -> int:
+    """Read the `u32` at `offset`."""
+    return U32.unpack_from(buf, offset)[0]
+
+
+def read_text(buf: memoryview, offset: int) -> bytes:
+    """Read the UTF-8 of the text node at `offset`."""
+    size = read_u32(buf, offset + 1)
+    return bytes(buf[offset + 5 : offset + 5 + size])
@@ -1,17 +1,95 @@
+import sys
+
 import backlib.internal.backports.py311.tomllib.internal.cpython as backport
 
+from backlib.internal.backports.py311.tomllib.internal import (
+    aio,
+    bulk,
+    cache,
+    diskcache,
+    frozen,
+    incremental,
+    profiling,
+    reader,
+    shared,
+    watcher,
+    writer,
+)
+
 
-__all__: list[str] = ["TOMLDecodeError", "load", "loads"]
+__all__: list[str] = [
+    "FrozenTable",
+    "IncrementalParser",
+    "Limits",
+    "ParseStats",
+    "SharedTable",
+    "TOMLDecodeError",
+    "TOMLLimitError",
+    "aload",
+    "aloads",
+    "attach",
+    "dump",
+    "dumps",
+    "iterparse",
+    "load",
+    "load_many",
+    "load_path",
+    "loads",
+    "loads_bytes",
+    "publish",
+    "validate",
+    "watch",
+]
 
 __backlib__: str = "backlib.py311.tomllib"
 
 
+FrozenTable = frozen.FrozenTable
+IncrementalParser = incremental.IncrementalParser
+Limits = backport.Limits
+ParseStats = profiling.ParseStats
+SharedTable = shared.SharedTable
 TOMLDecodeError = backport.TOMLDecodeError
+TOMLLimitError = backport.TOMLLimitError
 
-load = backport.load
-loads = backport.loads
+aload = aio.aload
+aloads = aio.aloads
+attach = shared.attach
+iterparse = backport.iterparse
+loads_bytes = backport.loads_bytes
+validate = backport.validate
 
+dump = writer.dump
+dumps = writer.dumps
+load = diskcache.load
+load_many = bulk.load_many
+load_path = cache.load_path
+loads = reader.loads
+publish = shared.publish
+watch = watcher.watch
 
-TOMLDecodeError.__module__ = __backlib__
+
+FrozenTable.__module__ = __backlib__
+IncrementalParser.__module__ = __backlib__
+Limits.__module__ = __backlib__
+ParseStats.__module__ = __backlib__
+SharedTable.__module__ = __backlib__
+TOMLLimitError.__module__ = __backlib__
+aload.__module__ = __backlib__
+aloads.__module__ = __backlib__
+attach.__module__ = __backlib__
+dump.__module__ = __backlib__
+dumps.__module__ = __backlib__
+iterparse.__module__ = __backlib__
 load.__module__ = __backlib__
+load_many.__module__ = __backlib__
+load_path.__module__ = __backlib__
 loads.__module__ = __backlib__
+loads_bytes.__module__ = __backlib__
+publish.__module__ = __backlib__
+validate.__module__ = __backlib__
+watch.__module__ = __backlib__
+
+if sys.version_info < (3, 11):
+    # Otherwise, it is the class of the standard library
+    TOMLDecodeError.__module__ = __backlib__
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os as py_os
+import select
+import struct
+import sys
+
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from backlib.internal.backports.py311 import os
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import loads_bytes
+
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from backlib.internal.backports.py311.os import PathLike, stat_result
+    from backlib.internal.backports.py311.tomllib.internal.cpython.types import ParseFloat
+
+    Callback = Callable[[Any], object]
+    StatKey = Optional[tuple[int, ...]]
+
+
+__all__: list[str] = ["Watcher", "watch"]
+
+
+# The events of `inotify(7)` that may change what a path in the directory refers to.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# `struct inotify_event` without the name that follows it.
+INOTIFY_EVENT = struct.Struct("iIII")
+
+INOTIFY_BUFFER_SIZE = 64 * 1024
+
+# The most symbolic links followed from the path, as `MAXSYMLINKS` of Linux.
+MAX_SYMLINKS = 40
+
+
+class Watcher:
+    """A thread that parses a TOML file again whenever the file changes.
+
+    Use `watch` to start one.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        callback: Callback,
+        *,
+        parse_float: ParseFloat,
+        debounce: float,
+        interval: float,
+        polling: bool,
+    ) -> None:
+        self._path = os.fspath(path)
+        self._callback = callback
+        self._parse_float = parse_float
+        self._debounce = debounce
+        self._interval = interval
+        # Not parsed yet, `None` once the file cannot be read
+        self._key: StatKey = ()
+        # The names in the directory whose events may change the file, see `watched_names`
+        self._names = watched_names(self._path)
+        self._stopped = Event()
+        self._inotify = None if polling else Inotify.open(self._path)
+        self._thread = Thread(target=self._run, name=f"tomllib.watch({self._path!r})", daemon=True)
+
+    @property
+    def polling(self) -> bool:
+        """Whether the file is polled rather than watched with `inotify`."""
+        return self._inotify is None
+
+    def start(self) -> None:
+        """Parse the file and start watching it."""
+        try:
+            self._reload()
+        except BaseException:
+            # The thread that would close the `inotify` instance never runs
+            if self._inotify is not None:
+                self._inotify.close()
+            raise
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the file and wait for the thread to finish."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            if self._inotify is not None:
+                self._inotify.wake()
+            self._thread.join()
+        # Closed here rather than by the thread, which may exit while it is being woken
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def __enter__(self) -> Self:
+        """Return the watcher, which is stopped on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the watcher."""
+        self.stop()
+
+    def _run(self) -> None:
+        if self._inotify is not None:
+            self._run_inotify(self._inotify)
+        self._run_polling()
+
+    def _run_inotify(self, inotify: Inotify) -> None:
+        """Reload the file once its directory has been quiet for `debounce` seconds."""
+        deadline: float | None = None
+        latest: float | None = None
+        while not self._stopped.is_set():
+            timeout: float | None = None if deadline is None else max(deadline - monotonic(), 0)
+            events = inotify.read(timeout)
+            if events is None:
+                # The directory is gone, so there is nothing to watch
+                return
+            now = monotonic()
+            if any(mask & IN_Q_OVERFLOW or name in self._names for mask, name in events):
+                if latest is None:
+                    latest = now + max(self._interval, self._debounce)
+                deadline = min(now + self._debounce, latest)
+            elif deadline is not None and now >= deadline:
+                deadline = latest = None
+                self._reload()
+
+    def _run_polling(self) -> None:
+        """Poll the file, more often right after it changes and less often while it does not."""
+        delay = self._debounce
+        while not self._stopped.wait(delay):
+            if self._stat() == self._key:
+                delay = min(delay * 2, self._interval)
+                continue
+            # Wait until the file stops changing
+            key = self._stat()
+            while not self._stopped.wait(self._debounce) and (new_key := self._stat()) != key:
+                key = new_key
+            self._reload()
+            delay = self._debounce
+
+    def _stat(self) -> StatKey:
+        try:
+            return stat_key(os.stat(self._path))
+        except (OSError, ValueError):
+            return None
+
+    def _reload(self) -> None:
+        """Parse the file and pass the result to the callback, unless the file is unchanged."""
+        self._names = watched_names(self._path)
+        result: Any
+        try:
+            with open(self._path, "rb") as fp:  # noqa: PTH123
+                key = stat_key(os.fstat(fp.fileno()))
+                if key == self._key:
+                    return
+                b = fp.read()
+        except (OSError, ValueError) as e:
+            if self._key is None:
+                # The error has been reported already
+                return
+            key, result = None, e
+        else:
+            try:
+                result = loads_bytes(b, parse_float=self._parse_float)
+            except (ValueError, RecursionError, MemoryError) as e:
+                # Raised from the thread of the watcher, they would stop it
+                result = e
+        self._key = key
+        self._callback(result)
+
+
+class Inotify:
+    """An `inotify(7)` instance watching the directory of a file."""
+
+    def __init__(self, fd: int, wake_fds: tuple[int, int]) -> None:
+        self._fd = fd
+        self._wake_r, self._wake_w = wake_fds
+        self._closed = False
+
+    @classmethod
+    def open(cls, path: str) -> Inotify | None:
+        """Watch the directory of `path`, returning `None` if `inotify` is not available."""
+        libc = load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        directory = Path(path).absolute().parent
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return cls(fd, py_os.pipe())
+
+    def read(self, timeout: float | None) -> list[tuple[int, bytes]] | None:
+        """Wait for events, returning `(mask, name)` of each, or `None` if the watch is gone."""
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready or self._fd not in ready:
+            return []
+        try:
+            buf = os.read(self._fd, INOTIFY_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos < len(buf):
+            _, mask, _, size = INOTIFY_EVENT.unpack_from(buf, pos)
+            pos += INOTIFY_EVENT.size
+            name = buf[pos : pos + size].rstrip(b"\0")
+            pos += size
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                return None
+            events.append((mask, name))
+        return events
+
+    def wake(self) -> None:
+        """Make a pending `read` return."""
+        os.write(self._wake_w, b"\0")
+
+    def close(self) -> None:
+        """Close the `inotify` instance and the pipe that wakes it, unless they are closed."""
+        if self._closed:
+            return
+        self._closed = True
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+def watch(
+    path: str | PathLike[str],
+    callback: Callback,
+    /,
+    *,
+    parse_float: ParseFloat = float,
+    debounce: float = 0.1,
+    interval: float = 1.0,
+    polling: bool = False,
+) -> Watcher:
+    """Parse a TOML file, and parse it again whenever it changes.
+
+    Parameters
+    ----------
+    callback : Callable[[dict[str, Any] | Exception], object]
+        Called with the parsed document. If the file cannot be read or parsed, it is called
+        with the exception instead: an `OSError` (e.g. `FileNotFoundError`), a `ValueError`
+        (e.g. `TOMLDecodeError`), a `RecursionError` for values nested too deep, or a
+        `MemoryError`.
+    debounce : float, default: 0.1
+        The number of seconds the file must not change for before it is parsed, so that a burst
+        of writes is parsed once.
+    interval : float, default: 1.0
+        The longest number of seconds between two checks of the file when it is polled.
+    polling : bool, default: False
+        If `True`, the file is polled even if `inotify` is available.
+
+    Returns
+    -------
+    Watcher
+        The running watcher. Call its `stop()` method, or use it as a context manager, to stop
+        watching the file.
+
+    Notes
+    -----
+    * The file is parsed once before `watch` returns, and the callback is called with the
+      result in the current thread. Later calls happen in the thread of the watcher.
+    * The file is only parsed again if its `(st_dev, st_ino, st_size, st_mtime_ns)` changes, so
+      that touching the directory, or saving the same content atomically, is cheap.
+    * On Linux, the directory of the file is watched with `inotify`, so nothing is polled.
+      Only the events of the file, and of the symbolic links to it in the directory, are
+      handled. Replacing the file atomically with a rename, or swapping a symbolic link in the
+      directory, is noticed as well, but changes to the target of a symbolic link in another
+      directory are not: poll such a file. If the file never stops changing, it is still
+      parsed every `interval` seconds.
+    * An exception raised by the callback stops the watcher, `stop()` then closes its files.
+    * Elsewhere, or if the directory is removed, the file is polled: every `debounce` seconds
+      right after a change, then twice as rarely each time up to `interval` seconds.
+    """
+    watcher = Watcher(
+        path,
+        callback,
+        parse_float=parse_float,
+        debounce=debounce,
+        interval=interval,
+        polling=polling,
+    )
+    watcher.start()
+    return watcher
+
+
+def watched_names(path: str) -> frozenset[bytes]:
+    """Return the names of the directory of `path` whose events may change what it refers to.
+
+    These are the name of `path` itself, and the names of the symbolic links it resolves
+    through while they stay in the directory.
+    """
+    link = Path(path).absolute()
+    directory = link.parent
+    names = set()
+    for _ in range(MAX_SYMLINKS):
+        if link.parent != directory:
+            break
+        names.add(os.fsencode(link.name))
+        try:
+            target = link.readlink()
+        except (OSError, ValueError):
+            # Not a symbolic link, or nothing there yet
+            break
+        link = Path(py_os.path.normpath(link.parent / target))
+    return frozenset(names)
+
+
+def stat_key(st: stat_result) -> tuple[int, int, int, int]:
+    """Return the key of a file that changes whenever its content changes."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def load_libc() -> Any:
+    """Load the C library if it has `inotify`, or return `None`."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
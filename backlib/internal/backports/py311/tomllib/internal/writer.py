@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import re
+
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import (
+    BASIC_STR_ESCAPE_REPLACEMENTS,
+)
+
+
+if TYPE_CHECKING:
+    from backlib.internal.typing import SupportsWrite
+
+
+__all__: list[str] = ["dump", "dumps"]
+
+
+# The number of strings that are buffered before they are joined and written as one chunk.
+BUFFER_SIZE = 1 << 12
+
+# The number of formatted keys that are cached, since most documents repeat the same keys.
+KEY_CACHE_SIZE = 1 << 12
+
+# The escapes of the ASCII characters in basic strings, indexed by code point: the short escapes
+# the parser accepts, `\uXXXX` for the other control characters, and the rest as they are. As a
+# sequence of single characters where nothing is escaped, it keeps `str.translate` on its fast
+# path for ASCII strings.
+SHORT_ESCAPES = {char: escape for escape, char in BASIC_STR_ESCAPE_REPLACEMENTS.items()}
+BASIC_STR_ESCAPES: tuple[str, ...] = tuple(
+    SHORT_ESCAPES.get(chr(code), f"\\u{code:04X}" if code < 0x20 or code == 0x7F else chr(code))
+    for code in range(0x80)
+)
+
+# The characters that `BASIC_STR_ESCAPES` escapes.
+RE_ESCAPED_CHAR = re.compile(r'[\x00-\x1f\x7f"\\]')
+
+RE_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def dump(obj: Mapping[str, Any], fp: SupportsWrite[bytes], /) -> None:
+    """Write a table to a binary file object as a TOML document.
+
+    Notes
+    -----
+    * The document is written in UTF-8 encoded chunks, so it is never held as a whole.
+    * The values are written as with `dumps`.
+    """
+
+    def write(chunk: str) -> None:
+        try:
+            fp.write(chunk.encode())
+        except TypeError:
+            detail = "File must be opened in binary mode, e.g. use `open('foo.toml', 'wb')`"
+            raise TypeError(detail) from None
+
+    Writer(write).write_document(obj)
+
+
+def dumps(obj: Mapping[str, Any], /) -> str:
+    """Serialize a table to a TOML document.
+
+    Raises
+    ------
+    TypeError
+        If a key is not a string, or a value is not a `Mapping`, a `Sequence` (e.g. `list`,
+        `tuple` or `array.array`) other than `bytes`, or a `str`, `int`, `float`, `bool`,
+        `datetime.datetime`, `datetime.date` or `datetime.time`.
+    ValueError
+        If TOML cannot represent a value, e.g. a time with a timezone.
+
+    Notes
+    -----
+    * Arrays whose items are all tables are written as arrays of tables, e.g. `[[package]]`,
+      and the other tables as `[table]` sections. Tables within other arrays are inline.
+    * Strings are written as basic strings, escaped with a translation table.
+    * The document parses back with `loads` to an equal one, with `dict` for the tables and
+      `list` for the arrays.
+    """
+    chunks: list[str] = []
+    Writer(chunks.append).write_document(obj)
+    return "".join(chunks)
+
+
+class Writer:
+    """Formats a document as TOML, passing the text to `sink` in chunks."""
+
+    __slots__ = ("parts", "separator", "sink")
+
+    def __init__(self, sink: Callable[[str], object]) -> None:
+        self.sink = sink
+        self.parts: list[str] = []
+        # Goes before every header, once anything has been written
+        self.separator = ""
+
+    def write_document(self, obj: Mapping[str, Any]) -> None:
+        """Write the root table and flush the rest of the buffer."""
+        if not is_table(obj):
+            detail = f"The document must be a mapping, not {type(obj).__name__}"
+            raise TypeError(detail)
+        self.write_table(obj, None, None)
+        self.flush()
+
+    def write_table(
+        self,
+        table: Mapping[str, Any],
+        name: str | None,
+        header: str | None,
+        *,
+        array: bool = False,
+    ) -> None:
+        """Write a table under `header`, its key/value pairs first, then its subtables.
+
+        The header of a table that only holds subtables is left out, unless it is an item of
+        an array of tables.
+        """
+        lines: list[str] = []
+        subtables: list[tuple[str, Any]] = []
+        for key, value in table.items():
+            formatter = SCALAR_FORMATTERS.get(type(value))
+            if formatter is not None:
+                lines.append(f"{format_key(key)} = {formatter(value)}\n")
+            elif is_table(value) or is_table_array(value):
+                subtables.append((format_key(key), value))
+            else:
+                lines.append(f"{format_key(key)} = {format_value(value)}\n")
+
+        parts = self.parts
+        if header is not None and (array or lines or not subtables):
+            parts.append(self.separator + header)
+            self.separator = "\n"
+        if lines:
+            parts.extend(lines)
+            self.separator = "\n"
+        if len(parts) >= BUFFER_SIZE:
+            self.flush()
+
+        for key, value in subtables:
+            subname = key if name is None else f"{name}.{key}"
+            if is_table(value):
+                self.write_table(value, subname, f"[{subname}]\n")
+                continue
+            # The header is shared by all the items, however many there are
+            subheader = f"[[{subname}]]\n"
+            for item in value:
+                self.write_table(item, subname, subheader, array=True)
+
+    def flush(self) -> None:
+        """Join the buffered strings and pass them to `sink`."""
+        if self.parts:
+            self.sink("".join(self.parts))
+            self.parts.clear()
+
+
+def is_table(value: Any) -> bool:
+    """Check if `value` is written as a table."""
+    cls = type(value)
+    if cls is dict:
+        return True
+    # Checking an instance of an ABC is slow, so the other types are ruled out first
+    return cls not in FORMATTERS and isinstance(value, Mapping)
+
+
+def is_table_array(value: Any) -> bool:
+    """Check if `value` is written as an array of tables."""
+    return is_array(value) and bool(value) and all(map(is_table, value))
+
+
+def is_array(value: Any) -> bool:
+    """Check if `value` is written as an array."""
+    cls = type(value)
+    if cls is list or cls is tuple:
+        return True
+    # Bytes are sequences of integers, but not TOML arrays
+    return not issubclass(cls, (str, bytes, bytearray)) and isinstance(value, Sequence)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def format_key(key: str) -> str:
+    """Format a key, quoting it unless it is a bare key."""
+    if not isinstance(key, str):
+        detail = f"Keys must be str, not {type(key).__name__}"
+        raise TypeError(detail)
+    return key if RE_BARE_KEY.fullmatch(key) else format_str(key)
+
+
+def format_value(value: Any) -> str:
+    """Format a value as it is written after `=` or within an array."""
+    formatter = FORMATTERS.get(type(value))
+    if formatter is None:
+        formatter = find_formatter(value)
+    return formatter(value)
+
+
+def find_formatter(value: Any) -> Callable[[Any], str]:
+    """Find the formatter of an instance of a subclass of the supported types."""
+    for cls, formatter in FORMATTERS.items():
+        if isinstance(value, cls):
+            return formatter
+    if isinstance(value, Mapping):
+        return format_inline_table
+    if is_array(value):
+        return format_array
+    detail = f"Object of type {type(value).__name__} is not TOML serializable"
+    raise TypeError(detail)
+
+
+def format_str(value: str) -> str:
+    """Format a basic string."""
+    if value.isprintable() and '"' not in value and "\\" not in value:
+        return '"' + value + '"'
+    if value.isascii():
+        return '"' + value.translate(BASIC_STR_ESCAPES) + '"'
+    # Looking up each non-ASCII character in the table would be slower
+    return '"' + RE_ESCAPED_CHAR.sub(escape_char, value) + '"'
+
+
+def escape_char(match: re.Match[str]) -> str:
+    """Escape a character matched by `RE_ESCAPED_CHAR`."""
+    return BASIC_STR_ESCAPES[ord(match.group())]
+
+
+def format_bool(value: bool) -> str:
+    """Format a boolean."""
+    return "true" if value else "false"
+
+
+def format_int(value: int) -> str:
+    """Format an integer, including the ones of `int` subclasses with another `repr`."""
+    return int.__repr__(value)
+
+
+def format_float(value: float) -> str:
+    """Format a float, whose `repr` of `inf`, `-inf` and `nan` is the same as in TOML."""
+    return float.__repr__(value)
+
+
+def format_datetime(value: datetime) -> str:
+    """Format an offset or a local date-time."""
+    offset = value.utcoffset()
+    if offset is not None and offset % timedelta(minutes=1):
+        detail = f"TOML offsets are whole minutes, got {offset!r}"
+        raise ValueError(detail)
+    return value.isoformat()
+
+
+def format_date(value: date) -> str:
+    """Format a local date."""
+    return value.isoformat()
+
+
+def format_time(value: time) -> str:
+    """Format a local time."""
+    if value.utcoffset() is not None:
+        detail = f"TOML times have no timezone, got {value!r}"
+        raise ValueError(detail)
+    return value.isoformat()
+
+
+def format_array(value: Sequence[Any]) -> str:
+    """Format an inline array."""
+    return "[" + ", ".join(map(format_value, value)) + "]"
+
+
+def format_inline_table(value: Mapping[str, Any]) -> str:
+    """Format an inline table."""
+    if not value:
+        return "{}"
+    pairs = [f"{format_key(key)} = {format_value(item)}" for key, item in value.items()]
+    return "{ " + ", ".join(pairs) + " }"
+
+
+# The formatters of the values that are always written after `=`. The subclasses are looked up
+# in this order, so `bool` comes before `int` and `datetime` before `date`.
+SCALAR_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    str: format_str,
+    bool: format_bool,
+    int: format_int,
+    float: format_float,
+    datetime: format_datetime,
+    date: format_date,
+    time: format_time,
+}
+
+FORMATTERS: dict[type, Callable[[Any], str]] = {
+    **SCALAR_FORMATTERS,
+    list: format_array,
+    tuple: format_array,
+    array: format_array,
+    dict: format_inline_table,
+}
@@ -2,6 +2,7 @@ from typing import Protocol, TypeVar, runtime_checkable
 
 
 T_co = TypeVar("T_co", covariant=True)
+T_contra = TypeVar("T_contra", contravariant=True)
 
 
 @runtime_checkable
@@ -10,3 +11,11 @@ class SupportsRead(Protocol[T_co]):
 
     def read(self, length: int = ..., /) -> T_co:
         """Read and return up to `length` units."""
+
+
+@runtime_checkable
+class SupportsWrite(Protocol[T_contra]):
+    """An ABC with one abstract method `write`."""
+
+    def write(self, data: T_contra, /) -> object:
+        """Write `data`."""
@@ -1,4 +1,48 @@
-from backlib.internal.backports.py311.tomllib import TOMLDecodeError, load, loads
+from backlib.internal.backports.py311.tomllib import (
+    FrozenTable,
+    IncrementalParser,
+    Limits,
+    ParseStats,
+    SharedTable,
+    TOMLDecodeError,
+    TOMLLimitError,
+    aload,
+    aloads,
+    attach,
+    dump,
+    dumps,
+    iterparse,
+    load,
+    load_many,
+    load_path,
+    loads,
+    loads_bytes,
+    publish,
+    validate,
+    watch,
+)
 
 
-__all__: list[str] = ["TOMLDecodeError", "load", "loads"]
+__all__: list[str] = [
+    "FrozenTable",
+    "IncrementalParser",
+    "Limits",
+    "ParseStats",
+    "SharedTable",
+    "TOMLDecodeError",
+    "TOMLLimitError",
+    "aload",
+    "aloads",
+    "attach",
+    "dump",
+    "dumps",
+    "iterparse",
+    "load",
+    "load_many",
+    "load_path",
+    "loads",
+    "loads_bytes",
+    "publish",
+    "validate",
+    "watch",
+]
@@ -0,0 +1,83 @@
+"""Benchmark the memory that `backlib.py311.tomllib.loads` documents take with `compact=True`.
+
+Run it from the root of the repository, e.g. `python -m benchmarks.compact --documents 200`.
+Every shape of `benchmarks.documents` is parsed `--documents` times with and without
+`compact=True`, and all the documents are kept, as an application holding many
+configurations does. The memory they take per document, measured with `tracemalloc`, is
+printed as JSON, with how much less of it `compact=True` takes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from typing import Any
+
+from backlib.py311 import tomllib
+from benchmarks.documents import SHAPES
+
+
+OPTIONS: dict[str, dict[str, Any]] = {
+    "default": {},
+    "compact": {"compact": True},
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Measure the memory per document of every shape with every option."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=list(SHAPES),
+        help="a shape to benchmark, can be repeated (default: all)",
+    )
+    parser.add_argument("--documents", type=int, default=50, help="the documents kept at once")
+    parser.add_argument("--scale", type=float, default=0.02, help="the size of the documents")
+    args = parser.parse_args(argv)
+
+    results = []
+    for shape in args.shape or list(SHAPES):
+        s = SHAPES[shape](args.scale)
+        per_document = {
+            option: measure(s, args.documents, kwargs) for option, kwargs in OPTIONS.items()
+        }
+        results.append(
+            {
+                "shape": shape,
+                "bytes": len(s.encode()),
+                "bytes_per_document": per_document,
+                "reduction": 1 - per_document["compact"] / per_document["default"],
+            },
+        )
+
+    report = {
+        "benchmark": "compact",
+        "python": sys.version.split()[0],
+        "documents": args.documents,
+        "scale": args.scale,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+def measure(s: str, documents: int, kwargs: dict[str, Any]) -> float:
+    """Return the memory each of `documents` parses of `s` takes while they are all kept."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = [tomllib.loads(s, **kwargs) for _ in range(documents)]
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size / documents
+
+
+if __name__ == "__main__":
+    main()
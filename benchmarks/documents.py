@@ -0,0 +1,215 @@
+"""The TOML documents the parsing benchmarks run on, one generator per shape.
+
+The generators are deterministic, so a document is the same on every run and on every
+version of Python. `scale` multiplies the size of a document, except for `pyproject`, which
+is always tiny.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+
+__all__: list[str] = ["SHAPES"]
+
+
+PYPROJECT = """\
+[build-system]
+requires = ["poetry-core>=1.0.0"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "example"
+version = "1.2.3"
+description = "An example project."
+license = "MIT"
+authors = ["Jane Doe <jane@example.com>"]
+readme = "README.md"
+keywords = ["python", "toml", "example"]
+classifiers = [
+    "Programming Language :: Python :: 3",
+    "Programming Language :: Python :: 3.9",
+    "Programming Language :: Python :: 3.13",
+]
+
+[tool.poetry.dependencies]
+python = ">=3.9, <3.14"
+typing-extensions = "^4.12"
+requests = { version = "^2.32", extras = ["socks"] }
+
+[tool.black]
+line-length = 100
+target-version = ["py39"]
+
+[tool.ruff.lint]
+select = ["ALL"]
+ignore = ["D100", "D104"]  # Missing docstrings
+
+[tool.pytest.ini_options]
+addopts = "-ra --strict-markers"
+testpaths = ["tests"]
+"""
+
+
+def pyproject(scale: float) -> str:  # noqa: ARG001
+    """Make a typical `pyproject.toml`."""
+    return PYPROJECT
+
+
+def lock(scale: float) -> str:
+    """Make a lock file: an array of tables of packages with inline tables of their files."""
+    lines = ['version = 1\nrequires-python = ">=3.9"\n']
+    for i in range(int(10_000 * scale)):
+        lines.append(  # noqa: PERF401
+            f"""
+[[package]]
+name = "package-{i}"
+version = "{i % 7}.{i % 100}.{i % 13}"
+description = "Package number {i}, with a description of a typical length"
+optional = {"true" if i % 3 == 0 else "false"}
+python-versions = ">=3.9"
+files = [
+    {{ file = "package_{i}-py3-none-any.whl", hash = "sha256:{i:064x}" }},
+    {{ file = "package-{i}.tar.gz", hash = "sha256:{i * 31:064x}" }},
+]
+
+[package.dependencies]
+package-{(i + 1) % 1000} = ">=1.0"
+package-{(i + 2) % 1000} = {{ version = "^2.{i % 10}", optional = true }}
+""",
+        )
+    return "".join(lines)
+
+
+def tables(scale: float) -> str:
+    """Make a document of many tables, arrays of tables and dotted keys.
+
+    Every header and dotted key is checked against the flags of the keys before it, so this is
+    where the flags of the parser take the most time and memory.
+    """
+    lines: list[str] = []
+    for i in range(int(20_000 * scale)):
+        table = f"group-{i % 100}.table-{i}"
+        lines.append(
+            f"""
+[{table}]
+name = "table {i}"
+owner.id = {i}
+owner.name = "owner {i % 10}"
+
+[[{table}.items]]
+id = {2 * i}
+
+[[{table}.items]]
+id = {2 * i + 1}
+tags.first = true
+""",
+        )
+    return "".join(lines)
+
+
+def strings(scale: float) -> str:
+    """Make a document of basic, literal and multiline strings, with and without escapes."""
+    text = "The quick brown fox jumps over the lazy dog. " * 4
+    lines: list[str] = []
+    for i in range(int(5_000 * scale)):
+        lines.append(  # noqa: PERF401
+            f"""\
+plain-{i} = "{text}"
+escaped-{i} = "Tab\\tnewline\\nquote\\" backslash\\\\ unicode\\u00e9\\U0001F600 {i}"
+unicode-{i} = "Grüße, привет, こんにちは, 😀 {i}"
+literal-{i} = 'C:\\Users\\{i}\\{text}'
+multiline-{i} = \"\"\"
+{text}
+    an indented line, a \\"quote\\" and a line ending backslash \\
+    that trims the whitespace {i}
+\"\"\"
+multiline-literal-{i} = '''
+{text}
+raw \\n text {i}
+'''
+""",
+        )
+    return "".join(lines)
+
+
+def multiline_strings(scale: float) -> str:
+    """Make a document of long multiline basic strings, e.g. embedded scripts and texts."""
+    paragraph = 'The quick brown fox jumps over the "lazy" dog.\n' * 40
+    lines: list[str] = []
+    for i in range(int(500 * scale)):
+        lines.append(  # noqa: PERF401
+            f"""\
+script-{i} = \"\"\"
+#!/bin/sh
+echo "step {i}" && ./run --flag="value" \\
+    --other
+\"\"\"
+text-{i} = \"\"\"
+{paragraph}\tSigned, {i}\"\"\"
+""",
+        )
+    return "".join(lines)
+
+
+def datetimes(scale: float) -> str:
+    """Make a document of offset and local date-times, dates and times."""
+    lines: list[str] = []
+    for i in range(int(20_000 * scale)):
+        month, day, hour, minute, second = i % 12 + 1, i % 28 + 1, i % 24, i % 60, i % 59
+        date = f"{1970 + i % 100}-{month:02}-{day:02}"
+        clock = f"{hour:02}:{minute:02}:{second:02}"
+        lines.append(
+            f"""\
+utc-{i} = {date}T{clock}Z
+offset-{i} = {date}T{clock}.{i % 1000:03}+{i % 14:02}:30
+local-{i} = {date} {clock}.{i % 1000000:06}
+date-{i} = {date}
+time-{i} = {clock}
+""",
+        )
+    return "".join(lines)
+
+
+def inline_tables(scale: float) -> str:
+    """Make a document of deeply nested inline tables and arrays."""
+    siblings = "[{ a = 1 }, { b = 2 }]"
+    lines: list[str] = []
+    for i in range(int(5_000 * scale)):
+        depth = 4 + i % 16
+        nested = f'{{ value = {i}, name = "leaf-{i}", flags = [true, false] }}'
+        for level in range(depth):
+            nested = f"{{ level = {level}, child = {nested}, siblings = {siblings} }}"
+        lines.append(f"table-{i} = {nested}\n")
+    return "".join(lines)
+
+
+def numbers(scale: float) -> str:
+    """Make a document of arrays of integers and floats in every notation."""
+    lines: list[str] = []
+    for i in range(int(1_000 * scale)):
+        ints = ", ".join(str(i * 1_000 + j) for j in range(100))
+        floats = ", ".join(f"{(i * 100 + j) / 7:.6f}" for j in range(100))
+        others = ", ".join(
+            f"0x{j:04x}, 0o{j:o}, 0b{j:b}, 1_000_{j:03}, {j}e-{j % 10}, -{j}.5E+{j % 20}"
+            for j in range(20)
+        )
+        lines.append(
+            f"ints-{i} = [{ints}]\n"
+            f"floats-{i} = [{floats}]\n"
+            f"mixed-{i} = [{others}]\n"
+            f"matrix-{i} = [[1, 2, 3], [4.5, 5.5, 6.5], [inf, -inf, nan]]\n",
+        )
+    return "".join(lines)
+
+
+SHAPES: dict[str, Callable[[float], str]] = {
+    "pyproject": pyproject,
+    "lock": lock,
+    "tables": tables,
+    "strings": strings,
+    "multiline-strings": multiline_strings,
+    "datetimes": datetimes,
+    "inline-tables": inline_tables,
+    "numbers": numbers,
+}
@@ -0,0 +1,79 @@
+"""Benchmark `backlib.py311.tomllib.dump` on a lock file with a large array of tables.
+
+Run it from the root of the repository, e.g. `python -m benchmarks.dump --entries 1000000`.
+The results are printed as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from backlib.py311 import tomllib
+
+
+def make_document(entries: int) -> dict[str, Any]:
+    """Make a lock file of `entries` packages, each with a subtable and an inline array."""
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "version": 1,
+        "package": [
+            {
+                "name": f"package-{i}",
+                "version": f"{i % 7}.{i % 100}.{i % 13}",
+                "optional": i % 3 == 0,
+                "size": i * 4096,
+                "uploaded": created + timedelta(seconds=i),
+                "description": f'Package "{i}"\twith\\escapes',
+                "files": [f"package_{i}-py3-none-any.whl", f"package-{i}.tar.gz"],
+                "dependencies": {f"package-{(i + 1) % entries}": ">=1.0"},
+            }
+            for i in range(entries)
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Write the document `--repeat` times and print the fastest run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="check that the output round-trips")
+    args = parser.parse_args(argv)
+
+    doc = make_document(args.entries)
+    timings: list[float] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "lock.toml")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            with path.open("wb") as fp:
+                tomllib.dump(doc, fp)
+            timings.append(time.perf_counter() - start)
+        size = path.stat().st_size
+        if args.check:
+            with path.open("rb") as fp:
+                if tomllib.load(fp) != doc:
+                    sys.exit("The document does not round-trip")
+
+    best = min(timings)
+    result = {
+        "benchmark": "dump",
+        "python": sys.version.split()[0],
+        "entries": args.entries,
+        "bytes": size,
+        "seconds": best,
+        "mb_per_s": size / best / 1e6,
+    }
+    print(json.dumps(result, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark single-line edits of `backlib.py311.tomllib.IncrementalParser` on a large document.
+
+Run it from the root of the repository, e.g. `python -m benchmarks.incremental --edits 200`.
+A document of `--shape` is grown to about `--megabytes`, then edited one line at a time at
+random places: `value` edits change the value of a key, `line` edits insert a new key after a
+header. The median time of an edit of each kind and the best time of a full
+`backlib.py311.tomllib.loads` of the document are printed as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from backlib.py311 import tomllib
+from benchmarks.documents import SHAPES
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Time the edits of every kind and a full parse of the document."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", choices=list(SHAPES), default="lock")
+    parser.add_argument("--megabytes", type=float, default=10, help="the size of the document")
+    parser.add_argument("--edits", type=int, default=100, help="the edits of each kind")
+    parser.add_argument("--repeat", type=int, default=3, help="the runs of the full parse")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="check the edited documents")
+    args = parser.parse_args(argv)
+
+    make = SHAPES[args.shape]
+    s = make(args.megabytes * 1e6 / len(make(1).encode()))
+
+    timings: list[float] = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        tomllib.loads(s)
+        timings.append(time.perf_counter() - start)
+
+    rng = random.Random(args.seed)  # noqa: S311
+    incremental = tomllib.IncrementalParser(s)
+    edits = {}
+    for kind, make_edit in EDITS.items():
+        seconds = []
+        for n in range(args.edits):
+            offset, removed, inserted = make_edit(incremental.text, rng, n)
+            start = time.perf_counter()
+            incremental.edit(offset, removed, inserted)
+            seconds.append(time.perf_counter() - start)
+        edits[kind] = statistics.median(seconds)
+        if args.check and incremental.doc != tomllib.loads(incremental.text):
+            sys.exit(f"The document differs from a full parse after the {kind} edits")
+
+    best = min(timings)
+    result = {
+        "benchmark": "incremental",
+        "python": sys.version.split()[0],
+        "shape": args.shape,
+        "bytes": len(s.encode()),
+        "loads_seconds": best,
+        "edit_seconds": edits,
+        "speedup": {kind: best / seconds for kind, seconds in edits.items()},
+    }
+    print(json.dumps(result, indent=2))  # noqa: T201
+
+
+def edit_value(s: str, rng: random.Random, n: int) -> tuple[int, int, str]:
+    """Replace the value of a random `key = value` line, outside of arrays, with an integer."""
+    while True:
+        start = s.rfind("\n", 0, rng.randrange(len(s))) + 1
+        end = s.find("\n", start)
+        equals = s.find(" = ", start, end)
+        if equals > start and not s[start].isspace() and not s.endswith(("[", "{"), start, end):
+            return equals + 3, end - equals - 3, str(n)
+
+
+def insert_line(s: str, rng: random.Random, n: int) -> tuple[int, int, str]:
+    """Insert a new key with an integer after a random header."""
+    while True:
+        start = s.rfind("\n[", 0, rng.randrange(len(s))) + 1
+        end = s.find("\n", start)
+        if start > 0 and end >= 0:
+            return end + 1, 0, f"added-{n} = {n}\n"
+
+
+EDITS = {
+    "value": edit_value,
+    "line": insert_line,
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Benchmark `backlib.py311.tomllib.loads` against the standard `tomllib` on several shapes.
+
+Run it from the root of the repository, e.g. `python -m benchmarks.parse`. Every document of
+`benchmarks.documents` is parsed by `backlib.py311.tomllib.loads`, checked by
+`backlib.py311.tomllib.validate` and, on Python 3.11+, parsed by `tomllib.loads`, each in a
+fresh process of every interpreter given with `--python`. The results are printed as JSON,
+with these measurements:
+
+* `mb_per_s` - the throughput of the fastest of `--repeat` runs;
+* `alloc_peak_bytes` - the peak of the memory Python allocated during one parse;
+* `alloc_blocks` - the number of memory blocks the parsed document holds;
+* `peak_rss_bytes` - the peak resident set size of the process, and `rss_growth_bytes` how
+  much the parses added to it once the document was read.
+
+With `--baseline`, the throughput of `backlib` is compared with a previous result of the same
+shapes and interpreters, and the process exits with 1 if any of them got slower by more than
+`--tolerance`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.documents import SHAPES
+
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+IMPLEMENTATIONS = ("backlib", "validate", "stdlib")
+
+# Each run parses a document as many times as it takes for at least this long (in seconds), so
+# that tiny documents are timed accurately.
+MIN_RUN_TIME = 0.2
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmarks, or a single measurement with `--worker`."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=list(SHAPES),
+        help="a shape to benchmark, can be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--python",
+        action="append",
+        help="an interpreter to benchmark, can be repeated (default: the current one)",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="the size of the documents")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of timed runs")
+    parser.add_argument("--output", help="the file to write the results to (default: stdout)")
+    parser.add_argument("--baseline", help="the results to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="(default: %(default)s)")
+    parser.add_argument("--worker", nargs=2, metavar=("PATH", "IMPL"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        path, implementation = args.worker
+        print(json.dumps(measure(path, implementation, args.repeat)))  # noqa: T201
+        return
+
+    report = {
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "results": run(args.shape or list(SHAPES), args.python or [sys.executable], args),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)  # noqa: T201
+    else:
+        with open(args.output, "w", encoding="utf-8") as fp:  # noqa: PTH123
+            fp.write(text + "\n")
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as fp:  # noqa: PTH123
+            baseline = json.load(fp)
+        slower = regressions(report["results"], baseline["results"], args.tolerance)
+        for line in slower:
+            print(line, file=sys.stderr)  # noqa: T201
+        if slower:
+            sys.exit(1)
+
+
+def run(shapes: list[str], pythons: list[str], args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Measure every implementation on every shape with every interpreter."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for shape in shapes:
+            paths[shape] = str(Path(tmp, f"{shape}.toml"))
+            with open(paths[shape], "w", encoding="utf-8", newline="") as fp:  # noqa: PTH123
+                fp.write(SHAPES[shape](args.scale))
+
+        for python in pythons:
+            for shape in shapes:
+                measured = {}
+                for implementation in IMPLEMENTATIONS:
+                    result = run_worker(python, paths[shape], implementation, args.repeat)
+                    if result is not None:
+                        measured[implementation] = {"shape": shape, **result}
+                if "stdlib" in measured:
+                    # How many times faster than `tomllib` parsing and validating are
+                    for faster in ("backlib", "validate"):
+                        speedup = measured[faster]["mb_per_s"] / measured["stdlib"]["mb_per_s"]
+                        measured[faster]["speedup"] = speedup
+                results.extend(measured.values())
+    return results
+
+
+def run_worker(
+    python: str,
+    path: str,
+    implementation: str,
+    repeat: int,
+) -> dict[str, Any] | None:
+    """Measure one implementation on one document in a fresh process of `python`."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    command = [python, "-m", "benchmarks.parse", "--worker", path, implementation]
+    command += ["--repeat", str(repeat)]
+    completed = subprocess.run(  # noqa: S603
+        command,
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+        text=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def measure(path: str, implementation: str, repeat: int) -> dict[str, Any] | None:
+    """Measure one implementation on the document at `path`, or `None` if it is missing."""
+    loads = import_loads(implementation)
+    if loads is None:
+        return None
+    with open(path, "rb") as fp:  # noqa: PTH123
+        b = fp.read()
+    s = b.decode()
+    rss_before = peak_rss()
+
+    start = time.perf_counter()
+    loads(s)
+    number = max(1, math.ceil(MIN_RUN_TIME / (time.perf_counter() - start)))
+    best = math.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            loads(s)
+        best = min(best, (time.perf_counter() - start) / number)
+    rss_after = peak_rss()
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    doc = loads(s)
+    gc.collect()
+    alloc_blocks = sys.getallocatedblocks() - blocks
+    del doc
+
+    tracemalloc.start()
+    loads(s)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "python_version": sys.version.split()[0],
+        "implementation": implementation,
+        "bytes": len(b),
+        "seconds": best,
+        "mb_per_s": len(b) / best / 1e6,
+        "alloc_peak_bytes": alloc_peak,
+        "alloc_blocks": alloc_blocks,
+        "peak_rss_bytes": rss_after,
+        "rss_growth_bytes": None if rss_after is None else rss_after - rss_before,
+    }
+
+
+def import_loads(implementation: str) -> Callable[[str], object] | None:
+    """Import the function of an implementation, or return `None` if it is missing."""
+    if implementation in {"backlib", "validate"}:
+        from backlib.py311 import tomllib
+
+        return tomllib.loads if implementation == "backlib" else tomllib.validate
+    if sys.version_info < (3, 11):
+        return None
+    import tomllib
+
+    return tomllib.loads
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of the process in bytes, or `None` on Windows."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # In kilobytes on Linux, but in bytes on macOS
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def regressions(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Describe the shapes that `backlib` parses more slowly than in `baseline`."""
+    previous = {
+        (result["python"], result["shape"]): result["mb_per_s"]
+        for result in baseline
+        if result["implementation"] == "backlib"
+    }
+    slower = []
+    for result in results:
+        key = (result["python"], result["shape"])
+        if result["implementation"] != "backlib" or key not in previous:
+            continue
+        if result["mb_per_s"] < previous[key] * (1 - tolerance):
+            slower.append(
+                f"{result['shape']} on Python {result['python']}: "
+                f"{previous[key]:.2f} MB/s -> {result['mb_per_s']:.2f} MB/s",
+            )
+    return slower
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Random TOML documents, valid and invalid, for differential tests."""
+
+from __future__ import annotations
+
+import math
+import random
+
+from typing import Any, Callable
+
+
+__all__: list[str] = ["VALID_SCALARS", "outcome", "random_documents"]
+
+
+KEYS = ["a", "b", "c", "key", "x-y", "_", "1", "0x1", "true", "tbl"]
+QUOTED_KEYS = ['"a"', '"b c"', '"é"', '"\\u00e9"', '"\\n"', '""', '"a.b"', "'a'", "'b c'", "''"]
+
+VALID_SCALARS = [
+    "1",
+    "-0",
+    "+17",
+    "1_000",
+    "0xDEAD_beef",
+    "0o755",
+    "0b1101",
+    "3.14",
+    "-1e10",
+    "6.02E+23",
+    "1_0.0_1",
+    "inf",
+    "-inf",
+    "+nan",
+    "true",
+    "false",
+    '"str"',
+    '"esc\\t\\"\\u00E9\\U0001F600"',
+    "'lit'",
+    '"""\nml\\\n  basic"""',
+    "'''\nml lit '' '''",
+    '""""quoted""""',
+    "''''''",
+    "1979-05-27T07:32:00Z",
+    "1979-05-27T00:32:00.999999-07:00",
+    "1979-05-27 07:32:00",
+    "1979-05-27",
+    "07:32:00",
+    "00:32:00.5",
+    "1979-05-27t07:32:00.1234567+05:30",
+]
+INVALID_SCALARS = ["2000-02-30", "24:00:00", '"\\x"', "01", "1__0", "0x", "1.", ".1", "1e"]
+
+MUTATIONS = [*"[]{}=.,\"'#\n\r\t \\abc01:-+_eE", "\x00", "\x7f", "é", "\r\n", '"""', "'''"]
+
+
+def random_documents(seed: int, count: int) -> list[str]:
+    """Make `count` documents, about half of them mutated into likely invalid ones."""
+    rng = random.Random(seed)  # noqa: S311
+    documents = []
+    for _ in range(count):
+        s = random_document(rng)
+        documents.append(mutate(rng, s) if rng.random() < 0.5 else s)  # noqa: PLR2004
+    return documents
+
+
+def random_document(rng: random.Random) -> str:
+    """Make a document of headers, key/value pairs, comments and blank lines."""
+    lines = []
+    for _ in range(rng.randint(1, 25)):
+        choice = rng.random()
+        if choice < 0.15:  # noqa: PLR2004
+            lines.append(f"[{random_key(rng)}]")
+        elif choice < 0.25:  # noqa: PLR2004
+            lines.append(f"[[{random_key(rng)}]]")
+        elif choice < 0.3:  # noqa: PLR2004
+            lines.append("# comment " + rng.choice(["", "x", "\t"]))
+        elif choice < 0.33:  # noqa: PLR2004
+            lines.append(rng.choice(["", "   ", "\t"]))
+        else:
+            comment = rng.choice(["", " # tail", "  "])
+            lines.append(f"{random_key(rng)} = {random_value(rng, 0)}{comment}")
+    newline = rng.choice(["\n", "\n", "\r\n"])
+    return newline.join(lines) + rng.choice(["", "\n"])
+
+
+def random_key(rng: random.Random) -> str:
+    """Make a key of up to three parts, bare or quoted."""
+    parts = []
+    for _ in range(rng.choice([1, 1, 1, 2, 3])):
+        choice = rng.random()
+        if choice < 0.5:  # noqa: PLR2004
+            parts.append(f"k{rng.randrange(1000)}")
+        elif choice < 0.8:  # noqa: PLR2004
+            parts.append(rng.choice(KEYS))
+        else:
+            parts.append(rng.choice(QUOTED_KEYS))
+    return ".".join(parts)
+
+
+def random_value(rng: random.Random, depth: int) -> str:
+    """Make a scalar, an array or an inline table of up to three levels."""
+    choice = rng.random()
+    if depth < 3 and choice < 0.12:  # noqa: PLR2004
+        items = [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+        separator = rng.choice([",", ", ", ",\n  ", " ,# c\n"])
+        trailing = rng.choice(["", ","]) if items else ""
+        return "[" + separator.join(items) + trailing + "]"
+    if depth < 3 and choice < 0.22:  # noqa: PLR2004
+        pairs = [
+            f"{random_key(rng)} = {random_value(rng, depth + 1)}" for _ in range(rng.randint(0, 3))
+        ]
+        return "{" + ", ".join(pairs) + "}"
+    if rng.random() < 0.9:  # noqa: PLR2004
+        return rng.choice(VALID_SCALARS)
+    return rng.choice(INVALID_SCALARS)
+
+
+def mutate(rng: random.Random, s: str) -> str:
+    """Delete, insert or replace up to three characters of `s`."""
+    chars = list(s)
+    for _ in range(rng.randint(1, 3)):
+        choice = rng.random()
+        i = rng.randint(0, len(chars))
+        if choice < 0.4 and chars:  # noqa: PLR2004
+            del chars[min(i, len(chars) - 1)]
+        elif choice < 0.8:  # noqa: PLR2004
+            chars.insert(i, rng.choice(MUTATIONS))
+        elif chars:
+            chars[min(i, len(chars) - 1)] = rng.choice(MUTATIONS)
+    return "".join(chars)
+
+
+def outcome(loads: Callable[[str], Any], s: str) -> tuple[str, Any]:
+    """Return `("ok", document)` or `("error", message)`, comparable across parsers."""
+    try:
+        return "ok", normalize(loads(s))
+    except ValueError as e:
+        return "error", str(e)
+
+
+def normalize(obj: Any) -> Any:
+    """Make a parsed value comparable with `==`, including the NaNs and the signs of zeros."""
+    if isinstance(obj, dict):
+        return {k: normalize(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [normalize(v) for v in obj]
+    if isinstance(obj, float):
+        return "float", "nan" if math.isnan(obj) else obj, math.copysign(1, obj)
+    return type(obj).__name__, obj
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import aio
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+DOCUMENTS = random_documents(seed=8, count=500)
+
+# Statements enough for a parse to take far longer than cancelling it
+STATEMENTS = 100_000
+
+
+def aloads(s: str, **kwargs: Any) -> dict[str, Any]:
+    """Parse a document with `aloads` in a new event loop."""
+    return asyncio.run(tomllib.aloads(s, **kwargs))
+
+
+def test_aloads_same_as_loads() -> None:
+    """Check that a parse in the event loop returns the document or the error of `loads`."""
+    for s in DOCUMENTS:
+        assert outcome(aloads, s) == outcome(tomllib.loads, s), s
+
+
+def test_aloads_thread_same_as_loads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a parse in a thread returns the document or the error of `loads`."""
+    monkeypatch.setattr(aio, "MIN_EXECUTOR_SIZE", 0)
+    with ThreadPoolExecutor(1) as executor:
+        for s in DOCUMENTS:
+            assert outcome(partial(aloads, executor=executor), s) == outcome(tomllib.loads, s), s
+
+
+def test_aloads_process_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a parse in a process pool passes `parse_float` on."""
+    monkeypatch.setattr(aio, "MIN_EXECUTOR_SIZE", 0)
+    with ProcessPoolExecutor(1) as executor:
+        doc = aloads("a = 0.1\n", parse_float=Decimal, executor=executor)
+    assert doc == {"a": Decimal("0.1")}
+
+
+def test_aloads_lets_other_tasks_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a parse in the event loop lets other tasks run between its statements."""
+    monkeypatch.setattr(aio, "INLINE_TIME_SLICE", 0)
+    s = "".join(f"a{i} = {i}\n" for i in range(100))
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def parse() -> dict[str, Any]:
+        ticker = asyncio.ensure_future(tick())
+        try:
+            return await tomllib.aloads(s)
+        finally:
+            ticker.cancel()
+
+    assert asyncio.run(parse()) == tomllib.loads(s)
+    assert ticks >= 100
+
+
+def test_aloads_cancel_stops_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that cancelling a parse in a thread stops the thread at the next statement."""
+    monkeypatch.setattr(aio, "MIN_EXECUTOR_SIZE", 0)
+    s = "".join(f"a{i} = {i}.5\n" for i in range(STATEMENTS))
+    parsed = 0
+
+    async def cancel(executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def count_float(s: str) -> float:
+            nonlocal parsed
+            parsed += 1
+            if parsed == 1:
+                loop.call_soon_threadsafe(started.set)
+            return float(s)
+
+        task = asyncio.ensure_future(tomllib.aloads(s, parse_float=count_float, executor=executor))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with ThreadPoolExecutor(1) as executor:
+        asyncio.run(cancel(executor))
+    assert 0 < parsed < STATEMENTS
+
+
+def test_aload(tmp_path: Path) -> None:
+    """Check that `aload` reads and parses a file, raising the errors of reading it."""
+    path = tmp_path / "config.toml"
+    path.write_text("title = 'é'\n[t]\na = 1.5\n", encoding="utf-8")
+    assert asyncio.run(tomllib.aload(path, parse_float=Decimal)) == {
+        "title": "é",
+        "t": {"a": Decimal("1.5")},
+    }
+    path.write_bytes(b"a = '\xff'\n")
+    with pytest.raises(UnicodeDecodeError):
+        asyncio.run(tomllib.aload(path))
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(tomllib.aload(tmp_path / "missing.toml"))
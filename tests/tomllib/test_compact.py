@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+
+from array import array
+from typing import Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import parallel
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = random_documents(seed=5, count=1000)
+
+DOCUMENT = "".join(f"[[server]]\nname = 's{i}'\nports = [80, {i}]\n" for i in range(50))
+
+
+def test_compact_same_as_loads() -> None:
+    """Check that a compact document has the values of a default one, or raises its error."""
+    for s in DOCUMENTS:
+        assert outcome(lambda s: thaw(tomllib.loads(s, compact=True)), s) == outcome(
+            tomllib.loads,
+            s,
+        ), s
+
+
+def test_compact_arrays_are_tuples() -> None:
+    """Check that arrays, including arrays of tables, are tuples."""
+    doc = tomllib.loads("a = [1, [2, {b = [3]}]]\n[[t]]\n", compact=True)
+    assert doc == {"a": (1, (2, {"b": (3,)})), "t": ({},)}
+
+
+def test_compact_keys_are_interned() -> None:
+    """Check that equal keys are one string object, within and across documents."""
+    first = tomllib.loads(DOCUMENT, compact=True)
+    second = tomllib.loads(DOCUMENT, compact=True)
+    for server in second["server"]:
+        assert all(a is b for a, b in zip(server, first["server"][0]))
+    assert next(iter(first)) is sys.intern("server")
+
+
+def test_compact_numeric_arrays() -> None:
+    """Check that numeric arrays stay `array.array` in a compact document."""
+    doc = tomllib.loads("a = [1, 2]\nb = ['x']\n", compact=True, numeric_arrays="array")
+    assert doc == {"a": array("q", [1, 2]), "b": ("x",)}
+
+
+@pytest.mark.parametrize("select", [None, ["server"]])
+def test_compact_parallel_same_as_sequential(
+    select: list[str] | None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Check that a process pool returns the compact document of a sequential parse."""
+    expected = tomllib.loads(DOCUMENT, compact=True, select=select)
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_SIZE", 0)
+    doc = tomllib.loads(DOCUMENT, compact=True, select=select, max_workers=2)
+    assert doc == expected
+    assert all(type(server) is dict for server in doc["server"])
+    assert type(doc["server"]) is tuple
+
+
+def thaw(obj: Any) -> Any:
+    """Turn the tuples of a compact document back into lists."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import io
+import sys
+
+from functools import partial
+from typing import Any, Callable
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import parallel
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+if sys.version_info < (3, 11):
+    pytest.skip("The standard tomllib is new in Python 3.11", allow_module_level=True)
+
+import tomllib as stdlib_tomllib
+
+
+DOCUMENTS = random_documents(seed=0, count=3000)
+
+
+@pytest.mark.parametrize(
+    "loads",
+    [
+        tomllib.loads,
+        lambda s: tomllib.loads_bytes(s.encode()),
+        lambda s: tomllib.load(io.BytesIO(s.encode())),
+    ],
+    ids=["loads", "loads_bytes", "load"],
+)
+def test_same_as_stdlib(loads: Callable[[str], Any]) -> None:
+    """Check that the documents and the errors are the same as of the standard `tomllib`."""
+    for s in DOCUMENTS:
+        assert outcome(loads, s) == outcome(stdlib_tomllib.loads, s), s
+
+
+def test_parallel_same_as_stdlib(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the documents parsed by several processes are the same as well."""
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_SIZE", 0)
+    for s in DOCUMENTS[:50]:
+        loads = partial(tomllib.loads, max_workers=2)
+        assert outcome(loads, s) == outcome(stdlib_tomllib.loads, s), s
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+import os
+
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import backlib
+
+from backlib.internal.backports.py311.tomllib.internal import diskcache
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+from backlib.py311 import tomllib
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+DOCUMENT = """\
+title = "snapshot"
+when = 1979-05-27T07:32:00Z
+day = 1979-05-27
+floats = [1.5, -nan, inf]
+[[package]]
+name = "a"
+"""
+
+
+def load(s: str, cache_dir: Path) -> dict[str, Any]:
+    """Load a document through the cache in `cache_dir`."""
+    return tomllib.load(io.BytesIO(s.encode()), cache_dir=cache_dir)
+
+
+def only_snapshot(cache_dir: Path) -> Path:
+    """Return the one snapshot in `cache_dir`."""
+    (path,) = cache_dir.glob("*" + diskcache.SNAPSHOT_SUFFIX)
+    return path
+
+
+def forbid_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make any parse fail, so that only snapshots can be loaded."""
+
+    def fail(*_args: Any, **_kwargs: Any) -> None:
+        raise AssertionError
+
+    monkeypatch.setattr(parser, "load", fail)
+
+
+def test_snapshot_is_loaded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a second load decodes the snapshot to the same document."""
+    expected = load(DOCUMENT, tmp_path)
+    assert expected["when"] == datetime(1979, 5, 27, 7, 32, tzinfo=timezone.utc)
+    assert expected["day"] == date(1979, 5, 27)
+    forbid_parsing(monkeypatch)
+    doc = load(DOCUMENT, tmp_path)
+    assert repr(doc) == repr(expected)
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda b: b[:-1] + bytes([b[-1] ^ 1]),
+        lambda b: b[:-10],
+        lambda b: b + b" ",
+        lambda b: b[: len(diskcache.MAGIC) + 3],
+        lambda _: b"not a snapshot",
+        lambda _: b"",
+    ],
+    ids=["flipped", "truncated", "extended", "header", "magic", "empty"],
+)
+def test_corrupt_snapshot_is_replaced(tmp_path: Path, damage: Any) -> None:
+    """Check that a damaged snapshot is parsed again and overwritten."""
+    expected = load(DOCUMENT, tmp_path)
+    path = only_snapshot(tmp_path)
+    good = path.read_bytes()
+    path.write_bytes(damage(good))
+    assert repr(load(DOCUMENT, tmp_path)) == repr(expected)
+    assert path.read_bytes() == good
+
+
+def test_other_format_version_is_replaced(tmp_path: Path) -> None:
+    """Check that a snapshot of another version of the format is ignored and overwritten."""
+    load(DOCUMENT, tmp_path)
+    path = only_snapshot(tmp_path)
+    good = path.read_bytes()
+    version = len(diskcache.MAGIC)
+    path.write_bytes(good[:version] + bytes([good[version] + 1]) + good[version + 1 :])
+    with pytest.raises(ValueError, match="version"):
+        diskcache.decode(path.read_bytes())
+    load(DOCUMENT, tmp_path)
+    assert path.read_bytes() == good
+
+
+def test_other_backlib_version_misses(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the snapshots of another version of `backlib` are not used."""
+    load(DOCUMENT, tmp_path)
+    monkeypatch.setattr(backlib, "__version__", backlib.__version__ + ".other")
+    load(DOCUMENT, tmp_path)
+    assert len(list(tmp_path.glob("*" + diskcache.SNAPSHOT_SUFFIX))) == 2
+
+
+def test_least_recently_used_snapshots_are_pruned(tmp_path: Path) -> None:
+    """Check that at most `MAX_SNAPSHOTS` snapshots are kept, the oldest are removed."""
+    for i in range(diskcache.MAX_SNAPSHOTS):
+        load(f"a = {i}\n", tmp_path)
+    snapshots = sorted(tmp_path.glob("*" + diskcache.SNAPSHOT_SUFFIX))
+    assert len(snapshots) == diskcache.MAX_SNAPSHOTS
+    for i, path in enumerate(snapshots):
+        os.utime(path, (i, i))
+    oldest, second_oldest = snapshots[0], snapshots[1]
+    # Loading a snapshot marks it as recently used
+    doc = diskcache.decode(oldest.read_bytes())
+    load(f"a = {doc['a']}\n", tmp_path)
+
+    load("a = 'new'\n", tmp_path)
+    remaining = set(tmp_path.glob("*" + diskcache.SNAPSHOT_SUFFIX))
+    assert len(remaining) == diskcache.MAX_SNAPSHOTS
+    assert oldest in remaining
+    assert second_oldest not in remaining
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import importlib.util
+
+from array import array
+from typing import Any, Callable
+
+import pytest
+
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = [
+    s for s in random_documents(seed=2, count=2000) if outcome(tomllib.loads, s)[0] == "ok"
+]
+
+NUMERIC_ARRAYS = """\
+ints = [1, -2, 9_223_372_036_854_775_807]
+mixed = [0x10, 1]
+floats = [1.5, -0.0, inf, nan, 6.02e23]
+[[tables]]
+ints = [3, 4]
+"""
+
+
+@pytest.mark.parametrize(
+    "loads",
+    [
+        tomllib.loads,
+        lambda s: tomllib.loads(s, numeric_arrays="array"),
+        lambda s: tomllib.loads(s, frozen=True),
+        lambda s: tomllib.loads(s, compact=True),
+    ],
+    ids=["default", "numeric_arrays", "frozen", "compact"],
+)
+def test_dumps_round_trips(loads: Callable[[str], Any]) -> None:
+    """Check that the output of `dumps` parses back to the same document."""
+    for s in [*DOCUMENTS, NUMERIC_ARRAYS]:
+        text = tomllib.dumps(loads(s))
+        assert outcome(tomllib.loads, text) == outcome(tomllib.loads, s), (s, text)
+
+
+def test_dumps_numeric_arrays() -> None:
+    """Check that `array.array` values are written as arrays."""
+    doc = tomllib.loads(NUMERIC_ARRAYS, numeric_arrays="array")
+    assert isinstance(doc["ints"], array)
+    assert isinstance(doc["floats"], array)
+    assert tomllib.dumps({"a": array("q", [1, 2]), "b": array("d", [0.5])}) == (
+        "a = [1, 2]\nb = [0.5]\n"
+    )
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("multiprocessing.shared_memory") is None,
+    reason="Shared memory is not available",
+)
+def test_dumps_shared_table() -> None:
+    """Check that a document attached from shared memory is written as the original one."""
+    s = DOCUMENTS[0] + "\n[[package]]\nname = 'a'\n[[package]]\nname = 'b'\n"
+    doc = tomllib.loads(s)
+    shm = tomllib.publish(doc)
+    try:
+        text = tomllib.dumps(tomllib.attach(shm.name))
+    finally:
+        shm.close()
+        shm.unlink()
+    assert text == tomllib.dumps(doc)
+
+
+def test_dumps_rejects_bytes() -> None:
+    """Check that bytes, although they are sequences, are not written as arrays."""
+    with pytest.raises(TypeError, match="bytes"):
+        tomllib.dumps({"a": b"\x01\x02"})
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pickle
+
+from array import array
+from typing import Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal.frozen import freeze
+from backlib.py311 import tomllib
+
+
+DOCUMENT = """\
+title = "config"
+when = 1979-05-27T07:32:00Z
+ports = [80, [443, 8443]]
+[owner]
+name = "Tom"
+[[servers]]
+ip = "10.0.0.1"
+tags = {env = "prod"}
+"""
+
+
+def test_frozen_same_as_loads() -> None:
+    """Check that a frozen document has the values of a default one, with tuples for arrays."""
+    doc = tomllib.loads(DOCUMENT, frozen=True)
+    assert isinstance(doc, tomllib.FrozenTable)
+    assert isinstance(doc["servers"][0]["tags"], tomllib.FrozenTable)
+    assert doc["ports"] == (80, (443, 8443))
+    assert doc == freeze(tomllib.loads(DOCUMENT))
+    assert doc["owner"] == {"name": "Tom"}
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda doc: doc.__setitem__("title", "other"),
+        lambda doc: doc.__delitem__("title"),
+        lambda doc: doc["owner"].update(name="other"),
+        lambda doc: doc["servers"][0].pop("ip"),
+        lambda doc: doc["ports"].append(1),
+        lambda doc: setattr(doc, "title", "other"),
+    ],
+    ids=["setitem", "delitem", "update", "pop", "append", "setattr"],
+)
+def test_frozen_mutation_raises(mutate: Any) -> None:
+    """Check that a frozen document cannot be mutated through its mapping or sequence API."""
+    doc = tomllib.loads(DOCUMENT, frozen=True)
+    with pytest.raises((TypeError, AttributeError)):
+        mutate(doc)
+    assert doc == freeze(tomllib.loads(DOCUMENT))
+
+
+def test_frozen_hash() -> None:
+    """Check that equal documents hash alike whatever their key order, and differ otherwise."""
+    doc = tomllib.loads(DOCUMENT, frozen=True)
+    assert hash(doc) == hash(tomllib.loads(DOCUMENT, frozen=True))
+    ordered = tomllib.loads("a = 1\nb = [2]\n", frozen=True)
+    reordered = tomllib.FrozenTable({"b": [2], "a": 1})
+    assert ordered == reordered
+    assert hash(ordered) == hash(reordered)
+    assert ordered != tomllib.loads("a = 1\nb = [3]\n", frozen=True)
+    assert {doc: 1, ordered: 2}[reordered] == 2
+
+
+def test_frozen_table_freezes_values() -> None:
+    """Check that `FrozenTable` freezes the tables and arrays it is made of."""
+    table = tomllib.FrozenTable({"a": [1, {"b": array("q", [2])}]})
+    assert table == {"a": (1, {"b": (2,)})}
+    assert isinstance(table["a"][1], tomllib.FrozenTable)
+    assert freeze(table) is table
+    hash(table)
+
+
+def test_frozen_with_changes() -> None:
+    """Check that `with_changes` copies the changed tables only, creating missing ones."""
+    doc = tomllib.loads(DOCUMENT, frozen=True)
+    changed = doc.with_changes({"title": "new", ("owner", "name"): "Ann", ("x", "y"): [1]})
+    assert changed["title"] == "new"
+    assert changed["owner"] == {"name": "Ann"}
+    assert changed["x"] == {"y": (1,)}
+    assert changed["servers"] is doc["servers"]
+    assert doc == freeze(tomllib.loads(DOCUMENT))
+    with pytest.raises(ValueError, match="must not be empty"):
+        doc.with_changes({(): 1})
+    with pytest.raises(TypeError, match="'title' is not a table"):
+        doc.with_changes({("title", "a"): 1})
+
+
+def test_frozen_pickle() -> None:
+    """Check that a frozen document is pickled to an equal one with the same hash."""
+    doc = tomllib.loads(DOCUMENT, frozen=True)
+    copy = pickle.loads(pickle.dumps(doc))  # noqa: S301
+    assert copy == doc
+    assert hash(copy) == hash(doc)
+    assert isinstance(copy["owner"], tomllib.FrozenTable)
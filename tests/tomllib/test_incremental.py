@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+
+from decimal import Decimal
+from functools import partial
+from typing import Any
+
+import pytest
+
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = [
+    s for s in random_documents(seed=6, count=1500) if outcome(tomllib.loads, s)[0] == "ok"
+]
+
+# Text inserted by the random edits, likely to change values, keys and headers
+INSERTIONS = ["1", "x", " = ", "\n", "\n[t]\n", "\n[[t]]\n", "a.b = 2\n", '"""', "#", "]", ""]
+
+DOCUMENT = """\
+title = "config"
+[server]
+port = 80
+[database]
+host = "localhost"
+[[plugins]]
+name = "a"
+"""
+
+
+def test_incremental_same_as_loads() -> None:
+    """Check that random edits give the document or the error of a full parse of the text."""
+    rng = random.Random(6)  # noqa: S311
+    for s in DOCUMENTS:
+        incremental = tomllib.IncrementalParser(s)
+        for _ in range(10):
+            text, doc = incremental.text, incremental.doc
+            offset = rng.randrange(len(text) + 1)
+            removed = rng.randrange(min(len(text) - offset, 8) + 1)
+            inserted = rng.choice(INSERTIONS)
+            new_text = text[:offset] + inserted + text[offset + removed :]
+            result = outcome(partial(edit, incremental, offset, removed, inserted), new_text)
+            assert result == outcome(tomllib.loads, new_text), (text, offset, removed, inserted)
+            if result[0] == "error":
+                assert (incremental.text, incremental.doc) == (text, doc)
+            else:
+                assert incremental.text == new_text
+
+
+def test_incremental_shares_unchanged_tables() -> None:
+    """Check that an edit of a value copies only the tables along the way to it."""
+    incremental = tomllib.IncrementalParser(DOCUMENT)
+    before = incremental.doc
+    offset = DOCUMENT.index("80")
+    after = incremental.edit(offset, 2, "8080")
+    assert after == tomllib.loads(incremental.text)
+    assert after["server"]["port"] == 8080
+    assert before["server"]["port"] == 80
+    assert after["database"] is before["database"]
+    assert after["plugins"] is before["plugins"]
+
+
+def test_incremental_structural_edit() -> None:
+    """Check that an edit adding a header or splitting a multiline string is parsed again."""
+    incremental = tomllib.IncrementalParser(DOCUMENT)
+    end = DOCUMENT.index("[database]")
+    incremental.edit(end, 0, "[[plugins]]\nname = 'b'\n")
+    assert incremental.doc == tomllib.loads(incremental.text)
+    incremental.edit(len(incremental.text), 0, 's = """\n[server]\n"""\n')
+    assert incremental.doc["plugins"][-1]["s"] == "[server]\n"
+    assert incremental.doc == tomllib.loads(incremental.text)
+
+
+def test_incremental_parse_float() -> None:
+    """Check that `parse_float` is used for the edited values."""
+    incremental = tomllib.IncrementalParser("a = 0.1\n", parse_float=Decimal)
+    assert incremental.edit(4, 3, "0.2") == {"a": Decimal("0.2")}
+
+
+def test_incremental_invalid_range() -> None:
+    """Check that an edit outside of the text raises `ValueError`."""
+    incremental = tomllib.IncrementalParser(DOCUMENT)
+    for offset, removed in [(-1, 0), (0, -1), (len(DOCUMENT), 1)]:
+        with pytest.raises(ValueError, match="outside of the text"):
+            incremental.edit(offset, removed, "")
+
+
+def edit(
+    incremental: tomllib.IncrementalParser,
+    offset: int,
+    removed: int,
+    inserted: str,
+    _new_text: str,
+) -> dict[str, Any]:
+    """Edit the document, ignoring the new text, which `outcome` passes."""
+    return incremental.edit(offset, removed, inserted)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import io
+
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import CHUNK_SIZE
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = random_documents(seed=4, count=2000)
+
+DOCUMENT = """\
+a = 1
+b.c = {d = [1]}
+[t]
+x = 2
+[[arr]]
+y = 3
+[[arr]]
+[arr.sub]
+z = 4
+"""
+
+
+class CountingReader(io.BytesIO):
+    """A binary file object that counts the bytes read from it."""
+
+    consumed = 0
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        """Read and count up to `size` bytes."""
+        b = super().read(size)
+        self.consumed += len(b)
+        return b
+
+
+def test_iterparse_events() -> None:
+    """Check that every header and key/value pair is an event, in the order of the document."""
+    assert list(tomllib.iterparse(io.BytesIO(DOCUMENT.encode()))) == [
+        (("a",), "value", 1),
+        (("b", "c"), "value", {"d": [1]}),
+        (("t",), "table", None),
+        (("t", "x"), "value", 2),
+        (("arr",), "array-item", None),
+        (("arr", "y"), "value", 3),
+        (("arr",), "array-item", None),
+        (("arr", "sub"), "table", None),
+        (("arr", "sub", "z"), "value", 4),
+    ]
+
+
+def test_iterparse_same_as_loads() -> None:
+    """Check that the events rebuild the document of `loads`, or raise its error."""
+    for s in DOCUMENTS:
+        assert outcome(parse_events, s) == outcome(tomllib.loads, s), s
+
+
+def test_iterparse_parse_float() -> None:
+    """Check that `iterparse` passes `parse_float` on."""
+    events = tomllib.iterparse(io.BytesIO(b"a = [0.1]\n"), parse_float=Decimal)
+    assert list(events) == [(("a",), "value", [Decimal("0.1")])]
+
+
+def test_iterparse_events_before_error() -> None:
+    """Check that the events preceding an error are yielded before it is raised."""
+    events = tomllib.iterparse(io.BytesIO(b"a = 1\n[t]\nb = 2\nb = 3\n"))
+    assert next(events) == (("a",), "value", 1)
+    assert next(events) == (("t",), "table", None)
+    assert next(events) == (("t", "b"), "value", 2)
+    with pytest.raises(tomllib.TOMLDecodeError, match="line 4"):
+        next(events)
+
+
+def test_iterparse_streams() -> None:
+    """Check that the first events are yielded before the whole file is read."""
+    fp = CountingReader(b"".join(b"[[item]]\nid = %d\n" % i for i in range(CHUNK_SIZE)))
+    events = tomllib.iterparse(fp)
+    assert next(events) == (("item",), "array-item", None)
+    assert fp.consumed < len(fp.getvalue()) // 2
+    assert sum(1 for _ in events) == 2 * CHUNK_SIZE - 1
+
+
+def parse_events(s: str) -> dict[str, Any]:
+    """Parse a document with `iterparse`, and rebuild it from the events."""
+    doc: dict[str, Any] = {}
+    for key, event, value in tomllib.iterparse(io.BytesIO(s.encode())):
+        *parents, name = key
+        table = doc
+        for k in parents:
+            table = table.setdefault(k, {})
+            if isinstance(table, list):
+                table = table[-1]
+        if event == "value":
+            table[name] = value
+        elif event == "table":
+            table.setdefault(name, {})
+        else:
+            table.setdefault(name, []).append({})
+    return doc
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = random_documents(seed=3, count=1000)
+
+# A dotted key of this many parts took seconds while its parts were joined into a tuple one by one
+KEY_PARTS = 80_000
+MAX_SECONDS = 1.0
+
+
+def test_no_limits_same_as_loads() -> None:
+    """Check that documents within the limits parse as they do without limits."""
+    limits = tomllib.Limits(max_depth=None)
+    for s in DOCUMENTS:
+        assert outcome(lambda s: tomllib.loads(s, limits=limits), s) == outcome(tomllib.loads, s)
+
+
+@pytest.mark.parametrize(
+    ("limits", "within", "beyond"),
+    [
+        (tomllib.Limits(max_size=10), "a = 12345\n", "a = 123456\n"),
+        (tomllib.Limits(max_depth=3), "a.b = [1]\n", "a.b = [[1]]\n"),
+        (tomllib.Limits(max_depth=3), "[a]\nb = [1]\n", "[a]\nb = {c = [1]}\n"),
+        (tomllib.Limits(max_depth=2), "[[a]]\nb = 1\n", "[[a.b]]\nc = 1\n"),
+        (tomllib.Limits(max_values=4), "a = [1, 2]\nb = 3\n", "a = [1, 2]\nb = [3]\n"),
+        (tomllib.Limits(max_values=2), "[a]\nb = 1\n", "[a]\nb = 1\n[c]\n"),
+        (tomllib.Limits(max_key_length=4), "ab.cd = 1\n", "ab.cde = 1\n"),
+        (tomllib.Limits(max_key_length=4), "[ab.cd]\n", "[[ab.cde]]\n"),
+        (tomllib.Limits(max_key_length=4), "a = {bc.de = 1}\n", "a = {bc.def = 1}\n"),
+    ],
+)
+def test_limits(limits: tomllib.Limits, within: str, beyond: str) -> None:
+    """Check that a document is parsed up to each limit, and raises beyond it."""
+    assert tomllib.loads(within, limits=limits) == tomllib.loads(within)
+    tomllib.loads(beyond)
+    with pytest.raises(tomllib.TOMLLimitError):
+        tomllib.loads(beyond, limits=limits)
+
+
+def test_limit_error_is_decode_error() -> None:
+    """Check that `TOMLLimitError` is a `TOMLDecodeError`, located where the limit is hit."""
+    with pytest.raises(tomllib.TOMLDecodeError, match=r"Key longer than 2 .*line 2, column 1"):
+        tomllib.loads("a = 1\nbcd = 2\n", limits=tomllib.Limits(max_key_length=2))
+
+
+def test_default_max_depth() -> None:
+    """Check that deep nesting raises `TOMLLimitError` by default, not `RecursionError`."""
+    depth = 10 * tomllib.Limits().max_depth
+    with pytest.raises(tomllib.TOMLLimitError, match="Nested deeper"):
+        tomllib.loads("a = " + "[" * depth + "]" * depth + "\n", limits=tomllib.Limits())
+    with pytest.raises(tomllib.TOMLLimitError, match="Nested deeper"):
+        tomllib.loads("a = " + "{b = " * depth + "}" * depth + "\n", limits=tomllib.Limits())
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [tomllib.Limits(max_key_length=100), tomllib.Limits(max_depth=100)],
+    ids=["max_key_length", "max_depth"],
+)
+@pytest.mark.parametrize("template", ["{} = 1\n", "[{}]\n", "[[{}]]\n", "a = {{{} = 1}}\n"])
+def test_long_dotted_key(limits: tomllib.Limits, template: str) -> None:
+    """Check that a dotted key of many parts is rejected in linear time."""
+    s = template.format(".".join(["a"] * KEY_PARTS))
+    start = time.perf_counter()
+    with pytest.raises(tomllib.TOMLLimitError):
+        tomllib.loads(s, limits=limits)
+    assert time.perf_counter() - start < MAX_SECONDS
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import bulk
+from backlib.py311 import tomllib
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+DOCUMENTS = [f"[[file]]\nindex = {i}\nratio = {i}.5\nname = 'f{i}'\n" for i in range(8)]
+
+# Values nested deep enough to exhaust the stack without limits
+DEPTH = 100_000
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[Path]:
+    """Write `DOCUMENTS`, then an invalid, a too deeply nested and a missing file."""
+    paths = []
+    for i, s in enumerate([*DOCUMENTS, "a = \n", "a = " + "[" * DEPTH + "]" * DEPTH + "\n"]):
+        path = tmp_path / f"{i}.toml"
+        path.write_text(s)
+        paths.append(path)
+    return [*paths, tmp_path / "missing.toml"]
+
+
+def summary(result: Any) -> Any:
+    """Return a document, or the type and message of an exception."""
+    if isinstance(result, BaseException):
+        return type(result), str(result)
+    return result
+
+
+def test_load_many_in_order(paths: list[Path]) -> None:
+    """Check that the documents are parsed as by `loads`, in the order of the paths."""
+    *docs, invalid, deep, missing = tomllib.load_many(paths)
+    assert docs == [tomllib.loads(s) for s in DOCUMENTS]
+    assert isinstance(invalid, tomllib.TOMLDecodeError)
+    assert isinstance(deep, RecursionError)
+    assert isinstance(missing, FileNotFoundError)
+
+
+def test_load_many_pool_same_as_sequential(
+    paths: list[Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Check that a process pool returns the documents and errors of a sequential parse."""
+    expected = [summary(r) for r in tomllib.load_many(paths, max_workers=1)]
+    monkeypatch.setattr(bulk, "MIN_POOL_BATCH_SIZE", 0)
+    assert [summary(r) for r in tomllib.load_many(paths, max_workers=2)] == expected
+
+
+def test_load_many_pool_parse_float(paths: list[Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that `parse_float` is passed on to the workers."""
+    monkeypatch.setattr(bulk, "MIN_POOL_BATCH_SIZE", 0)
+    docs = tomllib.load_many(paths[:2], max_workers=2, parse_float=Decimal)
+    assert [doc["file"][0]["ratio"] for doc in docs] == [Decimal("0.5"), Decimal("1.5")]
+
+
+def test_load_many_executor(paths: list[Path]) -> None:
+    """Check that a given executor parses the files."""
+    with ThreadPoolExecutor(2) as executor:
+        results = tomllib.load_many(iter(paths), executor=executor)
+    assert [summary(r) for r in results] == [summary(r) for r in tomllib.load_many(paths)]
+
+
+def test_load_many_empty() -> None:
+    """Check that no paths give no documents."""
+    assert tomllib.load_many([]) == []
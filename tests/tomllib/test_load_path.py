@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import cache
+from backlib.py311 import tomllib
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+DOCUMENT = "title = 'config'\nratio = 0.5\n[[servers]]\nports = [80, 443]\n"
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    """Write `DOCUMENT` to a file."""
+    path = tmp_path / "config.toml"
+    path.write_text(DOCUMENT)
+    return path
+
+
+def test_load_path_same_as_loads(path: Path) -> None:
+    """Check that `load_path` parses a file given by any kind of path as `loads` does."""
+    expected = tomllib.loads(DOCUMENT)
+    assert tomllib.load_path(path) == expected
+    assert tomllib.load_path(str(path)) == expected
+    assert tomllib.load_path(os.fsencode(path)) == expected
+
+
+def test_cache_hit(path: Path) -> None:
+    """Check that an unchanged file is parsed once."""
+    load_path = cache.PathCache()
+    first = load_path(path)
+    assert load_path(path) == first
+    assert load_path.cache_info() == cache.CacheInfo(1, 1, 0, 128, 1)
+
+
+def test_cache_returns_copies(path: Path) -> None:
+    """Check that mutating a returned document does not change the cached one."""
+    load_path = cache.PathCache()
+    doc = load_path(path)
+    doc["title"] = "changed"
+    doc["servers"][0]["ports"].append(8080)
+    assert load_path(path) == tomllib.loads(DOCUMENT)
+
+
+def test_cache_invalidated_by_changes(path: Path) -> None:
+    """Check that a file rewritten in place or atomically replaced is parsed again."""
+    load_path = cache.PathCache()
+    load_path(path)
+    path.write_text("title = 'rewritten'\n")
+    assert load_path(path) == {"title": "rewritten"}
+    st = path.stat()
+    path.write_text("title = 'same size'\n"[: st.st_size])
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert load_path(path) == tomllib.loads(path.read_text())
+    replacement = path.with_suffix(".new")
+    replacement.write_text("title = 'replaced'\n")
+    replacement.replace(path)
+    assert load_path(path) == {"title": "replaced"}
+    assert load_path.cache_info().misses == 4
+
+
+def test_cache_keyed_by_parse_float(path: Path) -> None:
+    """Check that a document parsed with another `parse_float` is not reused."""
+    load_path = cache.PathCache()
+    assert load_path(path)["ratio"] == 0.5  # noqa: PLR2004
+    assert load_path(path, parse_float=Decimal)["ratio"] == Decimal("0.5")
+    assert load_path.cache_info().misses == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Check that the least recently used file is evicted beyond `maxsize`."""
+    load_path = cache.PathCache(maxsize=2)
+    paths = [tmp_path / f"{i}.toml" for i in range(3)]
+    for i, p in enumerate(paths):
+        p.write_text(f"i = {i}\n")
+    load_path(paths[0])
+    load_path(paths[1])
+    load_path(paths[0])
+    load_path(paths[2])
+    assert load_path.cache_info() == cache.CacheInfo(1, 3, 1, 2, 2)
+    assert load_path(paths[0]) == {"i": 0}
+    assert load_path(paths[1]) == {"i": 1}
+    assert load_path.cache_info().misses == 4
+
+
+def test_cache_disabled(path: Path) -> None:
+    """Check that nothing is cached with `maxsize=0`."""
+    load_path = cache.PathCache(maxsize=0)
+    load_path(path)
+    load_path(path)
+    assert load_path.cache_info() == cache.CacheInfo(0, 2, 0, 0, 0)
+
+
+def test_cache_errors_not_cached(path: Path) -> None:
+    """Check that invalid and missing files raise on every call, and are not cached."""
+    load_path = cache.PathCache()
+    path.write_text("a = \n")
+    for _ in range(2):
+        with pytest.raises(tomllib.TOMLDecodeError):
+            load_path(path)
+    with pytest.raises(FileNotFoundError):
+        load_path(path.with_name("missing.toml"))
+    assert load_path.cache_info().currsize == 0
+
+
+def test_cache_clear(path: Path) -> None:
+    """Check that `cache_clear` empties the cache and resets its statistics."""
+    load_path = cache.PathCache()
+    load_path(path)
+    load_path(path)
+    load_path.cache_clear()
+    assert load_path.cache_info() == cache.CacheInfo(0, 0, 0, 128, 0)
+    load_path(path)
+    assert load_path.cache_info().misses == 1
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import mmap
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal.cpython.parser import CHUNK_SIZE
+from backlib.py311 import tomllib
+
+
+DOCUMENTS = [
+    "",
+    "a = 1\n",
+    "a = 1",
+    "title = \"Grüße, привет, 😀\"\r\n[table]\r\nkey = 'value'\r\n",
+    'multiline = """\r\nline one\r\nline two \\\r\n    continued"""\r\n',
+    "[[package]]\nname = 'a'\n[[package]]\nname = 'b'\n[package.dependencies]\nc = '>=1'\n",
+    "date = 1979-05-27T07:32:00Z\nfloats = [1.5, -inf, 6e-1]\nints = [0x10, 0o7, 0b1]\n",
+]
+
+INVALID_DOCUMENTS = [
+    "a = ",
+    "a = 1\na = 2\n",
+    "a = 'unterminated\n",
+    "a = 1\r\r\n",
+    "[table]\n[table]\n",
+]
+
+INVALID_ENCODINGS = [
+    b'a = "\xff"\n',
+    b"a = 1\n\xc3",
+    "a = 'é'\n".encode("latin-1"),
+    b"a = '\xed\xa0\x80'\n",
+    "a = 1\n".encode("utf-16"),
+]
+
+
+def chunk_boundary_documents() -> list[str]:
+    """Make documents with a multibyte character or a CRLF across the chunks of the reader."""
+    documents = []
+    for shift in range(-3, 3):
+        padding = "#" * (CHUNK_SIZE + shift) + "\n"
+        documents.append(padding + 'a = "😀é"\r\nb = 1\r\n')
+        documents.append(padding[:-1] + '\r\na = "é"\n')
+    return documents
+
+
+def invalid_chunk_boundary_documents() -> list[bytes]:
+    """Make documents with an invalid or truncated character near the chunks of the reader."""
+    documents = []
+    for shift in range(-3, 3):
+        padding = b"#" * (CHUNK_SIZE + shift)
+        documents.append(padding + b"\xc3\x28\n")
+        documents.append(padding + b"\xe2\x82")
+    return documents
+
+
+@pytest.mark.parametrize("s", DOCUMENTS + chunk_boundary_documents())
+def test_loads_bytes_matches_loads(s: str) -> None:
+    """Check that `loads_bytes` parses the UTF-8 encoding of a document as `loads` does."""
+    assert tomllib.loads_bytes(s.encode()) == tomllib.loads(s)
+
+
+@pytest.mark.parametrize("s", INVALID_DOCUMENTS)
+def test_loads_bytes_raises_as_loads(s: str) -> None:
+    """Check that `loads_bytes` raises the error of `loads` for an invalid document."""
+    with pytest.raises(tomllib.TOMLDecodeError) as expected:
+        tomllib.loads(s)
+    with pytest.raises(tomllib.TOMLDecodeError) as actual:
+        tomllib.loads_bytes(s.encode())
+    assert str(actual.value) == str(expected.value)
+
+
+def test_loads_bytes_byte_order_mark() -> None:
+    """Check that a UTF-8 byte order mark is not stripped, as it is not by `bytes.decode`."""
+    with pytest.raises(tomllib.TOMLDecodeError, match=r"Invalid statement \(at line 1, column 1"):
+        tomllib.loads_bytes(b"\xef\xbb\xbfa = 1\n")
+
+
+@pytest.mark.parametrize("b", INVALID_ENCODINGS + invalid_chunk_boundary_documents())
+def test_loads_bytes_encoding_error(b: bytes) -> None:
+    """Check that invalid UTF-8 raises the error of `bytes.decode`, located in the document."""
+    with pytest.raises(UnicodeDecodeError) as expected:
+        b.decode()
+    with pytest.raises(UnicodeDecodeError) as actual:
+        tomllib.loads_bytes(b)
+    assert (actual.value.start, actual.value.end) == (expected.value.start, expected.value.end)
+    assert str(actual.value) == str(expected.value)
+
+
+def test_loads_bytes_accepts_buffers() -> None:
+    """Check that `loads_bytes` parses any bytes-like object, including a memory map."""
+    s = DOCUMENTS[3]
+    b = s.encode()
+    expected = tomllib.loads(s)
+    assert tomllib.loads_bytes(bytearray(b)) == expected
+    assert tomllib.loads_bytes(memoryview(b)) == expected
+    with mmap.mmap(-1, len(b)) as mapped:
+        mapped.write(b)
+        assert tomllib.loads_bytes(mapped) == expected
+
+
+def test_loads_bytes_parse_float() -> None:
+    """Check that `loads_bytes` passes `parse_float` on."""
+    assert tomllib.loads_bytes(b"a = 1.5", parse_float=str) == {"a": "1.5"}
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+
+from array import array
+from typing import Any
+
+import pytest
+
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome
+
+
+# A whitespace run the quadratic backtracking of an array pattern takes tens of seconds over
+WHITESPACE_RUN = 100_000
+MAX_SECONDS = 1.0
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "a = [1, 2, 3]\n",
+        "a = [ 1 ,\n 2 ,\t]\n",
+        "a = [1.5, -inf, nan, 6e2]\n",
+        "a = [1, 2.5]\n",
+        "a = [1, 2 # comment\n]\n",
+        "a = [1,, 2]\n",
+        "a = [1 2]\n",
+        "a = [01]\n",
+        "a = [1_000, 0x10]\n",
+    ],
+)
+def test_numeric_arrays_same_as_lists(s: str) -> None:
+    """Check that `numeric_arrays="array"` gives the values or the error of a default parse."""
+    assert outcome(loads_as_lists, s) == outcome(tomllib.loads, s)
+
+
+def test_numeric_arrays_are_arrays() -> None:
+    """Check that arrays of only integers or only floats become `array.array`."""
+    doc = tomllib.loads("i = [1, 2]\nf = [0.5]\nm = [1, 0.5]\n", numeric_arrays="array")
+    assert doc["i"] == array("q", [1, 2])
+    assert doc["f"] == array("d", [0.5])
+    assert doc["m"] == [1, 0.5]
+
+
+@pytest.mark.parametrize("value", ["1", "1.5"])
+def test_numeric_arrays_long_whitespace(value: str) -> None:
+    """Check that a long run of whitespace before a failing `]` is matched in linear time."""
+    s = f"a = [{value}" + " " * WHITESPACE_RUN + "#]\n]\n"
+    start = time.perf_counter()
+    doc = tomllib.loads(s, numeric_arrays="array")
+    assert time.perf_counter() - start < MAX_SECONDS
+    assert doc == tomllib.loads(s)
+
+
+def loads_as_lists(s: str) -> dict[str, Any]:
+    """Parse with `numeric_arrays="array"`, then turn the arrays back into lists."""
+    doc = tomllib.loads(s, numeric_arrays="array")
+    return {k: list(v) if isinstance(v, array) else v for k, v in doc.items()}
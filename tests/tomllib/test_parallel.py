@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+from decimal import Decimal
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import parallel
+from backlib.py311 import tomllib
+
+
+DOCUMENT = "".join(f'[table-{i}]\nname = "t{i}"\nvalue = {i}.5\n' for i in range(200))
+
+
+@pytest.fixture(autouse=True)
+def parallel_small_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parse even small documents in a process pool."""
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_SIZE", 0)
+
+
+def crash_in_worker(s: str) -> float:
+    """Parse a float, killing the process if it is a worker of a pool."""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return float(s)
+
+
+def test_parallel_same_as_sequential() -> None:
+    """Check that a pool parses the document as one process does."""
+    assert tomllib.loads(DOCUMENT, max_workers=2) == tomllib.loads(DOCUMENT)
+
+
+def test_parallel_picklable_parse_float() -> None:
+    """Check that a picklable `parse_float` is used by the workers."""
+    doc = tomllib.loads(DOCUMENT, max_workers=2, parse_float=Decimal)
+    assert doc["table-7"]["value"] == Decimal("7.5")
+
+
+def test_parallel_unpicklable_parse_float() -> None:
+    """Check that a `parse_float` that cannot be pickled falls back to a sequential parse."""
+    doc = tomllib.loads(DOCUMENT, max_workers=2, parse_float=lambda s: float(s) * 2)
+    assert doc["table-7"]["value"] == 15.0  # noqa: PLR2004
+
+
+def test_parallel_worker_crash() -> None:
+    """Check that a worker that dies falls back to a sequential parse."""
+    doc = tomllib.loads(DOCUMENT, max_workers=2, parse_float=crash_in_worker)
+    assert doc == tomllib.loads(DOCUMENT)
+
+
+def test_parallel_error_same_as_sequential() -> None:
+    """Check that an invalid document raises the error of a sequential parse."""
+    s = DOCUMENT + "[table-3]\n"
+    with pytest.raises(tomllib.TOMLDecodeError) as expected:
+        tomllib.loads(s)
+    with pytest.raises(tomllib.TOMLDecodeError) as actual:
+        tomllib.loads(s, max_workers=2)
+    assert str(actual.value) == str(expected.value)
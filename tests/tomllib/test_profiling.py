@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from backlib.internal.backports.py311.tomllib.internal import profiling
+from backlib.internal.backports.py311.tomllib.internal.cpython import parser
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import outcome, random_documents
+
+
+DOCUMENTS = random_documents(seed=7, count=1000)
+
+# A document that goes through every timed rule
+DOCUMENT = """\
+a = 1
+s = "x"
+m = \"\"\"ml\"\"\"
+d = 1979-05-27T07:32:00Z
+t = 07:32:00
+arr = [1, 2]
+it = {b = 2}
+[tab]
+k = 1.5
+[[list]]
+k = 2
+"""
+
+
+def test_profile_same_as_loads() -> None:
+    """Check that the timed copy of the parser returns the document or the error of `loads`."""
+    stats = tomllib.ParseStats()
+    for s in DOCUMENTS:
+        assert outcome(lambda s: tomllib.loads(s, profile=stats), s) == outcome(tomllib.loads, s)
+
+
+def test_profile_options_same_as_loads() -> None:
+    """Check that the options of `loads` are passed on to the timed copy of the parser."""
+    options = [
+        {"parse_float": Decimal},
+        {"select": ["tab"]},
+        {"numeric_arrays": "array"},
+        {"compact": True},
+        {"limits": tomllib.Limits()},
+    ]
+    for kwargs in options:
+        expected = tomllib.loads(DOCUMENT, **kwargs)
+        assert tomllib.loads(DOCUMENT, profile=tomllib.ParseStats(), **kwargs) == expected
+
+
+def test_profile_records_every_rule() -> None:
+    """Check that the calls, time and characters of every rule are recorded, and add up."""
+    stats = tomllib.ParseStats()
+    tomllib.loads(DOCUMENT, profile=stats)
+    assert set(stats.rules) == {*profiling.RULES, *profiling.PATTERNS}
+    for name, rule in stats.rules.items():
+        assert rule.calls > 0, name
+        assert rule.time >= 0, name
+        assert 0 < rule.chars <= len(DOCUMENT), name
+    assert stats.rules["key_value_rule"].calls == 9
+    # A regex may match within a tick of the clock, but not a whole statement
+    assert stats.rules["key_value_rule"].time > 0
+    assert stats.rules["RE_LOCALTIME"].chars == len("07:32:00")
+
+    calls = {name: rule.calls for name, rule in stats.rules.items()}
+    tomllib.loads(DOCUMENT, profile=stats)
+    assert {name: rule.calls for name, rule in stats.rules.items()} == {
+        name: 2 * n for name, n in calls.items()
+    }
+    assert all(name in str(stats) for name in stats.rules)
+
+
+def test_profile_leaves_parser_untimed() -> None:
+    """Check that profiling does not replace the rules of the parser itself."""
+    rules = {name: getattr(parser, name) for name in (*profiling.RULES, *profiling.PATTERNS)}
+    tomllib.loads(DOCUMENT, profile=tomllib.ParseStats())
+    assert {name: getattr(parser, name) for name in rules} == rules
+    assert parser.loads.__globals__ is vars(parser)
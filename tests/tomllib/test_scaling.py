@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from typing import Any, Callable
+
+import pytest
+
+from backlib.py311 import tomllib
+
+
+# The timing test takes about 30 seconds, and its ratios are only reliable on a quiet machine,
+# so it runs only if this environment variable is set, e.g. with `make slow-tests`.
+SLOW_TESTS = "BACKLIB_SLOW_TESTS"
+
+# How many more lines of Python may run per entry of the larger document than of the smaller.
+MAX_EXTRA_LINES = 0.01
+
+# How much longer an entry of the largest document may take than one of the smallest. A parser
+# walking all the previous entries would take about 1000 times longer.
+MAX_SLOWDOWN = 3
+
+# The small documents are parsed again until this many entries were parsed in total, and the
+# fastest run is kept.
+MIN_TIMED_ENTRIES = 100_000
+
+
+def array_of_tables(entries: int) -> str:
+    """Make a lock file of `entries` items of a nested array of tables."""
+    return "".join(f'[[lock.package]]\nname = "p{i}"\nversion = "1.{i}"\n' for i in range(entries))
+
+
+def sibling_tables(entries: int) -> str:
+    """Make a document of `entries` tables under the same parent, each with a dotted key."""
+    return "".join(f'[lock.p{i}]\nname = "p{i}"\nsource.url = "u{i}"\n' for i in range(entries))
+
+
+def lines_per_entry(make_document: Callable[[int], str], entries: int) -> float:
+    """Return the lines of Python that `loads` runs per entry of a document."""
+    s = make_document(entries)
+    lines = 0
+
+    def trace(frame: Any, event: str, arg: Any) -> Any:  # noqa: ARG001
+        nonlocal lines
+        if event == "line":
+            lines += 1
+        return trace
+
+    sys.settrace(trace)
+    try:
+        tomllib.loads(s)
+    finally:
+        sys.settrace(None)
+    return lines / entries
+
+
+def time_per_entry(make_document: Callable[[int], str], entries: int) -> float:
+    """Return the shortest time it takes `loads` to parse an entry of a document."""
+    s = make_document(entries)
+    best = float("inf")
+    for _ in range(max(1, MIN_TIMED_ENTRIES // entries)):
+        start = time.process_time()
+        tomllib.loads(s)
+        best = min(best, time.process_time() - start)
+    return best / entries
+
+
+@pytest.mark.parametrize(
+    "make_document",
+    [array_of_tables, sibling_tables],
+    ids=["array-of-tables", "sibling-tables"],
+)
+def test_linear_work(make_document: Callable[[int], str]) -> None:
+    """Check that the Python code run per entry is the same for 1k and 10k entries.
+
+    A loop over the previous entries would run ten times as many lines per entry. Loops in C,
+    e.g. of `list.index`, are only caught by `test_linear_time`.
+    """
+    reference = lines_per_entry(make_document, 1_000)
+    assert lines_per_entry(make_document, 10_000) <= reference * (1 + MAX_EXTRA_LINES)
+
+
+@pytest.mark.skipif(SLOW_TESTS not in os.environ, reason=f"{SLOW_TESTS} is not set")
+@pytest.mark.parametrize(
+    ("make_document", "max_entries"),
+    [(array_of_tables, 1_000_000), (sibling_tables, 100_000)],
+    ids=["array-of-tables", "sibling-tables"],
+)
+def test_linear_time(make_document: Callable[[int], str], max_entries: int) -> None:
+    """Check that the time per entry stays about the same from 1k entries up."""
+    reference = time_per_entry(make_document, 1_000)
+    entries = 10_000
+    while entries <= max_entries:
+        slowdown = time_per_entry(make_document, entries) / reference
+        assert slowdown < MAX_SLOWDOWN, f"{entries} entries: {slowdown:.1f} times slower"
+        entries *= 10
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from backlib.py311 import tomllib
+
+
+DOCUMENT = """\
+name = "root"
+[tool.ourapp]
+level = 1
+[tool.ourapp.nested]
+deep = true
+[tool.other]
+x = 2
+[tool."dotted.name"]
+y = 3
+[[package]]
+name = "a"
+"""
+
+
+@pytest.mark.parametrize(
+    ("select", "expected"),
+    [
+        (["tool.ourapp"], {"tool": {"ourapp": {"level": 1, "nested": {"deep": True}}}}),
+        ([("tool", "ourapp", "nested")], {"tool": {"ourapp": {"nested": {"deep": True}}}}),
+        (['tool."dotted.name"'], {"tool": {"dotted.name": {"y": 3}}}),
+        (["tool.other", "package"], {"tool": {"other": {"x": 2}}, "package": [{"name": "a"}]}),
+        (["missing"], {}),
+        ([], {}),
+    ],
+)
+def test_select_returns_the_selected_tables(select: list, expected: dict) -> None:
+    """Check that only the selected tables are returned, as they are in a full parse."""
+    assert tomllib.loads(DOCUMENT, select=select) == expected
+
+
+def test_select_validates_the_rest() -> None:
+    """Check that errors outside of the selected tables are still raised."""
+    with pytest.raises(tomllib.TOMLDecodeError):
+        tomllib.loads(DOCUMENT + "[tool.other]\n", select=["tool.ourapp"])
+
+
+def test_select_rejects_a_str() -> None:
+    """Check that a bare `str` is not taken as the keys of its characters."""
+    with pytest.raises(TypeError, match="not a str"):
+        tomllib.loads(DOCUMENT, select="tool")
+
+
+def test_select_rejects_invalid_keys() -> None:
+    """Check that a selected key that is not a TOML key raises `ValueError`."""
+    with pytest.raises(ValueError, match="Invalid key"):
+        tomllib.loads(DOCUMENT, select=["tool..ourapp"])
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import gc
+import importlib.util
+import multiprocessing
+import pickle
+import subprocess
+import sys
+import time
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from backlib.py311 import tomllib
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from multiprocessing.shared_memory import SharedMemory
+
+
+DOCUMENT = """\
+title = "snapshot"
+big = 18446744073709551616
+floats = [1.5, -0.0, inf]
+dates = [1979-05-27, 1979-05-27T07:32:00Z, 07:32:00]
+[owner]
+name = "Tom"
+nested = {a = {b = [1, [2, "x"]]}}
+[[packages]]
+name = "a"
+[[packages]]
+name = "b"
+"""
+
+# How long the resource tracker of an exited process is given to unlink what it tracked
+TRACKER_EXIT_SECONDS = 0.5
+
+has_shared_memory = pytest.mark.skipif(
+    importlib.util.find_spec("multiprocessing.shared_memory") is None,
+    reason="Shared memory is not available",
+)
+
+
+@pytest.fixture
+def published() -> Iterator[SharedMemory]:
+    """Publish `DOCUMENT`, unlinking it afterwards."""
+    shm = tomllib.publish(tomllib.loads(DOCUMENT))
+    try:
+        yield shm
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def read_attached(name: str) -> Any:
+    """Attach to a block and return a copy of its document."""
+    return plain(tomllib.attach(name))
+
+
+def plain(obj: Any) -> Any:
+    """Copy the views of a document into dicts and lists."""
+    if isinstance(obj, tomllib.SharedTable):
+        return {k: plain(v) for k, v in obj.items()}
+    if isinstance(obj, (str, bytes)) or not hasattr(obj, "__len__"):
+        return obj
+    return [plain(v) for v in obj]
+
+
+@has_shared_memory
+def test_attach_same_as_loads(published: SharedMemory) -> None:
+    """Check that an attached document has the values of the published one."""
+    doc = tomllib.attach(published.name)
+    assert plain(doc) == tomllib.loads(DOCUMENT)
+    assert doc["big"] == 1 << 64
+    assert doc["dates"][1] == datetime(1979, 5, 27, 7, 32, tzinfo=timezone.utc)
+    assert doc["dates"][-3] == date(1979, 5, 27)
+    assert doc["owner"]["nested"]["a"]["b"][1][:] == [2, "x"]
+    assert "missing" not in doc
+    assert list(doc) == list(tomllib.loads(DOCUMENT))
+
+
+@has_shared_memory
+def test_view_outlives_root(published: SharedMemory) -> None:
+    """Check that a nested view keeps the block mapped after its root is gone."""
+    root = tomllib.attach(published.name)
+    packages = root["packages"]
+    del root
+    gc.collect()
+    assert packages[1]["name"] == "b"
+
+
+@has_shared_memory
+def test_pickle_root_table(published: SharedMemory) -> None:
+    """Check that the root table is pickled by name, and nested tables are not pickled."""
+    doc = tomllib.attach(published.name)
+    assert plain(pickle.loads(pickle.dumps(doc))) == plain(doc)  # noqa: S301
+    with pytest.raises(TypeError, match="root table"):
+        pickle.dumps(doc["owner"])
+
+
+@has_shared_memory
+def test_attach_from_worker(published: SharedMemory) -> None:
+    """Check that a spawned worker of the publisher attaches to the block."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        assert pool.apply(read_attached, (published.name,)) == tomllib.loads(DOCUMENT)
+    assert read_attached(published.name) == tomllib.loads(DOCUMENT)
+
+
+@has_shared_memory
+def test_attach_from_other_process(published: SharedMemory) -> None:
+    """Check that a process that is not a child of the publisher does not unlink the block."""
+    code = (
+        "import sys\nfrom backlib.py311 import tomllib\n"
+        "print(tomllib.attach(sys.argv[1])['owner']['name'])\n"
+    )
+    root = Path(__file__).parents[2]
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code, published.name],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout == "Tom\n"
+    time.sleep(TRACKER_EXIT_SECONDS)
+    assert read_attached(published.name) == tomllib.loads(DOCUMENT)
+
+
+@has_shared_memory
+def test_attach_rejects_other_blocks() -> None:
+    """Check that a block not written by `publish` raises `ValueError`."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError, match="not a TOML snapshot"):
+            tomllib.attach(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_publish_rejects_other_types() -> None:
+    """Check that values of types other than those of TOML raise `TypeError`."""
+    with pytest.raises(TypeError, match="'complex'"):
+        tomllib.publish({"a": [1j]})
+
+
+def test_no_shared_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a platform without shared memory raises `NotImplementedError`."""
+    monkeypatch.setitem(sys.modules, "multiprocessing.shared_memory", None)
+    with pytest.raises(NotImplementedError, match="Shared memory is not available"):
+        tomllib.publish({"a": 1})
+    with pytest.raises(NotImplementedError, match="Shared memory is not available"):
+        tomllib.attach("psm_missing")
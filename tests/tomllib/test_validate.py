@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from backlib.py311 import tomllib
+from tests.tomllib.fuzz import VALID_SCALARS, outcome, random_documents
+
+
+DOCUMENTS = random_documents(seed=1, count=3000)
+
+# Values that `validate` skips without building them, and their neighbours that it does not
+SKIMMED_VALUES = [
+    *VALID_SCALARS,
+    "[1, 2.5, -inf, 0x1F]",
+    "[1979-05-27, 07:32:00, 1979-05-27T07:32:00Z]",
+    "['lit', \"str\", [], {}]",
+    "2000-02-29",
+    "2001-02-29",
+    "0000-01-01",
+    "1" * 5000,
+    "1" * 5000 + ".5",
+    '"\\u00e9"',
+    '"tab\there"',
+    '"nul\x00"',
+    '"bad \\q escape"',
+    "'''x'''",
+    "'''nul\x00'''",
+    '"""multi\nline \\t "quoted" \\\n  trimmed"""',
+    '"""bad \\q escape"""',
+    '"""unterminated',
+    "'unterminated",
+]
+
+
+def test_validate_same_as_loads() -> None:
+    """Check that `validate` reports the error of `loads` for every document, and only then."""
+    for s in DOCUMENTS:
+        assert validate_outcome(s) == loads_outcome(s), s
+
+
+@pytest.mark.parametrize("value", SKIMMED_VALUES)
+@pytest.mark.parametrize("template", ["a = {}\n", "a = [{}, {}]\n", "a = {{ b = {} }}\n"])
+def test_validate_skimmed_values(template: str, value: str) -> None:
+    """Check that the values `validate` does not build pass the checks of `loads`."""
+    s = template.format(value, value)
+    assert validate_outcome(s) == loads_outcome(s)
+
+
+def loads_outcome(s: str) -> tuple[str, str | None]:
+    """Return `("ok", None)` or `("error", message)` for `loads`."""
+    kind, result = outcome(tomllib.loads, s)
+    return kind, result if kind == "error" else None
+
+
+def validate_outcome(s: str) -> tuple[str, str | None]:
+    """Return `("ok", None)` or `("error", message)` for `validate`.
+
+    Errors that are not `TOMLDecodeError` (e.g. of an integer that is too long) are raised as
+    they are by `loads`.
+    """
+    try:
+        error = tomllib.validate(s)
+    except ValueError as e:
+        return "error", str(e)
+    return ("ok", None) if error is None else ("error", str(error))
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+import queue
+import shutil
+import sys
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from backlib.internal.backports.py311.tomllib.internal import watcher as watcher_module
+from backlib.py311 import tomllib
+
+
+if TYPE_CHECKING:
+    from backlib.internal.backports.py311.tomllib.internal.watcher import Watcher
+
+
+TIMEOUT = 10
+# Long enough for the watcher to handle the events of a change, several times its debounce
+QUIET = 0.3
+
+polling_modes = pytest.mark.parametrize("polling", [False, True], ids=["inotify", "polling"])
+has_inotify = pytest.mark.skipif(
+    watcher_module.load_libc() is None,
+    reason="The directory cannot be watched with inotify",
+)
+has_symlinks = pytest.mark.skipif(sys.platform == "win32", reason="Symbolic links need privileges")
+
+
+def watch(path: Path, *, polling: bool) -> tuple[Watcher, queue.Queue[Any]]:
+    """Watch `path` with short delays, returning the watcher and the results of its callback."""
+    results: queue.Queue[Any] = queue.Queue()
+    watcher = tomllib.watch(path, results.put, debounce=0.02, interval=0.1, polling=polling)
+    return watcher, results
+
+
+def replace(path: Path, s: str) -> None:
+    """Replace the file at `path` atomically, as editors and deployment tools do."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(s, encoding="utf-8")
+    tmp.replace(path)
+
+
+@polling_modes
+def test_watch_reloads(tmp_path: Path, polling: bool) -> None:
+    """Check that the file is parsed at once, then again after each change."""
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+    watcher, results = watch(path, polling=polling)
+    with watcher:
+        assert watcher.polling is (polling or not sys.platform.startswith("linux"))
+        assert results.get_nowait() == {"a": 1}
+        path.write_text("a = 2\nb = 'written in place'\n", encoding="utf-8")
+        assert results.get(timeout=TIMEOUT) == {"a": 2, "b": "written in place"}
+
+
+@polling_modes
+def test_watch_atomic_rename(tmp_path: Path, polling: bool) -> None:
+    """Check that a file replaced with a rename is parsed once, and not before the rename."""
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+    watcher, results = watch(path, polling=polling)
+    with watcher:
+        assert results.get_nowait() == {"a": 1}
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text("a = 2\n", encoding="utf-8")
+        time.sleep(QUIET)
+        assert results.empty()
+        tmp.replace(path)
+        assert results.get(timeout=TIMEOUT) == {"a": 2}
+        time.sleep(QUIET)
+        assert results.empty()
+
+
+@has_symlinks
+@polling_modes
+def test_watch_symlink_swap(tmp_path: Path, polling: bool) -> None:
+    """Check that swapping a symbolic link, and writing its new target, are both noticed."""
+    (tmp_path / "a.toml").write_text("a = 1\n", encoding="utf-8")
+    (tmp_path / "b.toml").write_text("b = 1\n", encoding="utf-8")
+    path = tmp_path / "config.toml"
+    path.symlink_to("a.toml")
+    watcher, results = watch(path, polling=polling)
+    with watcher:
+        assert results.get_nowait() == {"a": 1}
+        link = tmp_path / "config.toml.tmp"
+        link.symlink_to("b.toml")
+        link.replace(path)
+        assert results.get(timeout=TIMEOUT) == {"b": 1}
+        (tmp_path / "b.toml").write_text("b = 2\n", encoding="utf-8")
+        assert results.get(timeout=TIMEOUT) == {"b": 2}
+
+
+@has_inotify
+def test_watch_ignores_other_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the changes of other files in the directory do not reload the file."""
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+    watcher, results = watch(path, polling=False)
+    with watcher:
+        assert results.get_nowait() == {"a": 1}
+        reloads = []
+        reload = watcher._reload  # noqa: SLF001
+        monkeypatch.setattr(watcher, "_reload", lambda: (reloads.append(None), reload()))
+        for i in range(20):
+            (tmp_path / f"other-{i}.toml").write_text("b = 1\n", encoding="utf-8")
+        time.sleep(QUIET)
+        assert reloads == []
+        path.write_text("a = 2\n", encoding="utf-8")
+        assert results.get(timeout=TIMEOUT) == {"a": 2}
+        assert reloads == [None]
+
+
+def test_watch_polls_without_inotify(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the file is polled where `inotify` is not available."""
+    monkeypatch.setattr(watcher_module, "load_libc", lambda: None)
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+    watcher, results = watch(path, polling=False)
+    with watcher:
+        assert watcher.polling
+        assert results.get_nowait() == {"a": 1}
+        replace(path, "a = 2\n")
+        assert results.get(timeout=TIMEOUT) == {"a": 2}
+
+
+@has_inotify
+def test_watch_polls_once_directory_is_removed(tmp_path: Path) -> None:
+    """Check that the file is polled once its watched directory is gone."""
+    directory = tmp_path / "config"
+    directory.mkdir()
+    path = directory / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+    watcher, results = watch(path, polling=False)
+    with watcher:
+        assert not watcher.polling
+        assert results.get_nowait() == {"a": 1}
+        shutil.rmtree(directory)
+        assert isinstance(results.get(timeout=TIMEOUT), FileNotFoundError)
+        directory.mkdir()
+        path.write_text("a = 2\n", encoding="utf-8")
+        assert results.get(timeout=TIMEOUT) == {"a": 2}
+
+
+@polling_modes
+def test_watch_reports_errors(tmp_path: Path, polling: bool) -> None:
+    """Check that the errors are passed to the callback, and that the watcher keeps running."""
+    path = tmp_path / "config.toml"
+    watcher, results = watch(path, polling=polling)
+    with watcher:
+        assert isinstance(results.get_nowait(), FileNotFoundError)
+        replace(path, "a = \n")
+        assert isinstance(results.get(timeout=TIMEOUT), tomllib.TOMLDecodeError)
+        replace(path, "a = " + "[" * 100_000 + "]" * 100_000 + "\n")
+        assert isinstance(results.get(timeout=TIMEOUT), RecursionError)
+        replace(path, "a = 1\n")
+        assert results.get(timeout=TIMEOUT) == {"a": 1}
+
+
+@pytest.mark.skipif(not Path("/proc/self/fd").is_dir(), reason="The open files are not listed")
+def test_watch_closes_files_if_callback_fails(tmp_path: Path) -> None:
+    """Check that a failing first call of the callback leaks no file descriptors."""
+    path = tmp_path / "config.toml"
+    path.write_text("a = 1\n", encoding="utf-8")
+
+    def callback(result: Any) -> None:
+        raise RuntimeError(result)
+
+    before = set(os.listdir("/proc/self/fd"))
+    with pytest.raises(RuntimeError):
+        tomllib.watch(path, callback)
+    assert set(os.listdir("/proc/self/fd")) == before